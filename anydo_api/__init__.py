@@ -5,7 +5,43 @@
 It wraps remote resource json representations into Python objects,
 API calls into object methods to achive easy and
 object-oriented way of remote API consumption.
+
+Public classes are loaded lazily on the first attribute access,
+so `import anydo_api` stays cheap.
 """
+import importlib
+import sys
+
 __author__ = 'Aliaksandr Buhayeu'
 __email__ = 'aliaksandr.buhayeu@gmail.com'
 __version__ = '0.0.2'
+
+__all__ = ('Client', 'ClientPool', 'User', 'Task', 'Category', 'request_budget', 'deadline')
+
+_LAZY_ATTRIBUTES = {
+    'Client': 'anydo_api.client',
+    'ClientPool': 'anydo_api.pool',
+    'User': 'anydo_api.user',
+    'Task': 'anydo_api.task',
+    'Category': 'anydo_api.category',
+    'request_budget': 'anydo_api.budget',
+    'deadline': 'anydo_api.deadlines',
+}
+
+def __getattr__(name):
+    """Import public classes on the first access (PEP 562)."""
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    """List lazy attributes along with the loaded ones."""
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+if sys.version_info < (3, 7):
+    # no module level __getattr__ support, load everything eagerly
+    for _name in _LAZY_ATTRIBUTES:
+        __getattr__(_name)
@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+`anydo_api.budget`.
+
+Request budget guard.
+
+Count API calls made inside a block of code and complain when there are more
+of them than expected, to catch request amplification (N+1) regressions:
+
+>>> with request_budget(max_calls=1):
+...     [task.category() for task in user.tasks()]
+
+In the default mode exceeding the budget emits a `RequestBudgetWarning` with
+a call-site report, in the strict mode `RequestBudgetExceededError` is raised
+before the extra call is sent. The strict mode is turned on by `set_strict`
+or by the `ANYDO_API_STRICT_BUDGET` environment variable.
+"""
+
+import contextlib
+import os
+import threading
+import traceback
+import warnings
+
+from anydo_api import errors
+
+__all__ = ('request_budget', 'set_strict', 'is_strict', 'record_call',
+           'capture_call_site', 'called_from')
+
+_PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+_STATE = threading.local()
+_HIDDEN_FUNCTIONS = ('wrapper', '<lambda>', 'record_call', 'capture_call_site', 'capture_context')
+# worker threads of `anydo_api.parallel` start here, the chain goes on in their caller
+_WORKER_JOB = '_job'
+_STRICT = [os.environ.get('ANYDO_API_STRICT_BUDGET', '').lower() in ('1', 'true', 'yes', 'on')]
+
+def set_strict(enabled=True):
+    """Turn the strict mode on or off for all budgets without an explicit `strict` option."""
+    _STRICT[0] = bool(enabled)
+
+def is_strict():
+    """Return True if the strict mode is on."""
+    return _STRICT[0]
+
+def _active_budgets():
+    """Return the stack of budgets active in the current thread."""
+    if not hasattr(_STATE, 'stack'):
+        _STATE.stack = []
+    return _STATE.stack
+
+def _call_site():
+    """
+    Describe where an API call comes from.
+
+    Return the closest frame outside the library and the chain of library functions below it.
+    In worker threads the chain goes on in the thread which started them (see `called_from`).
+    """
+    site = None
+    chain = []
+    origin = getattr(_STATE, 'origin', None)
+    for filename, line, function, _ in reversed(traceback.extract_stack()):
+        if os.path.dirname(os.path.abspath(filename)) == _PACKAGE_DIR:
+            if function == _WORKER_JOB and origin is not None:
+                site = origin[0]
+                chain.extend([origin[1]] if origin[1] else [])
+                break
+            if not function.startswith('_') and function not in _HIDDEN_FUNCTIONS:
+                chain.append(function)
+        else:
+            site = '{}:{} in {}'.format(filename, line, function)
+            break
+
+    return site, ' <- '.join(chain)
+
+def capture_call_site():
+    """
+    Return the call site of the current thread to report calls of its worker threads.
+
+    Return None without active budgets, there is nothing to report then.
+    """
+    if not getattr(_STATE, 'stack', None):
+        return None
+    return _call_site()
+
+@contextlib.contextmanager
+def called_from(call_site):
+    """Report calls made inside the block as made from `call_site` of another thread."""
+    saved = getattr(_STATE, 'origin', None)
+    _STATE.origin = call_site
+    try:
+        yield
+    finally:
+        _STATE.origin = saved
+
+def record_call(method, url):
+    """
+    Register an API call in all the budgets active in the current thread.
+
+    Called by `anydo_api.request` right before a request is sent.
+    """
+    stack = getattr(_STATE, 'stack', None)
+    if not stack:
+        return
+
+    site, chain = _call_site()
+    for budget in stack:
+        budget.add_call(method.upper(), url, site, chain)
+
+class request_budget(object): # pylint: disable=invalid-name
+    """
+    Context manager limiting the number of API calls made inside the block.
+
+    Nested budgets are checked independently, each call counts in all of them.
+    """
+
+    def __init__(self, max_calls, strict=None):
+        """Constructor for request_budget."""
+        self.max_calls = max_calls
+        self.strict = strict
+        self.calls = []
+
+    def __enter__(self):
+        """Start counting calls of the current thread."""
+        self.calls = []
+        _active_budgets().append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        """Stop counting and warn if the budget was exceeded."""
+        _active_budgets().remove(self)
+        if self.exceeded() and not self.is_strict():
+            warnings.warn(self.report(), errors.RequestBudgetWarning, stacklevel=2)
+        return False
+
+    def is_strict(self):
+        """Return True if exceeding the budget raises an error."""
+        return is_strict() if self.strict is None else self.strict
+
+    def exceeded(self):
+        """Return True if more calls were made than allowed."""
+        return len(self.calls) > self.max_calls
+
+    def add_call(self, method, url, site, chain):
+        """Count a new call, raise in the strict mode if it does not fit the budget."""
+        self.calls.append((method, url, site, chain))
+        if self.exceeded() and self.is_strict():
+            raise errors.RequestBudgetExceededError(self.report())
+
+    def report(self):
+        """Return a human readable list of all calls made inside the block."""
+        lines = ['Request budget of {} call(s) exceeded, {} made:'.format(
+            self.max_calls, len(self.calls)
+        )]
+        for index, (method, url, site, chain) in enumerate(self.calls, 1):
+            lines.append('  {}. {} {}'.format(index, method, url))
+            lines.append('     at {}'.format(site))
+            if chain:
+                lines.append('     via {}'.format(chain))
+
+        return '\n'.join(lines)
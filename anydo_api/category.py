@@ -6,12 +6,19 @@
 `Category` class.
 """
 
+import logging
+
 from anydo_api import errors
+from anydo_api import parallel
+from anydo_api import tracing
 from anydo_api.constants import CONSTANTS
 from anydo_api.resource import Resource
 
 __all__ = ('Category')
 
+_LOGGER = logging.getLogger(__name__)
+
+@tracing.trace_methods
 class Category(Resource):
     """
     `Category` is the class representing user category object.
@@ -28,29 +35,68 @@ class Category(Resource):
         super(Category, self).__init__(data_dict)
         self.user = user
 
+    @tracing.untraced
     def session(self):
         """Shortcut to retrive user session for requests."""
         return self.user.session()
 
+    def _write_behind(self):
+        """Return the write-behind queue of the user if any."""
+        return self.user.write_behind if self.user is not None else None
+
+    def _changed(self):
+        """Let the user listeners know about synchronized changes."""
+        self.user.notify('resource_saved', self)
+
+    def _removed(self):
+        """Let the user listeners know about remote deletion."""
+        self.user.notify('resource_removed', self)
+
     def mark_default(self):
         """
-        Shortcut to mark a category as default one locally.
+        Shortcut to mark a category as default one.
 
-        Mark previous default one as not default.
+        Mark previous default one as not default. Both categories are saved at once,
+        if one of the requests fails the other change is reverted and the error is raised,
+        so the account is never left without a default category.
+        The saves are sent right away even with write-behind mode on.
         """
         previous = self.user.default_category()
-        previous.default = False
-        previous.isDefault = False
-        previous.save()
-
-        self['default'] = True
-        self['isDefault'] = True
-        self.save()
+        if previous is self:
+            return self
+
+        changed = [self] if previous is None else [previous, self]
+        originals = [dict(category.data_dict) for category in changed]
+        for category in changed:
+            category.default = category is self
+            category.isDefault = category is self
+
+        saved = parallel.run_all(
+            lambda category: category.save(write_behind=False), changed, len(changed)
+        )
+        errors_found = [future.exception() for future in saved if future.exception() is not None]
+        if errors_found:
+            for category, original, future in zip(changed, originals, saved):
+                if future.exception() is not None:
+                    category.reset_data(original)
+                    continue
+
+                category.default = original.get('default')
+                category.isDefault = original['isDefault']
+                try:
+                    category.save(write_behind=False)
+                except Exception: # pylint: disable=broad-except
+                    _LOGGER.exception(
+                        'Reverting default flag of category %s failed', category['id']
+                    )
+            raise errors_found[0]
+
+        self.user._default_category = self # pylint: disable=protected-access
         return self
 
-    def tasks(self):
+    def tasks(self, include_deleted=False, include_done=False):
         """Return a list of the user tasks that belongs to selected category."""
-        tasks = self.user.tasks()
+        tasks = self.user.tasks(include_deleted=include_deleted, include_done=include_done)
         return [task for task in tasks if task.categoryId == self['id']]
 
     def add_task(self, task):
@@ -69,12 +115,61 @@ class Category(Resource):
         Updates task and pushes changes remotly.
         If category already default do nothing.
         """
-        if task.category()['isDefault']:
+        default = self.user.default_category()
+        if task.categoryId == default['id']:
             raise errors.ModelError('Can not remove task from default category')
 
-        task.categoryId = self.user.default_category()['id']
+        task.categoryId = default['id']
         task.save()
 
+    def move_all_tasks(self, to, batch_size=100, max_workers=4): # pylint: disable=invalid-name
+        """
+        Move every task of the category into the `to` category.
+
+        Done and deleted tasks are moved too, so none of them is left in the category.
+        Tasks are pushed in list requests (see `User.save_many`).
+        Return a list of `(task, error)` pairs, error is None on success.
+        """
+        tasks = self.tasks(include_deleted=True, include_done=True)
+        for task in tasks:
+            task.categoryId = to['id']
+
+        return self.user.save_many(tasks, batch_size, max_workers)
+
+    def destroy(self, alternate_endpoint=None, cascade=None):
+        """
+        Delete the category by remote API call.
+
+        With `cascade='move_to_default'` its tasks are moved into the default category first,
+        with `cascade='delete'` they are deleted, done ones included. If any of the tasks fails
+        the category is kept and `ModelError` is raised.
+        """
+        if cascade == 'move_to_default':
+            default = self.user.default_category()
+            if default is None or default['id'] == self['id']:
+                raise errors.ModelError('Can not move tasks out of the default category')
+            results = self.move_all_tasks(to=default)
+        elif cascade == 'delete':
+            results = self.user.destroy_many(self.tasks(include_done=True))
+        elif cascade is None:
+            results = []
+        else:
+            raise errors.ModelAttributeError(
+                'Unknown cascade {}, expected move_to_default or delete'.format(cascade)
+            )
+
+        failed = [task for task, error in results if error is not None]
+        if failed:
+            raise errors.ModelError(
+                '{} of {} tasks failed, category is kept'.format(len(failed), len(results))
+            )
+
+        super(Category, self).destroy(alternate_endpoint)
+        self.user.forget([self])
+        return self
+
+    delete = destroy
+
     @staticmethod
     def required_attributes():
         """
@@ -6,14 +6,15 @@ anydo_api.client.
 `Client` class.
 """
 
-import requests
-
 from anydo_api import request
+from anydo_api import tracing
 from anydo_api.constants import CONSTANTS
+from anydo_api.session_store import SessionStore
 from anydo_api.user import User
 
 __all__ = ('Client')
 
+@tracing.trace_methods
 class Client(object):
     """
     `Client` is the interface for communication with an API.
@@ -21,27 +22,95 @@ class Client(object):
     Responsible for authentication and session management.
     """
 
-    def __init__(self, email, password):
-        """Constructor for Client."""
-        self.session = self.__log_in(email, password)
+    def __init__(self, email, password, session_file=None, adapter=None):
+        """
+        Constructor for Client.
+
+        With `session_file` the authenticated session and the user data are stored there
+        and reused by the following clients instead of a new log in.
+        Expired sessions are renewed transparently in that case.
+
+        `adapter` is a transport adapter (see `request.new_adapter`) shared by many clients.
+        """
+        self.store = SessionStore(session_file) if session_file else None
+        self.adapter = adapter
         self.password = password
         self.user = None
+        self.__email = email
+        self.__cached_me = None
+        self.__reauthenticating = False
+
+        self.session = self.__restore_session() or self.__log_in(email, password)
+        if self.store:
+            self.__credentials = (email, password)
+            self.session.reauthenticate = self.__reauthenticate
 
     def get_user(self, refresh=False):
         """Return a user object currently logged in."""
         if not self.user or refresh:
-            data = request.get(
-                url=CONSTANTS.get('ME_URL'),
-                session=self.session
-            )
-
+            data = None if refresh else self.__cached_me
+            if data is None:
+                data = request.get(
+                    url=CONSTANTS.get('ME_URL'),
+                    session=self.session
+                )
+                self.__persist_session(me=data)
+
+            data = dict(data)
             data.update({'password': self.password})
             self.password = None
             self.user = User(data_dict=data, session=self.session)
 
         return self.user
 
-    def __log_in(self, email, password):
+    def __restore_session(self):
+        """Return a session with persisted cookies if there are any, None otherwise."""
+        if not self.store:
+            return None
+
+        state = self.store.load(self.__email)
+        if not state or not state.get('cookies'):
+            return None
+
+        session = request.new_session(adapter=self.adapter)
+        SessionStore.restore_cookies(session, state['cookies'])
+        self.__cached_me = state.get('me')
+        return session
+
+    def __persist_session(self, me=None):
+        """Save current session cookies and the user data if persistence is enabled."""
+        if self.store:
+            self.store.save(self.__email, SessionStore.dump_cookies(self.session), me)
+
+    def __reauthenticate(self):
+        """
+        Log in again within the same session after the server has rejected its cookies.
+
+        Reuse cookies renewed by another process if there are any.
+        Return True if the failed request should be retried.
+        """
+        if self.__reauthenticating:
+            return False
+
+        self.__reauthenticating = True
+        try:
+            email, password = self.__credentials
+
+            def log_in():
+                """Get new cookies from the server."""
+                self.session.cookies.clear()
+                self.__log_in(email, password, session=self.session)
+                return SessionStore.dump_cookies(self.session)
+
+            stale_cookies = SessionStore.dump_cookies(self.session)
+            cookies = self.store.renew(email, stale_cookies, log_in)
+            SessionStore.restore_cookies(self.session, cookies)
+        finally:
+            self.__reauthenticating = False
+
+        return True
+
+    def __log_in(self, email, password, session=None):
         """
         Authentication base on `email` and `password`.
 
@@ -54,7 +123,7 @@ class Client(object):
         }
 
         headers = {'Content-Type': 'application/x-www-form-urlencoded'}
-        self.session = requests.Session()
+        self.session = session or request.new_session(adapter=self.adapter)
 
         request.post(
             url=CONSTANTS.get('LOGIN_URL'),
@@ -64,6 +133,9 @@ class Client(object):
             response_json=False
         )
 
+        if session is None:
+            self.__persist_session()
+
         return self.session
 
     @classmethod
@@ -8,7 +8,7 @@
 All default enpoints and possible options are placed here.
 """
 
-__all__ = ('SERVER_API_URL', 'CONSTANTS', 'TASK_STATUSES')
+__all__ = ('SERVER_API_URL', 'CONSTANTS', 'TASK_STATUSES', 'DEFAULT_TIMEOUT', 'TIMEOUTS')
 
 # Current API entry point
 SERVER_API_URL = 'https://sm-prod2.any.do'
@@ -25,3 +25,15 @@ CONSTANTS = {
 
 # Possible task statuses
 TASK_STATUSES = ('CHECKED', 'UNCHECKED', 'DONE', 'DELETED')
+
+# Default `(connect, read)` request timeout in seconds
+DEFAULT_TIMEOUT = (3.05, 5)
+
+# Timeouts of slower endpoints by `(method, url)`: log in and whole collections
+TIMEOUTS = {
+    ('post', CONSTANTS['LOGIN_URL'])     : (3.05, 10),
+    ('get', CONSTANTS['TASKS_URL'])      : (3.05, 30),
+    ('post', CONSTANTS['TASKS_URL'])     : (3.05, 30),
+    ('get', CONSTANTS['CATEGORIES_URL']) : (3.05, 15),
+    ('post', CONSTANTS['CATEGORIES_URL']): (3.05, 15),
+}
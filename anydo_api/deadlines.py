@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+`anydo_api.deadlines`.
+
+Deadlines for blocks of API calls.
+
+>>> with deadline(2.5):
+...     user.tasks(refresh=True)
+...     user.categories(refresh=True)
+
+Connect and read timeouts of every request made inside the block are cut to the time left,
+in the current thread and in the worker threads of bulk operations. When the time is over,
+or the deadline is cancelled from any thread, `DeadlineExceededError` is raised before
+the next request is sent. Nested deadlines could only shorten the outer ones.
+
+Requests without an explicit `timeout` option start from the per-endpoint
+defaults of `constants.TIMEOUTS`.
+"""
+
+import threading
+import time
+
+from anydo_api import errors
+from anydo_api.constants import DEFAULT_TIMEOUT, TIMEOUTS
+
+__all__ = ('deadline', 'remaining', 'check', 'timeout_for')
+
+_STATE = threading.local()
+_clock = getattr(time, 'monotonic', time.time) # pylint: disable=invalid-name
+
+def _active_deadlines():
+    """Return the stack of deadlines active in the current thread."""
+    if not hasattr(_STATE, 'stack'):
+        _STATE.stack = []
+    return _STATE.stack
+
+def remaining():
+    """Return seconds left until the closest active deadline or None without any."""
+    left = [item.remaining() for item in getattr(_STATE, 'stack', ())]
+    left = [seconds for seconds in left if seconds is not None]
+    return min(left) if left else None
+
+def check():
+    """Raise `DeadlineExceededError` if any active deadline is over or cancelled."""
+    for item in getattr(_STATE, 'stack', ()):
+        if item.cancelled:
+            raise errors.DeadlineExceededError('Deadline cancelled')
+        if item.remaining() == 0:
+            raise errors.DeadlineExceededError(
+                'Deadline of {} second(s) exceeded'.format(item.seconds)
+            )
+
+def timeout_for(method, url, timeout=None):
+    """
+    Return `(connect, read)` timeout of a request to be sent now.
+
+    `timeout` (the endpoint default if None) is cut to the time left until the active deadlines.
+    Called by `anydo_api.request` right before a request is sent, raises if no time is left.
+    """
+    if timeout is None:
+        timeout = TIMEOUTS.get((method, url), DEFAULT_TIMEOUT)
+    if not getattr(_STATE, 'stack', None):
+        return timeout
+
+    check()
+    left = remaining()
+    if left is None:
+        return timeout
+
+    connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+    return (
+        left if connect is None else min(connect, left),
+        left if read is None else min(read, left),
+    )
+
+class deadline(object): # pylint: disable=invalid-name
+    """
+    Context manager limiting the time of all API calls made inside the block.
+
+    `seconds` could be None for a block which is only cancellable.
+    """
+
+    def __init__(self, seconds=None):
+        """Constructor for deadline."""
+        self.seconds = seconds
+        self.expires = None
+        self._cancelled = threading.Event()
+
+    def __enter__(self):
+        """Start the countdown for requests of the current thread."""
+        self.expires = None if self.seconds is None else _clock() + self.seconds
+        self._cancelled.clear()
+        _active_deadlines().append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Stop limiting requests."""
+        _active_deadlines().remove(self)
+        return False
+
+    def remaining(self):
+        """Return seconds left, 0 when the time is over, None without a time limit."""
+        if self.expires is None:
+            return None
+        return max(0.0, self.expires - _clock())
+
+    def cancel(self):
+        """
+        Make every following request of the block fail, thread-safe.
+
+        Requests already sent are not interrupted, they end within their timeouts.
+        """
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        """Return True if the deadline was cancelled."""
+        return self._cancelled.is_set()
+
+    def expired(self):
+        """Return True if the time is over or the deadline was cancelled."""
+        return self.cancelled or self.remaining() == 0
@@ -10,7 +10,8 @@ Custom names for library dependent exceptions.
 
 __all__ = ('Error', 'ClientError', 'ModelError',
            'UnauthorizedError', 'BadRequestError', 'InternalServerError',
-           'ConflictError', 'ModelAttributeError', 'MethodNotImplementedError')
+           'ConflictError', 'ModelAttributeError', 'MethodNotImplementedError',
+           'RequestBudgetExceededError', 'RequestBudgetWarning', 'DeadlineExceededError')
 
 class Error(Exception):
     """Base error class for library namespacing."""
@@ -56,3 +57,18 @@ class MethodNotImplementedError(ModelError):
     """NotImplemented error remap for abstract Resource class."""
 
     pass
+
+class RequestBudgetExceededError(ClientError):
+    """More API calls were made inside a `request_budget` block than allowed."""
+
+    pass
+
+class DeadlineExceededError(ClientError):
+    """A request was about to start after its deadline passed or was cancelled."""
+
+    pass
+
+class RequestBudgetWarning(UserWarning):
+    """Non-strict counterpart of `RequestBudgetExceededError`."""
+
+    pass
@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+`anydo_api.forest`.
+
+`TaskForest` class.
+
+Parent and child links of all cached tasks, built in one pass
+and updated incrementally, so tree walks do not scan the task list.
+"""
+
+import threading
+
+from anydo_api.task import Task
+
+__all__ = ('TaskForest')
+
+class TaskForest(object):
+    """
+    `TaskForest` keeps the tree structure of tasks by their `parentGlobalTaskId`.
+
+    Tasks whose parent is not cached are roots. Children keep the order they were added in.
+    It is a `User` listener, it is attached by `user.forest()` on the first call.
+    """
+
+    def __init__(self):
+        """Constructor for TaskForest."""
+        self._lock = threading.Lock()
+        self._tasks = {}
+        self._parents = {}
+        self._children = {}
+
+    def __len__(self):
+        """Return a number of tasks in the forest."""
+        return len(self._tasks)
+
+    def rebuild(self, tasks):
+        """Replace the forest with the given tasks."""
+        with self._lock:
+            self._tasks = {}
+            self._parents = {}
+            self._children = {}
+            for task in tasks:
+                self._add(task)
+
+    def task(self, task_id):
+        """Return a task by id or None."""
+        return self._tasks.get(task_id)
+
+    def roots(self):
+        """Return tasks without a cached parent."""
+        with self._lock:
+            return [
+                task for task_id, task in self._tasks.items()
+                if self._parents.get(task_id) not in self._tasks
+            ]
+
+    def parent(self, task_id):
+        """Return the parent task or None."""
+        with self._lock:
+            return self._tasks.get(self._parents.get(task_id))
+
+    def children(self, task_id):
+        """Return direct subtasks."""
+        with self._lock:
+            return [self._tasks[child_id] for child_id in self._children.get(task_id, ())]
+
+    def descendants(self, task_id, skip=None):
+        """
+        Return all the subtasks at any depth, every parent goes before its children.
+
+        Tasks for which `skip(task)` is true are left out together with their subtasks.
+        """
+        with self._lock:
+            result = []
+            seen = set([task_id])
+            stack = list(reversed(self._children.get(task_id, ())))
+            while stack:
+                child_id = stack.pop()
+                if child_id in seen:
+                    continue
+                seen.add(child_id)
+                if skip is not None and skip(self._tasks[child_id]):
+                    continue
+                result.append(self._tasks[child_id])
+                stack.extend(reversed(self._children.get(child_id, ())))
+            return result
+
+    def ancestors(self, task_id):
+        """Return the parent, its parent and so on up to the root."""
+        with self._lock:
+            result = []
+            seen = set([task_id])
+            parent_id = self._parents.get(task_id)
+            while parent_id in self._tasks and parent_id not in seen:
+                seen.add(parent_id)
+                result.append(self._tasks[parent_id])
+                parent_id = self._parents.get(parent_id)
+            return result
+
+    def depth(self, task_id):
+        """Return a number of ancestors, 0 for root tasks."""
+        return len(self.ancestors(task_id))
+
+    def subtree_size(self, task_id):
+        """Return a number of tasks in the subtree including the task itself."""
+        return 1 + len(self.descendants(task_id))
+
+    # `User` listener interface
+
+    def resource_saved(self, user, resource): # pylint: disable=unused-argument
+        """Relink the saved or created task."""
+        self.resources_saved(user, [resource])
+
+    def resources_saved(self, user, resources): # pylint: disable=unused-argument
+        """Relink all the saved tasks."""
+        with self._lock:
+            for resource in resources:
+                if not isinstance(resource, Task):
+                    continue
+                parent_id = resource.data_dict.get('parentGlobalTaskId') or None
+                if resource['id'] in self._tasks and self._parents.get(resource['id']) == parent_id:
+                    self._tasks[resource['id']] = resource
+                    continue
+                self._remove(resource['id'])
+                self._add(resource)
+
+    def resource_removed(self, user, resource): # pylint: disable=unused-argument
+        """Unlink the deleted task."""
+        self.resources_removed(user, [resource])
+
+    def resources_removed(self, user, resources): # pylint: disable=unused-argument
+        """Unlink all the deleted tasks, their subtasks become roots."""
+        with self._lock:
+            for resource in resources:
+                if isinstance(resource, Task):
+                    self._remove(resource['id'])
+
+    def tasks_loaded(self, user, tasks): # pylint: disable=unused-argument
+        """Rebuild the forest of freshly loaded tasks."""
+        self.rebuild(tasks)
+
+    def _add(self, task):
+        """Link a task, must be called under the lock."""
+        task_id = task['id']
+        parent_id = task.data_dict.get('parentGlobalTaskId')
+        self._tasks[task_id] = task
+        if parent_id:
+            self._parents[task_id] = parent_id
+            self._children.setdefault(parent_id, []).append(task_id)
+
+    def _remove(self, task_id):
+        """Unlink a task, its children stay, must be called under the lock."""
+        if self._tasks.pop(task_id, None) is None:
+            return
+
+        parent_id = self._parents.pop(task_id, None)
+        if parent_id is not None:
+            siblings = self._children[parent_id]
+            siblings.remove(task_id)
+            if not siblings:
+                del self._children[parent_id]
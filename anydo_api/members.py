@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+`anydo_api.members`.
+
+`MembersIndex` class.
+
+Index of shared task members by their emails.
+"""
+
+import threading
+
+from anydo_api.task import Task
+
+__all__ = ('MembersIndex')
+
+class MembersIndex(object):
+    """
+    `MembersIndex` maps member emails to the tasks shared with them.
+
+    Emails are compared case insensitive, owners and pending invitees are members too.
+    It is a `User` listener, it is attached by `user.tasks_shared_with()` on the first call.
+    """
+
+    def __init__(self):
+        """Constructor for MembersIndex."""
+        self._lock = threading.Lock()
+        self._tasks = {}
+        self._emails = {}
+
+    def rebuild(self, tasks):
+        """Replace indexed tasks with the given ones."""
+        with self._lock:
+            self._tasks = {}
+            self._emails = {}
+            for task in tasks:
+                self._index(task)
+
+    def tasks(self, email):
+        """Return tasks shared with the email, ordered by task id."""
+        with self._lock:
+            found = self._tasks.get(email.lower(), {})
+            return [found[task_id] for task_id in sorted(found)]
+
+    def emails(self):
+        """Return a sorted list of all member emails."""
+        with self._lock:
+            return sorted(self._tasks)
+
+    # `User` listener interface
+
+    def resource_saved(self, user, resource): # pylint: disable=unused-argument
+        """Reindex members of the saved, created or shared task."""
+        self.resources_saved(user, [resource])
+
+    def resources_saved(self, user, resources): # pylint: disable=unused-argument
+        """Reindex members of all the saved tasks."""
+        with self._lock:
+            for resource in resources:
+                if isinstance(resource, Task):
+                    self._index(resource)
+
+    def resource_removed(self, user, resource): # pylint: disable=unused-argument
+        """Drop the deleted task."""
+        self.resources_removed(user, [resource])
+
+    def resources_removed(self, user, resources): # pylint: disable=unused-argument
+        """Drop all the deleted tasks."""
+        with self._lock:
+            for resource in resources:
+                if isinstance(resource, Task):
+                    self._drop(resource['id'])
+
+    def tasks_loaded(self, user, tasks): # pylint: disable=unused-argument
+        """Reindex freshly loaded tasks."""
+        self.rebuild(tasks)
+
+    def _index(self, task):
+        """Put the task under emails of its members, must be called under the lock."""
+        emails = frozenset(
+            member['target'].lower()
+            for member in task.data_dict.get('sharedMembers') or [] if member.get('target')
+        )
+        task_id = task['id']
+        for email in self._emails.get(task_id, frozenset()) - emails:
+            self._discard(email, task_id)
+        for email in emails:
+            self._tasks.setdefault(email, {})[task_id] = task
+
+        if emails:
+            self._emails[task_id] = emails
+        else:
+            self._emails.pop(task_id, None)
+
+    def _drop(self, task_id):
+        """Remove the task, must be called under the lock."""
+        for email in self._emails.pop(task_id, ()):
+            self._discard(email, task_id)
+
+    def _discard(self, email, task_id):
+        """Remove the task from the email entry, must be called under the lock."""
+        found = self._tasks[email]
+        del found[task_id]
+        if not found:
+            del self._tasks[email]
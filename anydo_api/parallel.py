@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+`anydo_api.parallel`.
+
+Run many API calls at once on worker threads.
+
+Workers inherit the thread-local context of the caller: tracing spans,
+request budgets and deadlines work as if the calls were made in place.
+"""
+
+import contextlib
+
+from concurrent import futures
+
+from anydo_api import budget
+from anydo_api import deadlines
+from anydo_api import tracing
+
+__all__ = ('run_all', 'capture_context', 'restored_context')
+
+# modules keeping per-thread state as a `_STATE.stack` list
+_PROPAGATED = [budget, deadlines, tracing]
+
+def capture_context():
+    """
+    Return the thread-local context of the current thread.
+
+    With active request budgets it holds the call site too,
+    so calls of worker threads are reported as made from there.
+    """
+    # pylint: disable=protected-access
+    stacks = [(module, list(getattr(module._STATE, 'stack', []))) for module in _PROPAGATED]
+    return stacks, budget.capture_call_site()
+
+@contextlib.contextmanager
+def restored_context(context):
+    """Run the block with the context captured in another thread."""
+    # pylint: disable=protected-access
+    stacks, call_site = context
+    saved = [(module, getattr(module._STATE, 'stack', None)) for module, _ in stacks]
+    for module, stack in stacks:
+        module._STATE.stack = list(stack)
+    try:
+        with budget.called_from(call_site):
+            yield
+    finally:
+        for module, stack in saved:
+            module._STATE.stack = stack if stack is not None else []
+
+def run_all(func, items, max_workers=8):
+    """
+    Call `func(item)` for every item, at most `max_workers` at once.
+
+    Return a list of finished `concurrent.futures.Future` in the order of items,
+    errors are kept in their futures.
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    context = capture_context()
+
+    def _job(item):
+        """Worker job."""
+        with restored_context(context):
+            return func(item)
+
+    with futures.ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        submitted = [executor.submit(_job, item) for item in items]
+
+    return submitted
@@ -0,0 +1,186 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+`anydo_api.pool`.
+
+`ClientPool` class.
+
+Many authenticated accounts served by a fixed set of worker threads
+over a shared connection pool.
+"""
+
+import collections
+import hashlib
+import os
+import threading
+
+from concurrent import futures
+
+from anydo_api import request
+from anydo_api.client import Client
+
+__all__ = ('ClientPool')
+
+class ClientPool(object):
+    """
+    `ClientPool` manages many `Client`/`User` pairs.
+
+    All clients share one transport adapter, so connections to the API are reused
+    across accounts. Work is queued per account and workers pick accounts in
+    round-robin order, so a busy account can not starve the others.
+    At most `max_workers` operations run at once, at most `max_per_account` of them
+    for the same account.
+    """
+
+    def __init__(self, max_workers=8, max_per_account=1, pool_maxsize=None, session_dir=None):
+        """Constructor for ClientPool."""
+        self.max_workers = max_workers
+        self.max_per_account = max_per_account
+        self.session_dir = session_dir
+        self.adapter = request.new_adapter(pool_maxsize=pool_maxsize or max_workers)
+
+        self._clients = {}
+        self._account_locks = collections.defaultdict(threading.Lock)
+        self._clients_lock = threading.Lock()
+
+        self._queues = collections.OrderedDict()
+        self._running = collections.defaultdict(int)
+        self._condition = threading.Condition()
+        self._workers = []
+        self._closed = False
+
+    def __enter__(self):
+        """Use the pool as a context manager."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Wait for all queued work and stop workers."""
+        self.close()
+        return False
+
+    def client(self, email, password):
+        """Return an authenticated client for the account, logging in on the first call only."""
+        with self._clients_lock:
+            account_lock = self._account_locks[email]
+
+        with account_lock:
+            if email not in self._clients:
+                self._clients[email] = Client(
+                    email=email,
+                    password=password,
+                    session_file=self._session_file(email),
+                    adapter=self.adapter
+                )
+
+            return self._clients[email]
+
+    def user(self, email, password):
+        """Return a user object of the account."""
+        return self.client(email, password).get_user()
+
+    def submit(self, account, func):
+        """
+        Schedule `func(user)` for the account given as `(email, password)` pair.
+
+        Return a `concurrent.futures.Future` with the result.
+        """
+        email, password = account
+        future = futures.Future()
+
+        with self._condition:
+            if self._closed:
+                raise RuntimeError('Can not schedule new work on a closed pool')
+
+            self._queues.setdefault(email, collections.deque()).append((password, func, future))
+            self._start_worker()
+            self._condition.notify()
+
+        return future
+
+    def map(self, func, accounts, return_exceptions=False):
+        """
+        Run `func(user)` for every account in parallel.
+
+        Yield `(email, result)` pairs in the order of completion.
+        An error raised by `func` is re-raised,
+        or yielded as the result if `return_exceptions` is set.
+        """
+        pending = {}
+        for account in accounts:
+            pending[self.submit(account, func)] = account[0]
+
+        for future in futures.as_completed(pending):
+            error = future.exception()
+            if error is not None and not return_exceptions:
+                raise error
+
+            yield pending[future], error if error is not None else future.result()
+
+    def close(self):
+        """Finish queued work and stop the workers."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+        for worker in self._workers:
+            worker.join()
+
+        self.adapter.close()
+
+    def _session_file(self, email):
+        """Return a path for persisted session of the account if `session_dir` is set."""
+        if not self.session_dir:
+            return None
+
+        digest = hashlib.sha1(email.encode('utf-8')).hexdigest()
+        return os.path.join(self.session_dir, digest + '.json')
+
+    def _start_worker(self):
+        """Start one more worker thread unless all of them are running already."""
+        if len(self._workers) < self.max_workers:
+            name = 'anydo-pool-{}'.format(len(self._workers))
+            worker = threading.Thread(target=self._work, name=name)
+            worker.daemon = True
+            self._workers.append(worker)
+            worker.start()
+
+    def _next_job(self):
+        """
+        Pop a job of the first account in round-robin order which is below its concurrency cap.
+
+        Served account goes to the end of the line. Must be called under the condition lock.
+        """
+        for email, queue in self._queues.items():
+            if self._running[email] < self.max_per_account:
+                job = queue.popleft()
+                del self._queues[email]
+                if queue:
+                    self._queues[email] = queue
+                return email, job
+
+        return None
+
+    def _work(self):
+        """Worker thread loop."""
+        while True:
+            with self._condition:
+                picked = self._next_job()
+                while picked is None:
+                    if self._closed and not self._queues:
+                        return
+                    self._condition.wait()
+                    picked = self._next_job()
+
+                email, (password, func, future) = picked
+                self._running[email] += 1
+
+            try:
+                if future.set_running_or_notify_cancel():
+                    try:
+                        future.set_result(func(self.user(email, password)))
+                    except Exception as error: # pylint: disable=broad-except
+                        future.set_exception(error)
+            finally:
+                with self._condition:
+                    self._running[email] -= 1
+                    self._condition.notify_all()
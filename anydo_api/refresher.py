@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+`anydo_api.refresher`.
+
+`Refresher` class.
+
+Stale-while-revalidate for `User` caches: reads are served from the cache
+while a background worker reloads tasks, categories and pending tasks.
+"""
+
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+
+from concurrent import futures
+
+__all__ = ('Refresher')
+
+_LOGGER = logging.getLogger(__name__)
+
+class Refresher(object):
+    """
+    `Refresher` reloads caches of its users in the background.
+
+    Every user is refreshed each `interval` seconds, the interval is randomly
+    stretched or shrunk by up to `jitter` part of it, so many users do not
+    refresh in lockstep. With `max_age` set, reading data older than `max_age`
+    seconds schedules an immediate refresh, the cached data is still returned.
+    One scheduler thread serves any number of users, at most `max_workers` refreshes run at once.
+    Attach it with `user.use_refresher(refresher)`.
+    """
+
+    def __init__(self, interval=60, jitter=0.1, max_age=None, max_workers=4):
+        """Constructor for Refresher."""
+        self.interval = interval
+        self.jitter = jitter
+        self.max_age = max_age
+
+        self._executor = futures.ThreadPoolExecutor(max_workers=max_workers)
+        self._condition = threading.Condition()
+        self._queue = []
+        self._sequence = itertools.count()
+        self._due = {}
+        self._refreshed = {}
+        self._running = set()
+        self._closed = False
+        self._thread = None
+
+    def __enter__(self):
+        """Use the refresher as a context manager."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Stop refreshing."""
+        self.close()
+        return False
+
+    def add(self, user):
+        """
+        Start refreshing the user.
+
+        The first refresh happens at a random moment within the interval.
+        """
+        with self._condition:
+            if self._closed:
+                raise RuntimeError('Can not add users to a closed refresher')
+
+            self._refreshed[user] = time.time()
+            self._schedule(user, time.time() + random.uniform(0, self.interval))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='anydo-refresher')
+                self._thread.daemon = True
+                self._thread.start()
+
+    def remove(self, user):
+        """Stop refreshing the user."""
+        with self._condition:
+            self._due.pop(user, None)
+            self._refreshed.pop(user, None)
+
+    def touch(self, user):
+        """Schedule an immediate refresh if the user data is older than `max_age`."""
+        if self.max_age is None:
+            return
+
+        with self._condition:
+            refreshed = self._refreshed.get(user)
+            if refreshed is None or user in self._running:
+                return
+            if time.time() - refreshed >= self.max_age:
+                self._schedule(user, time.time())
+
+    def next_interval(self):
+        """Return seconds to wait before the next refresh of a user."""
+        return self.interval * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def close(self):
+        """Stop the scheduler and wait for running refreshes."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+        if self._thread is not None:
+            self._thread.join()
+        self._executor.shutdown(wait=True)
+
+    @staticmethod
+    def refresh(user):
+        """Reload all the cached data of the user, every list is swapped in at once."""
+        user.tasks(refresh=True)
+        user.categories(refresh=True)
+        user.pending_tasks(refresh=True)
+
+    def _schedule(self, user, due):
+        """Put the user in the queue, earlier entries are dropped. Must be called under the lock."""
+        self._due[user] = due
+        heapq.heappush(self._queue, (due, next(self._sequence), user))
+        self._condition.notify_all()
+
+    def _run(self):
+        """Scheduler thread loop."""
+        with self._condition:
+            while not self._closed:
+                if not self._queue:
+                    self._condition.wait()
+                    continue
+
+                due, _, user = self._queue[0]
+                if self._due.get(user) != due:
+                    heapq.heappop(self._queue)
+                    continue
+
+                delay = due - time.time()
+                if delay > 0:
+                    self._condition.wait(delay)
+                    continue
+
+                heapq.heappop(self._queue)
+                del self._due[user]
+                self._running.add(user)
+                self._executor.submit(self._refresh, user)
+
+    def _refresh(self, user):
+        """Worker job: refresh the user and schedule the next refresh."""
+        try:
+            self.refresh(user)
+        except Exception: # pylint: disable=broad-except
+            _LOGGER.exception('Background refresh of user %s failed', user.data_dict.get('id'))
+
+        with self._condition:
+            self._running.discard(user)
+            if user in self._refreshed and not self._closed:
+                self._refreshed[user] = time.time()
+                self._schedule(user, time.time() + self.next_interval())
@@ -0,0 +1,238 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+`anydo_api.reminders`.
+
+`Reminders` class.
+
+Due and alert times of cached tasks of many users kept in sorted order,
+so window queries are a binary search plus the matched tasks,
+and callbacks are fired by one timer thread when the times come.
+"""
+
+import bisect
+import logging
+import threading
+import time
+
+from anydo_api.task import Task
+
+__all__ = ('Reminders', 'KINDS')
+
+_LOGGER = logging.getLogger(__name__)
+
+KINDS = ('due', 'alert')
+
+class Reminders(object):
+    """
+    `Reminders` tracks due dates and alerts of open (UNCHECKED) tasks.
+
+    Times are reindexed whenever a task is saved, created, completed, deleted or reloaded.
+    Callbacks registered with `add_callback` are called as `callback(kind, task)`
+    from the timer thread for times that pass after the callback is registered.
+    Attach users with `user.use_reminders(reminders)`.
+    """
+
+    def __init__(self):
+        """Constructor for Reminders."""
+        self._condition = threading.Condition()
+        self._times = dict((kind, []) for kind in KINDS)
+        self._entries = {}
+        self._tasks = {}
+        self._callbacks = []
+        self._cursor = None
+        self._closed = False
+        self._thread = None
+
+    def __enter__(self):
+        """Use reminders as a context manager."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Stop the timer thread."""
+        self.close()
+        return False
+
+    def __len__(self):
+        """Return a number of tracked tasks."""
+        return len(self._tasks)
+
+    def add(self, user):
+        """Start tracking tasks of the user, the cached ones are indexed at once."""
+        user.add_listener(self)
+        self.tasks_loaded(user, user.tasks_list or [])
+
+    def remove(self, user):
+        """Stop tracking tasks of the user."""
+        user.remove_listener(self)
+        with self._condition:
+            for key in [key for key in self._tasks if key[0] == user['id']]:
+                self._drop(key)
+
+    def add_callback(self, callback):
+        """Call `callback(kind, task)` when a due or an alert time of a task comes."""
+        with self._condition:
+            if self._closed:
+                raise RuntimeError('Can not add callbacks to closed reminders')
+
+            self._callbacks = self._callbacks + [callback]
+            if self._thread is None:
+                self._cursor = _milliseconds(time.time())
+                self._thread = threading.Thread(target=self._run, name='anydo-reminders')
+                self._thread.daemon = True
+                self._thread.start()
+
+    def remove_callback(self, callback):
+        """Stop calling the callback."""
+        with self._condition:
+            self._callbacks = [known for known in self._callbacks if known is not callback]
+
+    def between(self, start, end, kind='due'):
+        """Return tasks with `kind` time within `[start, end]` epoch seconds, earliest first."""
+        times = self._times[kind]
+        with self._condition:
+            first = bisect.bisect_left(times, (_milliseconds(start),))
+            last = bisect.bisect_left(times, (_milliseconds(end) + 1,))
+            return [self._tasks[entry[1:]] for entry in times[first:last]]
+
+    def upcoming(self, within, kind='due'):
+        """Return tasks with `kind` time in the next `within` seconds, earliest first."""
+        now = time.time()
+        return self.between(now, now + within, kind)
+
+    def next_time(self, kind='due'):
+        """Return the earliest future `kind` time in seconds since the epoch or None."""
+        times = self._times[kind]
+        with self._condition:
+            position = bisect.bisect_left(times, (_milliseconds(time.time()),))
+            return times[position][0] / 1000.0 if position < len(times) else None
+
+    def close(self):
+        """Stop the timer thread, pending callbacks are not called."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+        if self._thread is not None:
+            self._thread.join()
+
+    # `User` listener interface
+
+    def resource_saved(self, user, resource):
+        """Reindex the saved or created task."""
+        if isinstance(resource, Task):
+            with self._condition:
+                self._index(user, resource)
+
+    def resources_saved(self, user, resources):
+        """Reindex all the saved tasks."""
+        with self._condition:
+            for resource in resources:
+                if isinstance(resource, Task):
+                    self._index(user, resource)
+
+    def resource_removed(self, user, resource):
+        """Drop the deleted task."""
+        self.resources_removed(user, [resource])
+
+    def resources_removed(self, user, resources):
+        """Drop all the deleted tasks."""
+        with self._condition:
+            for resource in resources:
+                if isinstance(resource, Task):
+                    self._drop((user['id'], resource['id']))
+
+    def tasks_loaded(self, user, tasks):
+        """Replace tracked tasks of the user with freshly loaded ones."""
+        with self._condition:
+            fresh = set((user['id'], task['id']) for task in tasks)
+            for key in [key for key in self._tasks if key[0] == user['id'] and key not in fresh]:
+                self._drop(key)
+            for task in tasks:
+                self._index(user, task)
+
+    def _index(self, user, task):
+        """Put the task times in order, must be called under the lock."""
+        key = (user['id'], task['id'])
+        entries = [(kind, (when,) + key) for kind, when in _task_times(task.data_dict)]
+        if entries == self._entries.get(key):
+            self._tasks[key] = task
+            return
+
+        self._drop(key)
+        if not entries:
+            return
+
+        self._tasks[key] = task
+        self._entries[key] = entries
+        for kind, entry in entries:
+            bisect.insort(self._times[kind], entry)
+        self._condition.notify_all()
+
+    def _drop(self, key):
+        """Remove the task times, must be called under the lock."""
+        self._tasks.pop(key, None)
+        for kind, entry in self._entries.pop(key, ()):
+            times = self._times[kind]
+            del times[bisect.bisect_left(times, entry)]
+
+    def _run(self):
+        """Timer thread loop."""
+        while True:
+            with self._condition:
+                if self._closed:
+                    return
+
+                now = _milliseconds(time.time())
+                due = self._collect(now)
+                if not due:
+                    upcoming = [
+                        times[position][0] for times, position in (
+                            (times, bisect.bisect_left(times, (self._cursor + 1,)))
+                            for times in self._times.values()
+                        ) if position < len(times)
+                    ]
+                    self._condition.wait((min(upcoming) - now) / 1000.0 if upcoming else None)
+                    continue
+
+                callbacks = self._callbacks
+
+            for kind, task in due:
+                for callback in callbacks:
+                    try:
+                        callback(kind, task)
+                    except Exception: # pylint: disable=broad-except
+                        _LOGGER.exception('Reminder callback for task %s failed', task['id'])
+
+    def _collect(self, now):
+        """Return `(kind, task)` pairs of times passed since the last call, earliest first."""
+        due = []
+        for kind, times in self._times.items():
+            first = bisect.bisect_left(times, (self._cursor + 1,))
+            last = bisect.bisect_left(times, (now + 1,))
+            due.extend((entry[0], kind, self._tasks[entry[1:]]) for entry in times[first:last])
+
+        self._cursor = max(self._cursor, now)
+        due.sort(key=lambda item: item[0])
+        return [(kind, task) for _, kind, task in due]
+
+def _task_times(data):
+    """Return `(kind, milliseconds)` pairs of an open task."""
+    if data.get('status') != 'UNCHECKED':
+        return []
+
+    times = []
+    due = data.get('dueDate')
+    if due:
+        times.append(('due', int(due)))
+
+    alert = data.get('alert') or {}
+    if alert.get('type') == 'CUSTOM' and alert.get('customTime'):
+        times.append(('alert', int(alert['customTime'])))
+    elif alert.get('type') not in (None, 'NONE') and due:
+        times.append(('alert', int(due) - int(alert.get('offset') or 0)))
+    return times
+
+def _milliseconds(seconds):
+    """Convert seconds since the epoch to API timestamps."""
+    return int(seconds * 1000)
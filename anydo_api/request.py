@@ -5,19 +5,30 @@ anydo_api.request.
 
 Helper functions for HTTP API calls.
 Wrapped `requests` methods with default headers and options.
+
+`requests` is imported lazily, on the first actual request,
+to keep `import anydo_api` cheap for short-lived processes.
 """
 
-import requests
+import threading
 
+from anydo_api import budget
+from anydo_api import deadlines
 from anydo_api import errors
+from anydo_api import tracing
 
-__all__ = ('get', 'post', 'put', 'delete')
+__all__ = ('get', 'post', 'put', 'delete', 'new_session', 'new_adapter')
 
 try:
     __SERVER_ERRORS = xrange(500, 600) # pylint: disable=undefined-variable
 except NameError:
     __SERVER_ERRORS = range(500, 600)
 
+# `Retry` subclass limited by deadlines, created along with the `requests` import
+__RETRY_CLASS = []
+# timeout of the request being sent by the current thread, its retries get the same one
+__SENDING = threading.local()
+
 def get(url, **options):
     """Simple GET request wrapper."""
     return __base_request(method='get', url=url, **options)
@@ -35,6 +46,83 @@ def delete(url, **options):
     return __base_request(method='delete', url=url, **options)
 
 
+def new_session(adapter=None):
+    """
+    Return a new `requests.Session`, importing `requests` on the first call.
+
+    Sessions created with an `adapter` share its connection pool: the adapter is never
+    replaced or closed after a request, as it could be in use by other sessions.
+    """
+    import requests
+
+    session = requests.Session()
+    if adapter is not None:
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.shared_adapter = adapter
+
+    return session
+
+def new_adapter(pool_maxsize=10):
+    """Return a retrying `HTTPAdapter` with a connection pool to share between sessions."""
+    import requests
+
+    return requests.adapters.HTTPAdapter(
+        pool_connections=pool_maxsize,
+        pool_maxsize=pool_maxsize,
+        max_retries=__retry_policy()
+    )
+
+def __retry_policy():
+    """
+    Return retry configuration for idempotent requests failed by server errors.
+
+    Inside a deadline with a time limit a request is retried only while the time left
+    covers another attempt, as a retry gets the whole timeout of the first attempt again.
+    A cancelled deadline stops retrying at once.
+    """
+    import requests
+
+    if not __RETRY_CLASS:
+        base = requests.packages.urllib3.util.Retry
+        attempt_fits = __attempt_fits
+
+        class DeadlineRetry(base): # pylint: disable=too-few-public-methods
+            """`Retry` which never retries past deadlines."""
+
+            def is_retry(self, method, status_code, has_retry_after=False):
+                """Return False for responses if another attempt would not end in time."""
+                if not attempt_fits(waits=has_retry_after):
+                    return False
+                return super(DeadlineRetry, self).is_retry(method, status_code, has_retry_after)
+
+            def increment(self, *args, **kwargs):
+                """Give up on errors if another attempt would not end in time, or raise."""
+                deadlines.check()
+                retry = self if attempt_fits() else self.new(total=0)
+                return super(DeadlineRetry, retry).increment(*args, **kwargs)
+
+        __RETRY_CLASS.append(DeadlineRetry)
+
+    return __RETRY_CLASS[0](total=2, status_forcelist=__SERVER_ERRORS)
+
+def __attempt_fits(waits=False):
+    """
+    Return True if another attempt of the request being sent ends before active deadlines.
+
+    An attempt could take its connect and read timeouts. With `waits` the server asked
+    to retry after a delay, which is not waited for inside deadlines with a time limit.
+    """
+    left = deadlines.remaining()
+    if left is None:
+        return True
+    if waits:
+        return False
+
+    timeout = getattr(__SENDING, 'timeout', None)
+    connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+    return connect is not None and read is not None and connect + read <= left
+
 def __prepare_request_arguments(**options):
     """Return a dict representing default request arguments."""
     options = options.copy()
@@ -46,7 +134,8 @@ def __prepare_request_arguments(**options):
     }
 
     params = options.pop('params') if 'params' in options else ''
-    timeout = options.pop('timeout') if 'timeout' in options else 5 # don't hung the client to long
+    # None is the endpoint default, cut to the time left until active deadlines on send
+    timeout = options.pop('timeout') if 'timeout' in options else None
 
     if 'headers' in options:
         headers.update(options.pop('headers'))
@@ -62,6 +151,8 @@ def __prepare_request_arguments(**options):
 
 def __check_response_for_errors(response):
     """Raise and exception in case of HTTP error during API call, mapped to custom errors."""
+    import requests
+
     # bug in PyLint, seems not merged in 1.5.5 yet https://github.com/PyCQA/pylint/pull/742
     try:
         response.raise_for_status()
@@ -78,6 +169,54 @@ def __check_response_for_errors(response):
         client_error.__cause__ = None
         raise client_error
 
+def __send(session, method, url, request_arguments):
+    """Send a single HTTP request, limited by deadlines, counted by budgets, traced as a span."""
+    import requests
+
+    request_arguments = dict(
+        request_arguments,
+        timeout=deadlines.timeout_for(method, url, request_arguments.get('timeout'))
+    )
+    budget.record_call(method, url)
+    __SENDING.timeout = request_arguments['timeout']
+    with tracing.span('HTTP ' + method.upper(), kind='http', method=method, url=url) as http_span:
+        try:
+            response = getattr(session, method)(url, **request_arguments)
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as error:
+            if __timed_out(error):
+                deadlines.check() # report timeouts cut by a deadline as the deadline
+            raise
+        if not __is_shared(session):
+            session.close()
+        http_span.set_attribute('status_code', response.status_code)
+
+    return response
+
+def __timed_out(error):
+    """Return True if a `requests` error is a connect or read timeout, retried ones too."""
+    import requests
+
+    if isinstance(error, requests.exceptions.Timeout):
+        return True
+
+    exceptions = requests.packages.urllib3.exceptions
+    reason = getattr(error.args[0] if error.args else None, 'reason', None)
+    return isinstance(reason, (exceptions.ConnectTimeoutError, exceptions.ReadTimeoutError))
+
+def __is_shared(session):
+    """Return True if the session uses a connection pool shared with other sessions."""
+    return getattr(session, 'shared_adapter', None) is not None
+
+def __reauthenticate(session):
+    """
+    Give the session owner a chance to log in again after 401 response.
+
+    Sessions with persisted cookies carry a `reauthenticate` callback returning True
+    if the request should be retried.
+    """
+    callback = getattr(session, 'reauthenticate', None)
+    return callable(callback) and callback()
+
 def __base_request(method, url, session=None, **options):
     """
     Base request wrapper.
@@ -85,19 +224,22 @@ def __base_request(method, url, session=None, **options):
     Make request according to the `method` passed, with default options applied.
     Forward other arguments into `request` object from the `request` library.
     """
+    import requests
+
     response_json = options.pop('response_json') if 'response_json' in options else True
     if not session:
         session = requests.Session()
     request_arguments = __prepare_request_arguments(**options)
 
-    if method == 'get':
-        adapter = requests.packages.urllib3.util.Retry(total=2, status_forcelist=__SERVER_ERRORS)
+    if method == 'get' and not __is_shared(session):
+        adapter = __retry_policy()
 
         session.mount('http://', requests.adapters.HTTPAdapter(max_retries=adapter))
         session.mount('https://', requests.adapters.HTTPAdapter(max_retries=adapter))
 
-    response = getattr(session, method)(url, **request_arguments)
-    session.close()
+    response = __send(session, method, url, request_arguments)
+    if response.status_code == 401 and __reauthenticate(session):
+        response = __send(session, method, url, request_arguments)
     __check_response_for_errors(response)
 
     if response_json and method != 'delete':
@@ -6,15 +6,29 @@
 `Resource` class.
 """
 
-import base64
-import random
-import six
+import copy
+import threading
+import weakref
 
 from anydo_api import errors
 from anydo_api import request
+from anydo_api import tracing
+from anydo_api import uid
 
 __all__ = ('Resource')
 
+# striped locks for read-compare-write of resource data, resources stay light and picklable
+_LOCKS = tuple(threading.RLock() for _ in range(64))
+
+def _restore(cls, data_dict, is_dirty, user_id):
+    """Rebuild a pickled resource, binding it to the registered user with the same id."""
+    resource = cls.__new__(cls)
+    resource.__dict__.update(data_dict=data_dict, is_dirty=is_dirty)
+    if 'user' in cls._reserved_attrs:
+        resource.__dict__['user'] = Resource.owners.get(user_id)
+    return resource
+
+@tracing.trace_methods
 class Resource(object):
     """
     `Resource` is the class representing common wrapper around AnyDo json objects.
@@ -26,6 +40,9 @@ class Resource(object):
     _reserved_attrs = ('data_dict', 'is_dirty')
     _endpoint = ''
 
+    # users by id, unpickled resources are bound to them
+    owners = weakref.WeakValueDictionary()
+
     def __init__(self, data_dict):
         """Constructor for generic Resource."""
         self.data_dict = data_dict
@@ -37,6 +54,10 @@ class Resource(object):
 
     def __getattr__(self, attr):
         """Access to resource data by attributes."""
+        if attr.startswith('__') or 'data_dict' not in self.__dict__:
+            # protocol lookups and half-built instances (copy, pickle) must not recurse
+            raise AttributeError(attr)
+
         try:
             result = self.data_dict[attr]
         except KeyError:
@@ -46,42 +67,82 @@ class Resource(object):
 
     def __setitem__(self, attr, new_value):
         """Set resource data values by indexes."""
-        if attr in self.data_dict:
-            old_value = self.data_dict[attr]
+        with self.lock():
+            if attr in self.data_dict:
+                old_value = self.data_dict[attr]
 
-            if old_value != new_value:
-                self.data_dict[attr] = new_value
-                self.is_dirty = True
-        else:
-            raise errors.ModelAttributeError(attr + ' is not exist')
+                if old_value != new_value:
+                    self.data_dict[attr] = new_value
+                    self.is_dirty = True
+            else:
+                raise errors.ModelAttributeError(attr + ' is not exist')
 
     def __setattr__(self, attr, new_value):
         """Assign resource data values as attribute values."""
         if attr not in self.get_reserved_attrs() and attr in self.data_dict:
-            old_value = self.data_dict[attr]
+            with self.lock():
+                old_value = self.data_dict[attr]
 
-            if old_value != new_value:
-                self.data_dict[attr] = new_value
-                self.__dict__['is_dirty'] = True
+                if old_value != new_value:
+                    self.data_dict[attr] = new_value
+                    self.__dict__['is_dirty'] = True
         else:
             super(Resource, self).__setattr__(attr, new_value)
 
-    def save(self, alternate_endpoint=None):
+    def __reduce__(self):
+        """
+        Pickle only the resource data and the id of its user.
+
+        The user with its session stays behind, unpickled resource is bound
+        to the user with the same id registered in the receiving process, if any.
+        Copies made with `copy` keep their user, see `__copy__` and `__deepcopy__`.
+        """
+        user = self.__dict__.get('user')
+        user_id = user.data_dict.get('id') if user is not None else None
+        return (_restore, (self.__class__, self.data_dict, self.is_dirty, user_id))
+
+    def __copy__(self):
+        """Copy the resource within the process, it stays bound to the same user."""
+        resource = self.__class__.__new__(self.__class__)
+        resource.__dict__.update(self.__dict__)
+        return resource
+
+    def __deepcopy__(self, memo):
+        """Copy the resource data deeply, the user and its session are shared with the copy."""
+        resource = self.__copy__()
+        memo[id(self)] = resource
+        resource.__dict__['data_dict'] = copy.deepcopy(self.data_dict, memo)
+        return resource
+
+    def save(self, alternate_endpoint=None, write_behind=True):
         """
         Push updated attributes to the server.
 
         If nothing was changed we dont hit an API.
+        With write-behind mode on, the save is queued and the method returns at once,
+        unless `write_behind` is False.
         """
-        if self.is_dirty:
-            processed_data = self._process_data_before_save(self.data_dict)
+        with self.lock():
+            if not self.is_dirty:
+                return self
 
-            request.put(
-                url=alternate_endpoint or (self.get_endpoint() + '/' + self['id']),
-                json=processed_data,
-                session=self.session()
-            )
+            queue = self._write_behind() if write_behind else None
+            if queue is not None:
+                queue.save(self, alternate_endpoint=alternate_endpoint)
+                return self
 
-            self.is_dirty = False
+            sent = dict(self.data_dict)
+
+        processed_data = self._process_data_before_save(dict(sent))
+
+        request.put(
+            url=alternate_endpoint or (self.get_endpoint() + '/' + self['id']),
+            json=processed_data,
+            session=self.session()
+        )
+
+        self.mark_saved(sent)
+        self._changed()
 
         return self
 
@@ -92,29 +153,66 @@ class Resource(object):
             json=self.data_dict,
             session=self.session()
         )
+        self._removed()
 
         return self
 
     delete = destroy
 
     #pylint: disable=no-self-use
+    @tracing.untraced
     def session(self):
         """Shortcut to retrive object session for requests."""
         raise errors.MethodNotImplementedError('Need to be implemented in the class descendant')
 
     def refresh(self, alternate_endpoint=None):
         """Reload resource data from remote service."""
-        self.data_dict = request.get(
+        data = request.get(
             url=alternate_endpoint or (self.get_endpoint() + '/' + self['id']),
             session=self.session()
         )
+        self.reset_data(data)
+        self._changed()
 
         return self
 
+    @tracing.untraced
+    def lock(self):
+        """
+        Return a lock guarding the resource data.
+
+        Locks are shared between resources by stripes, hold them for short updates only.
+        """
+        return _LOCKS[(id(self) >> 4) % len(_LOCKS)]
+
+    @tracing.untraced
+    def merge_data(self, data_dict):
+        """Replace the data with fresh server data, unless there are unsaved changes."""
+        with self.lock():
+            if not self.is_dirty:
+                self.data_dict = data_dict
+
+    @tracing.untraced
+    def reset_data(self, data_dict):
+        """Update the data in place with server data, unsaved changes are dropped."""
+        with self.lock():
+            self.data_dict.clear()
+            self.data_dict.update(data_dict)
+            self.is_dirty = False
+
+    @tracing.untraced
+    def mark_saved(self, sent):
+        """Mark the resource clean if `sent` data is still the current one."""
+        with self.lock():
+            if self.data_dict == sent:
+                self.is_dirty = False
+
+    @tracing.untraced
     def get_endpoint(self):
         """Return instance endpoint for API calls."""
         return self._endpoint
 
+    @tracing.untraced
     def get_reserved_attrs(self):
         """Return a tuple with reserved attributes, protected for internal usage."""
         return self._reserved_attrs
@@ -122,14 +220,12 @@ class Resource(object):
     @staticmethod
     def generate_uid():
         """Generate unique global id generator for new resources."""
-        random_string = six.b('').join([six.int2byte(random.randint(0, 255)) for _ in range(0, 16)])
-        result = base64.urlsafe_b64encode(random_string)
-        try:
-            result = result.decode('utf-8')
-        except UnicodeDecodeError:
-            pass
+        return uid.generate_uid()
 
-        return result
+    @staticmethod
+    def generate_uids(count):
+        """Generate a list of `count` unique ids at once (see `anydo_api.uid`)."""
+        return uid.generate_uids(count)
 
     @staticmethod
     def required_attributes():
@@ -174,6 +270,30 @@ class Resource(object):
 
         return cls._create_callback(response_obj, user)
 
+    def _write_behind(self):
+        """
+        Return a write-behind queue for saves of the resource, None to save synchronously.
+
+        Is not obligatory.
+        """
+        return None
+
+    def _changed(self):
+        """
+        Callback method that is called after resource data was synchronized with the server.
+
+        Is not obligatory.
+        """
+        pass
+
+    def _removed(self):
+        """
+        Callback method that is called after resource was deleted remotely.
+
+        Is not obligatory.
+        """
+        pass
+
     @staticmethod
     def _process_data_before_save(data_dict):
         """
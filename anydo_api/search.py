@@ -0,0 +1,296 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+`anydo_api.search`.
+
+`SearchIndex` class.
+
+Incremental inverted index of task titles, notes and subtask titles.
+Words are lowercased and stripped of accents, the last query word could be
+a prefix of indexed words, results are ranked by field weights and word rarity.
+"""
+
+import bisect
+import heapq
+import math
+import re
+import threading
+import unicodedata
+
+from anydo_api.task import Task
+
+__all__ = ('SearchIndex', 'tokenize')
+
+TITLE_WEIGHT = 3.0
+SUBTASK_WEIGHT = 2.0
+NOTE_WEIGHT = 1.0
+PREFIX_FACTOR = 0.5
+
+_WORD = re.compile(r'\w+', re.UNICODE)
+
+def tokenize(text):
+    """Return a list of normalized words of the text."""
+    if not text:
+        return []
+    if isinstance(text, bytes):
+        text = text.decode('utf-8')
+
+    text = text.lower()
+    try:
+        text.encode('ascii')
+    except UnicodeError:
+        text = u''.join(
+            char for char in unicodedata.normalize('NFKD', text)
+            if not unicodedata.combining(char)
+        )
+    return _WORD.findall(text)
+
+class SearchIndex(object):
+    """
+    `SearchIndex` keeps word postings of tasks.
+
+    It is a `User` listener, it is attached by `user.search()` on the first call.
+    A subtask title counts for its parent too, so a task is found by its subtasks.
+    """
+
+    def __init__(self):
+        """Constructor for SearchIndex."""
+        self._lock = threading.Lock()
+        self._tasks = {}
+        self._sources = {}
+        self._fields = {}
+        self._children = {}
+        self._terms = {}
+        self._postings = {}
+        self._vocabulary = []
+
+    def __len__(self):
+        """Return a number of indexed tasks."""
+        return len(self._tasks)
+
+    def rebuild(self, tasks):
+        """Replace indexed tasks with the given ones, words are taken before the lock is held."""
+        tasks = dict((task['id'], task) for task in tasks)
+        sources = dict((task_id, _source(task)) for task_id, task in tasks.items())
+        fields = dict((task_id, _fields(source)) for task_id, source in sources.items())
+        with self._lock:
+            self._tasks = tasks
+            self._sources = sources
+            self._fields = fields
+            self._children = {}
+            for task_id, (_, _, parent_id) in self._fields.items():
+                if parent_id:
+                    self._children.setdefault(parent_id, set()).add(task_id)
+
+            self._terms = {}
+            self._postings = {}
+            for task_id in self._fields:
+                terms = self._terms[task_id] = self._weights(task_id)
+                for term, weight in terms.items():
+                    self._postings.setdefault(term, {})[task_id] = weight
+            self._vocabulary = sorted(self._postings)
+
+    def index(self, task):
+        """Add or update a single task."""
+        with self._lock:
+            self._index(task)
+
+    def remove(self, task_id):
+        """Drop a single task."""
+        with self._lock:
+            self._remove(task_id)
+
+    def search(self, query, limit=None, skipped_statuses=()):
+        """
+        Return tasks matching every word of the query, best matches first.
+
+        The last word matches as a prefix too, exact matches rank higher.
+        Tasks in `skipped_statuses` are left out.
+        """
+        words = tokenize(query)
+        if not words:
+            return []
+
+        with self._lock:
+            total = float(len(self._terms) or 1)
+            scores = None
+            for position, word in enumerate(words):
+                matches = {}
+                terms = self._expand(word) if position == len(words) - 1 else [word]
+                for term in terms:
+                    posting = self._postings.get(term)
+                    if not posting:
+                        continue
+                    factor = math.log(1.0 + total / len(posting))
+                    if term != word:
+                        factor *= PREFIX_FACTOR
+                    for task_id, weight in posting.items():
+                        if scores is None or task_id in scores:
+                            matches[task_id] = matches.get(task_id, 0.0) + weight * factor
+
+                if scores is not None:
+                    for task_id in matches:
+                        matches[task_id] += scores[task_id]
+                scores = matches
+                if not scores:
+                    return []
+
+            if skipped_statuses:
+                scores = dict(
+                    (task_id, score) for task_id, score in scores.items()
+                    if self._tasks[task_id].data_dict.get('status') not in skipped_statuses
+                )
+
+            rank = lambda task_id: (-scores[task_id], task_id)
+            if limit is None:
+                ranked = sorted(scores, key=rank)
+            else:
+                ranked = heapq.nsmallest(limit, scores, key=rank)
+            return [self._tasks[task_id] for task_id in ranked]
+
+    # `User` listener interface
+
+    def resource_saved(self, user, resource): # pylint: disable=unused-argument
+        """Reindex the saved or created task."""
+        if isinstance(resource, Task):
+            self.index(resource)
+
+    def resources_saved(self, user, resources): # pylint: disable=unused-argument
+        """Reindex all the saved tasks under a single lock."""
+        with self._lock:
+            for resource in resources:
+                if isinstance(resource, Task):
+                    self._index(resource)
+
+    def resource_removed(self, user, resource): # pylint: disable=unused-argument
+        """Drop the deleted task."""
+        if isinstance(resource, Task):
+            self.remove(resource['id'])
+
+    def resources_removed(self, user, resources): # pylint: disable=unused-argument
+        """Drop all the deleted tasks under a single lock."""
+        with self._lock:
+            for resource in resources:
+                if isinstance(resource, Task):
+                    self._remove(resource['id'])
+
+    def tasks_loaded(self, user, tasks): # pylint: disable=unused-argument
+        """
+        Reindex freshly loaded tasks, only changed and dropped ones are reweighed.
+
+        Changed tasks are found and their words are taken before the lock is held,
+        so a reload blocks searches only while the changes are applied.
+        """
+        indexed = self._sources
+        loaded = {}
+        changed = []
+        for task in tasks:
+            task_id = task['id']
+            loaded[task_id] = task
+            source = _source(task)
+            if indexed.get(task_id) != source:
+                changed.append((task, source, _fields(source)))
+
+        with self._lock:
+            for task_id in [task_id for task_id in self._tasks if task_id not in loaded]:
+                self._remove(task_id)
+            self._tasks.update(loaded)
+            for task, source, fields in changed:
+                self._index(task, source, fields)
+
+    def _index(self, task, source=None, fields=None):
+        """
+        Add or update a task, must be called under the lock.
+
+        `fields` could be taken from the `source` beforehand.
+        """
+        task_id = task['id']
+        self._tasks[task_id] = task
+        source = _source(task) if source is None else source
+        if self._sources.get(task_id) == source:
+            return
+
+        self._sources[task_id] = source
+        previous = self._fields.get(task_id)
+        fields = self._fields[task_id] = _fields(source) if fields is None else fields
+        if previous == fields:
+            return
+
+        old_parent = previous[2] if previous else None
+        parent_id = fields[2]
+        if old_parent and old_parent != parent_id:
+            self._children.get(old_parent, set()).discard(task_id)
+            self._reweigh(old_parent)
+        if parent_id:
+            self._children.setdefault(parent_id, set()).add(task_id)
+
+        self._reweigh(task_id)
+        if parent_id and (previous is None or previous[0] != fields[0] or old_parent != parent_id):
+            self._reweigh(parent_id)
+
+    def _remove(self, task_id):
+        """Drop a task, must be called under the lock."""
+        fields = self._fields.pop(task_id, None)
+        self._tasks.pop(task_id, None)
+        self._sources.pop(task_id, None)
+        if fields is None:
+            return
+
+        self._reweigh(task_id)
+        if fields[2]:
+            self._children.get(fields[2], set()).discard(task_id)
+            self._reweigh(fields[2])
+
+    def _weights(self, task_id):
+        """Return `{term: weight}` of the task with titles of its subtasks."""
+        weights = {}
+        fields = self._fields.get(task_id)
+        if fields is None:
+            return weights
+
+        for words, weight in ((fields[0], TITLE_WEIGHT), (fields[1], NOTE_WEIGHT)):
+            for word in words:
+                weights[word] = weights.get(word, 0.0) + weight
+        for child_id in self._children.get(task_id, ()):
+            for word in self._fields[child_id][0]:
+                weights[word] = weights.get(word, 0.0) + SUBTASK_WEIGHT
+        return weights
+
+    def _reweigh(self, task_id):
+        """Update postings of the task to its current fields."""
+        old = self._terms.pop(task_id, {})
+        new = self._weights(task_id)
+        if new:
+            self._terms[task_id] = new
+
+        for term in old:
+            if term not in new:
+                posting = self._postings[term]
+                del posting[task_id]
+                if not posting:
+                    del self._postings[term]
+                    del self._vocabulary[bisect.bisect_left(self._vocabulary, term)]
+        for term, weight in new.items():
+            posting = self._postings.get(term)
+            if posting is None:
+                posting = self._postings[term] = {}
+                bisect.insort(self._vocabulary, term)
+            posting[task_id] = weight
+
+    def _expand(self, prefix):
+        """Return indexed terms starting with the prefix."""
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        end = start
+        while end < len(self._vocabulary) and self._vocabulary[end].startswith(prefix):
+            end += 1
+        return self._vocabulary[start:end]
+
+def _source(task):
+    """Return `(title, note, parent id)` of the task as they are indexed."""
+    data = task.data_dict
+    return data.get('title'), data.get('note'), data.get('parentGlobalTaskId')
+
+def _fields(source):
+    """Return `(title words, note words, parent id)` of the task source."""
+    title, note, parent_id = source
+    return tuple(tokenize(title)), tuple(tokenize(note)), parent_id
@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+`anydo_api.session_store`.
+
+`SessionStore` class.
+
+Persists authenticated session cookies and the `/me` payload between processes,
+so a client does not have to log in on every start.
+"""
+
+import contextlib
+import json
+import os
+
+try:
+    import fcntl
+except ImportError: # pragma: no cover, not available on Windows
+    fcntl = None
+
+__all__ = ('SessionStore')
+
+class SessionStore(object):
+    """
+    `SessionStore` is a JSON file with session cookies and cached user data.
+
+    The file is readable by the owner only. Reads and writes are guarded by
+    an advisory lock on a sibling `.lock` file, writes are atomic renames,
+    so the same file could be shared by many worker processes.
+    """
+
+    def __init__(self, path):
+        """Constructor for SessionStore."""
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self.lock_path = self.path + '.lock'
+
+    @contextlib.contextmanager
+    def lock(self, exclusive=False):
+        """Hold a shared or an exclusive lock for the store file."""
+        descriptor = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if fcntl:
+                fcntl.flock(descriptor, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(descriptor, fcntl.LOCK_UN)
+            os.close(descriptor)
+
+    def load(self, email):
+        """
+        Return stored state dict for the account with `email`.
+
+        None if nothing is stored, the file is broken or it belongs to another account.
+        """
+        with self.lock():
+            return self._read(email)
+
+    def save(self, email, cookies, me=None):
+        """Store session cookies and optional `/me` payload for the account."""
+        with self.lock(exclusive=True):
+            self._write(email, cookies, me)
+
+    def renew(self, email, stale_cookies, log_in):
+        """
+        Replace stale session cookies under an exclusive lock.
+
+        If another process has already renewed the session its cookies are reused,
+        otherwise `log_in` is called to get new ones. Return fresh cookies.
+        """
+        with self.lock(exclusive=True):
+            state = self._read(email) or {}
+            cookies = state.get('cookies')
+            if not cookies or cookies == stale_cookies:
+                cookies = log_in()
+                self._write(email, cookies, state.get('me'))
+
+            return cookies
+
+    def clear(self):
+        """Remove the stored state."""
+        with self.lock(exclusive=True):
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+    def _read(self, email):
+        """Read the state without locking."""
+        try:
+            with open(self.path) as stream:
+                state = json.load(stream)
+        except (IOError, OSError, ValueError):
+            return None
+
+        if state.get('email') != email:
+            return None
+
+        return state
+
+    def _write(self, email, cookies, me):
+        """Write the state atomically without locking."""
+        state = {'email': email, 'cookies': cookies, 'me': me}
+        temporary_path = '{}.{}.tmp'.format(self.path, os.getpid())
+        descriptor = os.open(temporary_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(descriptor, 'w') as stream:
+            json.dump(state, stream)
+        os.rename(temporary_path, self.path)
+
+    @staticmethod
+    def dump_cookies(session):
+        """Return a JSON friendly list of session cookies."""
+        return [{
+            'name': cookie.name,
+            'value': cookie.value,
+            'domain': cookie.domain,
+            'path': cookie.path,
+            'secure': cookie.secure,
+            'expires': cookie.expires,
+        } for cookie in session.cookies]
+
+    @staticmethod
+    def restore_cookies(session, cookies):
+        """Put stored cookies into the session jar."""
+        session.cookies.clear()
+        for cookie in cookies:
+            session.cookies.set(
+                cookie['name'],
+                cookie['value'],
+                domain=cookie['domain'],
+                path=cookie['path'],
+                secure=cookie['secure'],
+                expires=cookie['expires']
+            )
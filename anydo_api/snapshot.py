@@ -0,0 +1,340 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+`anydo_api.snapshot`.
+
+Compact binary snapshots of the user state.
+
+A snapshot holds the user data, tasks, categories and pending tasks.
+Every string is stored once in a string table and every set of dict keys
+once in a shape table, values are fixed-width slots, so a record is unpacked
+with a single struct call. Records are addressed by offsets, so a snapshot
+file could be memory-mapped by many processes at once and records are
+decoded only when accessed.
+
+Layout (little-endian)::
+
+    header   magic, version, offsets of the strings, shapes and 4 section tables
+    data     records and their nested lists and dicts
+    section  count, count record offsets
+    shapes   count, count shape offsets, shapes as key count and key string ids
+    strings  count, count + 1 offsets into the blob, utf-8 blob
+
+A slot is a tag byte and an int64 payload: the value itself for ints and
+floats, a string id for strings and big ints, a negative id for None, True
+and False, an offset for lists and dicts.
+"""
+
+import mmap
+import os
+import struct
+
+from anydo_api import errors
+from anydo_api.category import Category
+from anydo_api.task import Task
+from anydo_api.user import User
+
+__all__ = ('export_snapshot', 'load_snapshot', 'Snapshot')
+
+MAGIC = b'ADSN'
+VERSION = 1
+SECTIONS = ('user', 'tasks', 'categories', 'pending_tasks')
+
+_HEADER = struct.Struct('<4sI6Q')
+_SLOT = struct.Struct('<Bq')
+_U32 = struct.Struct('<I')
+_I64 = struct.Struct('<q')
+_F64 = struct.Struct('<d')
+
+_ATOM, _INT, _FLOAT, _LIST, _DICT, _BIGINT = range(6)
+
+# atoms are strings of the table and these constants under negative ids
+_CONSTANTS = {None: -1, True: -2, False: -3}
+
+try:
+    _TEXT = (str, unicode) # pylint: disable=undefined-variable
+    _INTEGERS = (int, long) # pylint: disable=undefined-variable
+except NameError:
+    _TEXT = (str,)
+    _INTEGERS = (int,)
+
+def _table(items):
+    """Return encoded `count, count + 1 offsets, blob` table."""
+    offsets = [0]
+    for item in items:
+        offsets.append(offsets[-1] + len(item))
+
+    block = bytearray(_U32.pack(len(items)))
+    block += struct.pack('<{}I'.format(len(offsets)), *offsets)
+    block += b''.join(items)
+    return block
+
+class _Encoder(object):
+    """Encode records with interned strings and dict shapes."""
+
+    def __init__(self, base):
+        """Constructor for _Encoder, `base` is the file offset of the data block."""
+        self.base = base
+        self.data = bytearray()
+        self.strings = {}
+        self.string_list = []
+        self.shapes = {}
+        self.shape_list = []
+
+    def string_id(self, value):
+        """Return an index of the string in the table, adding it if needed."""
+        index = self.strings.get(value)
+        if index is None:
+            index = self.strings[value] = len(self.string_list)
+            self.string_list.append(value)
+        return index
+
+    def shape_id(self, keys):
+        """Return an index of the dict shape, adding it if needed."""
+        key_ids = tuple(self.string_id(key) for key in keys)
+        index = self.shapes.get(key_ids)
+        if index is None:
+            index = self.shapes[key_ids] = len(self.shape_list)
+            self.shape_list.append(key_ids)
+        return index
+
+    def slot(self, value):
+        """Return `(tag, payload)` of the value, nested containers are written to the data."""
+        if value is None or value is True or value is False:
+            return _ATOM, _CONSTANTS[value]
+        if isinstance(value, _INTEGERS):
+            if -2 ** 63 <= value < 2 ** 63:
+                return _INT, value
+            return _BIGINT, self.string_id(str(value))
+        if isinstance(value, float):
+            return _FLOAT, _I64.unpack(_F64.pack(value))[0]
+        if isinstance(value, _TEXT):
+            return _ATOM, self.string_id(value)
+        if isinstance(value, (list, tuple)):
+            return _LIST, self._write(len(value), value)
+        if isinstance(value, dict):
+            keys = list(value.keys())
+            return _DICT, self._write(self.shape_id(keys), [value[key] for key in keys])
+
+        raise errors.ModelError('Can not snapshot value of type {}'.format(type(value).__name__))
+
+    def record(self, value):
+        """Write a top level value, return its offset."""
+        slot = self.slot(value)
+        position = self.base + len(self.data)
+        self.data += _SLOT.pack(*slot)
+        return position
+
+    def _write(self, head, items):
+        """Write a container as its head number and slots of items, return its offset."""
+        slots = [self.slot(item) for item in items]
+        position = self.base + len(self.data)
+        self.data += _U32.pack(head)
+        for slot in slots:
+            self.data += _SLOT.pack(*slot)
+        return position
+
+    def shapes_block(self):
+        """Return encoded shape table."""
+        return _table([
+            struct.pack('<{}I'.format(len(keys) + 1), len(keys), *keys) for keys in self.shape_list
+        ])
+
+    def strings_block(self):
+        """Return encoded string table."""
+        return _table([string.encode('utf-8') for string in self.string_list])
+
+def export_snapshot(user, path):
+    """
+    Write currently loaded state of the `user` into `path`.
+
+    The password is never written. The file is replaced atomically,
+    so readers never see a partially written snapshot.
+    """
+    user_data = dict((key, value) for key, value in user.data_dict.items() if key != 'password')
+    sections = {
+        'user': [user_data],
+        'tasks': [task.data_dict for task in user.tasks_list or []],
+        'categories': [category.data_dict for category in user.categories_list or []],
+        'pending_tasks': list(user._pending_tasks or []), # pylint: disable=protected-access
+    }
+
+    encoder = _Encoder(_HEADER.size)
+    tables = []
+    for name in SECTIONS:
+        offsets = [encoder.record(record) for record in sections[name]]
+        tables.append(struct.pack('<{}I'.format(len(offsets) + 1), len(offsets), *offsets))
+
+    position = _HEADER.size + len(encoder.data)
+    table_offsets = []
+    for table in tables:
+        table_offsets.append(position)
+        position += len(table)
+    shapes = encoder.shapes_block()
+    header = _HEADER.pack(MAGIC, VERSION, position + len(shapes), position, *table_offsets)
+
+    temporary_path = '{}.{}.tmp'.format(path, os.getpid())
+    with open(temporary_path, 'wb') as stream:
+        stream.write(header)
+        stream.write(encoder.data)
+        for table in tables:
+            stream.write(table)
+        stream.write(shapes)
+        stream.write(encoder.strings_block())
+    os.rename(temporary_path, path)
+
+def load_snapshot(path):
+    """Open a snapshot file, nothing is decoded until accessed."""
+    return Snapshot(path)
+
+class _Atoms(dict):
+    """Strings and constants by id, strings are decoded on the first access."""
+
+    def __init__(self, snapshot):
+        """Constructor for _Atoms."""
+        super(_Atoms, self).__init__((index, value) for value, index in _CONSTANTS.items())
+        self._snapshot = snapshot
+
+    def __missing__(self, index):
+        """Decode and remember a string."""
+        value = self[index] = self._snapshot.read_string(index)
+        return value
+
+class LazyRecords(object):
+    """Read-only sequence of snapshot records decoded on access."""
+
+    def __init__(self, snapshot, offset):
+        """Constructor for LazyRecords."""
+        self._snapshot = snapshot
+        self._count = _U32.unpack_from(snapshot.buffer, offset)[0]
+        self._offsets = offset + _U32.size
+
+    def __len__(self):
+        """Return a number of records."""
+        return self._count
+
+    def __getitem__(self, index):
+        """Decode and return a single record."""
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError('snapshot record index out of range')
+
+        position = _U32.unpack_from(self._snapshot.buffer, self._offsets + index * _U32.size)[0]
+        return self._snapshot.decode(position)
+
+    def __iter__(self):
+        """Decode records one by one."""
+        for index in range(self._count):
+            yield self[index]
+
+class Snapshot(object):
+    """
+    `Snapshot` is a read-only memory-mapped view of a snapshot file.
+
+    Pages are shared between all processes mapping the same file.
+    """
+
+    def __init__(self, path):
+        """Constructor for Snapshot."""
+        with open(path, 'rb') as stream:
+            self.buffer = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+
+        header = _HEADER.unpack_from(self.buffer, 0)
+        if header[0] != MAGIC or header[1] != VERSION:
+            raise errors.ModelError('{} is not a snapshot of version {}'.format(path, VERSION))
+
+        strings_offset, shapes_offset = header[2:4]
+        strings_count = _U32.unpack_from(self.buffer, strings_offset)[0]
+        self._strings_offsets = strings_offset + _U32.size
+        self._strings_blob = self._strings_offsets + _U32.size * (strings_count + 1)
+        self._atoms = _Atoms(self)
+
+        shapes_count = _U32.unpack_from(self.buffer, shapes_offset)[0]
+        self._shapes_offsets = shapes_offset + _U32.size
+        self._shapes_blob = self._shapes_offsets + _U32.size * (shapes_count + 1)
+        self._shapes = {}
+
+        sections = dict(zip(SECTIONS, header[4:]))
+        self.tasks = LazyRecords(self, sections['tasks'])
+        self.categories = LazyRecords(self, sections['categories'])
+        self.pending_tasks = LazyRecords(self, sections['pending_tasks'])
+        self._user = LazyRecords(self, sections['user'])
+
+    def close(self):
+        """Unmap the file."""
+        self.buffer.close()
+
+    def user_data(self):
+        """Return the user dict."""
+        return self._user[0]
+
+    def to_user(self, session):
+        """
+        Return a `User` with all the loaded state restored.
+
+        Session is not a part of a snapshot, pass an authenticated one.
+        """
+        user = User(data_dict=self.user_data(), session=session)
+        user.tasks_list = [Task(data_dict=task, user=user) for task in self.tasks] or None
+        # pylint: disable=protected-access
+        user._tasks_coverage = frozenset() if user.tasks_list is not None else None
+        user.categories_list = [
+            Category(data_dict=category, user=user) for category in self.categories
+        ] or None
+        user._pending_tasks = list(self.pending_tasks) or None
+        return user
+
+    def string(self, index):
+        """Return a string from the table by its index."""
+        return self._atoms[index]
+
+    def read_string(self, index):
+        """Decode a string from the table, no caching."""
+        position = self._strings_offsets + index * _U32.size
+        start, end = struct.unpack_from('<2I', self.buffer, position)
+        return self.buffer[self._strings_blob + start:self._strings_blob + end].decode('utf-8')
+
+    def shape(self, index):
+        """Return dict keys and a struct of their slots for the shape index."""
+        shape = self._shapes.get(index)
+        if shape is None:
+            position = self._shapes_offsets + index * _U32.size
+            start = self._shapes_blob + _U32.unpack_from(self.buffer, position)[0]
+            count = _U32.unpack_from(self.buffer, start)[0]
+            key_ids = struct.unpack_from('<{}I'.format(count), self.buffer, start + _U32.size)
+            shape = self._shapes[index] = (
+                tuple(self.string(key) for key in key_ids), struct.Struct('<' + 'Bq' * count)
+            )
+        return shape
+
+    def decode(self, position):
+        """Decode a top level value at `position`."""
+        return self._values(_SLOT.unpack_from(self.buffer, position))[0]
+
+    def _values(self, slots):
+        """Return values of the flat `(tag, payload, tag, payload, ...)` sequence."""
+        atoms = self._atoms
+        return [
+            atoms[payload] if tag == _ATOM
+            else payload if tag == _INT
+            else self._value(tag, payload)
+            for tag, payload in zip(slots[::2], slots[1::2])
+        ]
+
+    def _value(self, tag, payload):
+        """Return a value of a less common slot."""
+        if tag == _DICT:
+            keys, layout = self.shape(_U32.unpack_from(self.buffer, payload)[0])
+            slots = layout.unpack_from(self.buffer, payload + _U32.size)
+            return dict(zip(keys, self._values(slots)))
+        if tag == _LIST:
+            count = _U32.unpack_from(self.buffer, payload)[0]
+            slots = struct.unpack_from('<' + 'Bq' * count, self.buffer, payload + _U32.size)
+            return self._values(slots)
+        if tag == _FLOAT:
+            return _F64.unpack(_I64.pack(payload))[0]
+        if tag == _BIGINT:
+            return int(self.string(payload))
+
+        raise errors.ModelError('Broken snapshot, unknown tag {}'.format(tag))
@@ -0,0 +1,207 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+`anydo_api.store`.
+
+`SQLiteStore` class.
+
+Local persistent copy of user tasks and categories,
+so a new process could serve reads before the first API call finishes.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+
+from anydo_api.category import Category
+from anydo_api.task import Task
+
+__all__ = ('SQLiteStore')
+
+_SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS tasks ('
+    ' user_id TEXT NOT NULL, id TEXT NOT NULL, category_id TEXT, parent_id TEXT,'
+    ' data TEXT NOT NULL,'
+    ' PRIMARY KEY (user_id, id))',
+    'CREATE INDEX IF NOT EXISTS tasks_by_category ON tasks (user_id, category_id)',
+    'CREATE INDEX IF NOT EXISTS tasks_by_parent ON tasks (user_id, parent_id)',
+    'CREATE TABLE IF NOT EXISTS categories ('
+    ' user_id TEXT NOT NULL, id TEXT NOT NULL, data TEXT NOT NULL,'
+    ' PRIMARY KEY (user_id, id))',
+)
+
+class SQLiteStore(object):
+    """
+    `SQLiteStore` keeps raw JSON of tasks and categories in a SQLite database.
+
+    Tasks are indexed by id, category and parent task.
+    One database could hold data of many users.
+    It is a `User` listener, attach it with `user.use_store(store)`.
+    """
+
+    def __init__(self, path):
+        """Constructor for SQLiteStore."""
+        self.path = path if path == ':memory:' else os.path.abspath(os.path.expanduser(path))
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._connection:
+            if self.path != ':memory:':
+                self._connection.execute('PRAGMA journal_mode=WAL')
+            for statement in _SCHEMA:
+                self._connection.execute(statement)
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def load_tasks(self, user_id):
+        """Return a list of stored task dicts of the user."""
+        return self._select('SELECT data FROM tasks WHERE user_id = ? ORDER BY rowid', (user_id,))
+
+    def load_categories(self, user_id):
+        """Return a list of stored category dicts of the user."""
+        return self._select(
+            'SELECT data FROM categories WHERE user_id = ? ORDER BY rowid', (user_id,)
+        )
+
+    def tasks_by_category(self, user_id, category_id):
+        """Return a list of stored task dicts which belong to the category."""
+        return self._select(
+            'SELECT data FROM tasks WHERE user_id = ? AND category_id = ? ORDER BY rowid',
+            (user_id, category_id)
+        )
+
+    def subtasks(self, user_id, parent_id):
+        """Return a list of stored task dicts which are subtasks of the task."""
+        return self._select(
+            'SELECT data FROM tasks WHERE user_id = ? AND parent_id = ? ORDER BY rowid',
+            (user_id, parent_id)
+        )
+
+    def task(self, user_id, task_id):
+        """Return a stored task dict by id or None."""
+        found = self._select(
+            'SELECT data FROM tasks WHERE user_id = ? AND id = ?', (user_id, task_id)
+        )
+        return found[0] if found else None
+
+    def save_tasks(self, user_id, tasks_data, replace=False):
+        """Insert or update task dicts, with `replace` drop all other tasks of the user."""
+        rows = [
+            (
+                data.get('categoryId'),
+                data.get('parentGlobalTaskId'),
+                json.dumps(data),
+                user_id,
+                data['id'],
+            ) for data in tasks_data
+        ]
+        self._save(
+            user_id,
+            rows,
+            replace,
+            'DELETE FROM tasks WHERE user_id = ?',
+            'UPDATE tasks SET category_id = ?, parent_id = ?, data = ?'
+            ' WHERE user_id = ? AND id = ?',
+            'INSERT INTO tasks (category_id, parent_id, data, user_id, id) VALUES (?, ?, ?, ?, ?)'
+        )
+
+    def save_categories(self, user_id, categories_data, replace=False):
+        """Insert or update category dicts, with `replace` drop all other categories of the user."""
+        rows = [(json.dumps(data), user_id, data['id']) for data in categories_data]
+        self._save(
+            user_id,
+            rows,
+            replace,
+            'DELETE FROM categories WHERE user_id = ?',
+            'UPDATE categories SET data = ? WHERE user_id = ? AND id = ?',
+            'INSERT INTO categories (data, user_id, id) VALUES (?, ?, ?)'
+        )
+
+    def delete(self, user_id, table, resource_id):
+        """Remove a single stored record."""
+        self.delete_many(user_id, table, [resource_id])
+
+    def delete_many(self, user_id, table, resource_ids):
+        """Remove stored records in a single transaction."""
+        with self._lock, self._connection:
+            self._connection.executemany(
+                'DELETE FROM {} WHERE user_id = ? AND id = ?'.format(table),
+                [(user_id, resource_id) for resource_id in resource_ids]
+            )
+
+    # `User` listener interface
+
+    def resource_saved(self, user, resource):
+        """Write through saved or created resource."""
+        if isinstance(resource, Task):
+            self.save_tasks(user['id'], [resource.data_dict])
+        elif isinstance(resource, Category):
+            self.save_categories(user['id'], [resource.data_dict])
+
+    def resource_removed(self, user, resource):
+        """Write through deleted resource."""
+        if isinstance(resource, Task):
+            self.delete(user['id'], 'tasks', resource['id'])
+        elif isinstance(resource, Category):
+            self.delete(user['id'], 'categories', resource['id'])
+
+    def resources_saved(self, user, resources):
+        """Write through many saved resources in one transaction per table."""
+        tasks, categories = _split(resources)
+        if tasks:
+            self.save_tasks(user['id'], [task.data_dict for task in tasks])
+        if categories:
+            self.save_categories(user['id'], [category.data_dict for category in categories])
+
+    def resources_removed(self, user, resources):
+        """Write through many deleted resources in one transaction per table."""
+        tasks, categories = _split(resources)
+        if tasks:
+            self.delete_many(user['id'], 'tasks', [task['id'] for task in tasks])
+        if categories:
+            self.delete_many(user['id'], 'categories', [category['id'] for category in categories])
+
+    def tasks_loaded(self, user, tasks):
+        """Replace stored tasks with freshly loaded ones."""
+        self.save_tasks(user['id'], [task.data_dict for task in tasks], replace=True)
+
+    def categories_loaded(self, user, categories):
+        """Replace stored categories with freshly loaded ones."""
+        self.save_categories(
+            user['id'], [category.data_dict for category in categories], replace=True
+        )
+
+    # pylint: disable=too-many-arguments
+    def _save(self, user_id, rows, replace, delete_query, update_query, insert_query):
+        """
+        Write rows in a single transaction.
+
+        Rows end with `user_id` and `id` columns. Updated records keep their position.
+        """
+        with self._lock, self._connection:
+            if replace:
+                self._connection.execute(delete_query, (user_id,))
+                self._connection.executemany(insert_query, rows)
+                return
+
+            for row in rows:
+                if self._connection.execute(update_query, row).rowcount == 0:
+                    self._connection.execute(insert_query, row)
+
+    def _select(self, query, arguments):
+        """Return a list of decoded `data` column values."""
+        with self._lock:
+            rows = self._connection.execute(query, arguments).fetchall()
+
+        # a single decoder call for all records is notably faster than one per row
+        return json.loads('[' + ','.join(row[0] for row in rows) + ']')
+
+def _split(resources):
+    """Return tasks and categories among resources."""
+    return (
+        [resource for resource in resources if isinstance(resource, Task)],
+        [resource for resource in resources if isinstance(resource, Category)],
+    )
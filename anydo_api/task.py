@@ -6,12 +6,21 @@
 `Task` class.
 """
 
+from anydo_api import parallel
 from anydo_api import request
+from anydo_api import tracing
 from anydo_api.constants import CONSTANTS, TASK_STATUSES
 from anydo_api.resource import Resource
 
 __all__ = ('Task')
 
+# server side fields which are not copied to clones
+_NOT_CLONED = frozenset((
+    'id', 'globalTaskId', 'creationDate', 'lastUpdateDate', 'sharedMembers', 'shared',
+    'participants', 'notifications', 'subTasks',
+))
+
+@tracing.trace_methods
 class Task(Resource):
     """
     `Task` is the class representing user task object.
@@ -46,21 +55,159 @@ class Task(Resource):
         self['status'] = 'DONE'
         self.save()
 
+    @tracing.untraced
     def session(self):
         """Shortcut to retrive user session for requests."""
         return self.user.session()
 
+    def _write_behind(self):
+        """Return the write-behind queue of the user if any."""
+        return self.user.write_behind if self.user is not None else None
+
+    def _changed(self):
+        """Let the user listeners know about synchronized changes."""
+        self.user.notify('resource_saved', self)
+
+    def _removed(self):
+        """Let the user listeners know about remote deletion."""
+        self.user.notify('resource_removed', self)
+
     def subtasks(self):
         """Return a list with subtasks of current task for same user."""
-        return [task for task in self.user.tasks() if task['parentGlobalTaskId'] == self['id']]
+        return Task.filter_tasks(self.user.forest().children(self['id']),
+                                 include_checked=True,
+                                 include_unchecked=True)
+
+    def descendants(self, include_deleted=False):
+        """
+        Return all the cached subtasks at any depth, parents go before their children.
+
+        DELETED subtasks are left out together with their subtasks unless `include_deleted`.
+        """
+        return self._descendants(() if include_deleted else ('DELETED',))
+
+    def _descendants(self, skipped_statuses):
+        """Return the cached subtasks without subtrees of tasks in `skipped_statuses`."""
+        return self.user.forest().descendants(
+            self['id'], skip=lambda task: task.data_dict.get('status') in skipped_statuses
+        )
+
+    def ancestors(self):
+        """Return the parent task, its parent and so on up to the first-level task."""
+        return self.user.forest().ancestors(self['id'])
+
+    def depth(self):
+        """Return 0 for first-level task, 1 for its subtasks and so on."""
+        return self.user.forest().depth(self['id'])
+
+    def subtree_size(self):
+        """Return a number of tasks in the subtree including the task itself."""
+        return 1 + len(self.descendants())
+
+    def complete_subtree(self, batch_size=100, max_workers=4):
+        """
+        Mark the task and all its subtasks as DONE with batched requests.
+
+        Tasks already DONE are not sent, DELETED subtrees are left alone.
+        Return a list of `(task, error)` pairs (see `User.set_status`).
+        """
+        subtree = [task for task in [self] + self.descendants()
+                   if task.data_dict.get('status') != 'DONE']
+        return self.user.set_status(subtree, 'DONE', batch_size, max_workers)
+
+    def move_subtree(self, category, batch_size=100, max_workers=4):
+        """
+        Move the task and all its subtasks into the category with batched requests.
+
+        DELETED subtrees are left alone.
+        Return a list of `(task, error)` pairs (see `User.save_many`).
+        """
+        subtree = [self] + self.descendants()
+        for task in subtree:
+            task.categoryId = category['id']
+        return self.user.save_many(subtree, batch_size, max_workers)
+
+    def destroy_subtree(self, max_workers=8):
+        """
+        Delete the task and all its subtasks with parallel requests.
+
+        Subtrees already DELETED are not sent again.
+        Return a list of `(task, error)` pairs (see `User.destroy_many`).
+        """
+        return self.user.destroy_many([self] + self.descendants(), max_workers)
 
     def create_subtask(self, **fields):
         """Create a new tasks from provided fields and makes it an subtask of current one."""
         subtask_attrs = fields.copy()
         subtask_attrs.update({'parentGlobalTaskId': self['id']})
-        subtask = Task.create(user=self.user, **subtask_attrs)
-        self.user.add_task(subtask)
-        return subtask
+        return Task.create(user=self.user, **subtask_attrs)
+
+    # pylint: disable=too-many-arguments
+    def clone(self, deep=True, into_category=None, batch_size=100, max_workers=4,
+              include_done=False):
+        """
+        Create a copy of the task, with `deep` of all its subtasks too.
+
+        DELETED subtasks are not copied, nor DONE ones unless `include_done`,
+        both together with their own subtasks.
+
+        Ids are generated up front, so the whole tree is created with list requests
+        level by level, parents before their children, `max_workers` requests at once.
+        The copy is placed next to the task or into the `into_category` category.
+        Return the copy of the task. If a request fails, tasks created so far are kept
+        and the error is raised.
+        """
+        skipped_statuses = ('DELETED',) if include_done else ('DELETED', 'DONE')
+        sources = [self] + (self._descendants(skipped_statuses) if deep else [])
+        new_ids = dict(zip([task['id'] for task in sources], Task.generate_uids(len(sources))))
+        depths = {}
+        waves = []
+        for task in sources:
+            data = dict(
+                (key, value) for key, value in task.data_dict.items() if key not in _NOT_CLONED
+            )
+            data['id'] = new_ids[task['id']]
+            if 'globalTaskId' in task.data_dict:
+                data['globalTaskId'] = data['id']
+            if into_category is not None:
+                data['categoryId'] = into_category['id']
+
+            depth = 0
+            if task is not self:
+                data['parentGlobalTaskId'] = new_ids[task['parentGlobalTaskId']]
+                depth = depths[task['parentGlobalTaskId']] + 1
+            depths[task['id']] = depth
+            if depth == len(waves):
+                waves.append([])
+            waves[depth].append(data)
+
+        def create(batch):
+            """Create a batch of tasks with a single request."""
+            return request.post(
+                url=self.get_endpoint(),
+                session=self.session(),
+                json=batch,
+                params={'includeDeleted': 'false', 'includeDone': 'false'}
+            )
+
+        created = []
+        try:
+            for wave in waves:
+                batches = [
+                    wave[index:index + batch_size] for index in range(0, len(wave), batch_size)
+                ]
+                done = parallel.run_all(create, batches, max_workers)
+                for future in done:
+                    if future.exception() is None:
+                        created.extend(
+                            Task(data_dict=data, user=self.user) for data in future.result()
+                        )
+                for future in done:
+                    future.result()
+        finally:
+            self.user.add_tasks(created)
+
+        return created[0]
 
     def add_subtask(self, subtask):
         """
@@ -121,6 +268,7 @@ class Task(Resource):
         )
 
         self.data_dict = response_obj
+        self._changed()
 
         return self
 
@@ -133,10 +281,11 @@ class Task(Resource):
 
     def parent(self):
         """Return parent task object for subtask and None for first-level task."""
-        return next(
-            (task for task in self.user.tasks() if task['id'] == self['parentGlobalTaskId']),
-            None
-        )
+        parent = self.user.forest().parent(self['id'])
+        if parent is None or not Task.filter_tasks([parent], include_checked=True,
+                                                   include_unchecked=True):
+            return None
+        return parent
 
     @staticmethod
     def required_attributes():
@@ -157,7 +306,6 @@ class Task(Resource):
 
         Returns a new filtered list.
         """
-        result = tasks_list[:]
         statuses = list(TASK_STATUSES)
 
         if not filters.get('include_deleted', False):
@@ -169,8 +317,7 @@ class Task(Resource):
         if not filters.get('include_unchecked', False):
             statuses.remove('UNCHECKED')
 
-        result = [task for task in result if task['status'] in statuses]
-        return list(result)
+        return [task for task in tasks_list if task['status'] in statuses]
 
 
     @classmethod
@@ -0,0 +1,246 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+`anydo_api.tracing`.
+
+Lightweight tracing of high-level operations.
+
+Every public method of the models is wrapped into an operation span and
+every HTTP call becomes a child span of the operation that triggered it.
+Finished root spans are handed to the registered exporters, so per-operation
+wall time and round-trip counts are easy to inspect.
+Tracing is disabled until at least one exporter is registered.
+"""
+
+import functools
+import json
+import threading
+import time
+
+__all__ = ('Span', 'InMemoryExporter', 'JsonExporter',
+           'enable', 'disable', 'is_enabled', 'current_span', 'span', 'traced', 'untraced',
+           'trace_methods')
+
+_EXPORTERS = []
+_STATE = threading.local()
+
+class Span(object):
+    """
+    `Span` is a timed unit of work.
+
+    Operation spans wrap model methods, `http` spans wrap single API calls.
+    """
+
+    def __init__(self, name, kind='operation', parent=None, attributes=None):
+        """Constructor for Span."""
+        self.name = name
+        self.kind = kind
+        self.parent = parent
+        self.attributes = attributes or {}
+        self.children = []
+        self.error = None
+        self.start_time = time.time()
+        self.duration = None
+        self._target = None
+
+    def set_attribute(self, key, value):
+        """Attach a key/value pair to the span."""
+        self.attributes[key] = value
+
+    def finish(self):
+        """Stop the span timer."""
+        self.duration = time.time() - self.start_time
+
+    def http_calls(self):
+        """Return a number of HTTP calls made inside the span, including nested operations."""
+        own = 1 if self.kind == 'http' else 0
+        return own + sum(child.http_calls() for child in self.children)
+
+    def to_dict(self):
+        """Return a dict representation of the span tree suitable for JSON."""
+        return {
+            'name': self.name,
+            'kind': self.kind,
+            'start_time': self.start_time,
+            'duration': self.duration,
+            'attributes': self.attributes,
+            'error': self.error,
+            'http_calls': self.http_calls(),
+            'children': [child.to_dict() for child in self.children],
+        }
+
+    def __repr__(self):
+        """Short representation for debugging."""
+        return '<Span {} ({} http calls)>'.format(self.name, self.http_calls())
+
+class _NoopSpan(object):
+    """Placeholder yielded by `span` when tracing is disabled."""
+
+    def set_attribute(self, key, value):
+        """Ignore the attribute."""
+        pass
+
+_NOOP_SPAN = _NoopSpan()
+
+class InMemoryExporter(object):
+    """Collect finished root spans in a list, mostly useful for tests and debugging."""
+
+    def __init__(self):
+        """Constructor for InMemoryExporter."""
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def export(self, finished_span):
+        """Store the finished root span."""
+        with self._lock:
+            self.spans.append(finished_span)
+
+    def clear(self):
+        """Drop all collected spans."""
+        with self._lock:
+            self.spans = []
+
+class JsonExporter(object):
+    """
+    Write every finished root span as a single JSON line.
+
+    Accept a file path or a writable stream.
+    """
+
+    def __init__(self, destination):
+        """Constructor for JsonExporter."""
+        self.destination = destination
+        self._lock = threading.Lock()
+
+    def export(self, finished_span):
+        """Serialize the finished root span into the destination."""
+        line = json.dumps(finished_span.to_dict()) + '\n'
+        with self._lock:
+            if hasattr(self.destination, 'write'):
+                self.destination.write(line)
+            else:
+                with open(self.destination, 'a') as stream:
+                    stream.write(line)
+
+def enable(*exporters):
+    """Register exporters, tracing is active while at least one is registered."""
+    _EXPORTERS.extend(exporters)
+
+def disable():
+    """Unregister all exporters and turn the tracing off."""
+    del _EXPORTERS[:]
+
+def is_enabled():
+    """Return True if any exporter is registered."""
+    return bool(_EXPORTERS)
+
+def current_span():
+    """Return the innermost active span of the current thread or None."""
+    stack = getattr(_STATE, 'stack', None)
+    return stack[-1] if stack else None
+
+class span(object): # pylint: disable=invalid-name
+    """
+    Context manager opening a new span as a child of the current one.
+
+    Yield a no-op span object when the tracing is disabled.
+    """
+
+    def __init__(self, name, kind='operation', **attributes):
+        """Constructor for span."""
+        self.name = name
+        self.kind = kind
+        self.attributes = attributes
+        self.span = None
+
+    def __enter__(self):
+        """Start the span and make it current."""
+        if not _EXPORTERS:
+            return _NOOP_SPAN
+
+        if not hasattr(_STATE, 'stack'):
+            _STATE.stack = []
+
+        parent = current_span()
+        self.span = Span(self.name, kind=self.kind, parent=parent, attributes=self.attributes)
+        if parent is not None:
+            parent.children.append(self.span)
+        _STATE.stack.append(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Finish the span and export it if it is a root one."""
+        if self.span is None:
+            return False
+
+        _STATE.stack.pop()
+        self.span.finish()
+        if exc_type is not None:
+            self.span.error = '{}: {}'.format(exc_type.__name__, exc_value)
+        if self.span.parent is None:
+            for exporter in list(_EXPORTERS):
+                exporter.export(self.span)
+        return False
+
+def traced(func, owner_name=None):
+    """
+    Decorate a function to run inside an operation span.
+
+    The span is named after the class of the bound object, so inherited methods
+    are reported as `Task.save` rather than `Resource.save`.
+    Nested calls of the same method on the same object (`super` chains) are merged.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        """Run wrapped function inside the span if tracing is enabled."""
+        if not _EXPORTERS:
+            return func(*args, **kwargs)
+
+        target = args[0] if args else None
+        if owner_name is not None:
+            class_name = owner_name
+        elif isinstance(target, type):
+            class_name = target.__name__
+        else:
+            class_name = type(target).__name__
+        name = '{}.{}'.format(class_name, func.__name__)
+
+        parent = current_span()
+        # pylint: disable=protected-access
+        if parent is not None and parent.name == name and parent._target is target:
+            return func(*args, **kwargs)
+
+        with span(name) as operation:
+            operation._target = target # pylint: disable=protected-access
+            return func(*args, **kwargs)
+
+    return wrapper
+
+def untraced(func):
+    """Mark a public method as trivial, so `trace_methods` leaves it as is."""
+    func.__untraced__ = True
+    return func
+
+def trace_methods(cls):
+    """
+    Class decorator wrapping all public methods defined by the class into operation spans.
+
+    Aliases (`delete = destroy`) keep pointing to the same wrapped method.
+    """
+    wrapped = {}
+    for attr, value in list(vars(cls).items()):
+        func = getattr(value, '__func__', value)
+        if attr.startswith('_') or not callable(func) or getattr(func, '__untraced__', False):
+            continue
+
+        if id(value) not in wrapped:
+            if isinstance(value, staticmethod):
+                wrapped[id(value)] = staticmethod(traced(func, owner_name=cls.__name__))
+            elif isinstance(value, classmethod):
+                wrapped[id(value)] = classmethod(traced(func))
+            else:
+                wrapped[id(value)] = traced(func)
+
+        setattr(cls, attr, wrapped[id(value)])
+
+    return cls
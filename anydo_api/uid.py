@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+`anydo_api.uid`.
+
+Unique ids for new resources.
+
+An id is 16 bytes of `os.urandom` in url-safe base64, the same format the API uses.
+Random bytes are drawn and encoded in blocks, ids are handed out from a pool.
+"""
+
+import base64
+import os
+import threading
+
+__all__ = ('generate_uid', 'generate_uids')
+
+UID_BYTES = 16
+BLOCK = 4096
+
+_LOCK = threading.Lock()
+_POOL = []
+_OWNER = [None]
+
+def generate_uid():
+    """Return a new unique id."""
+    return generate_uids(1)[0]
+
+def generate_uids(count):
+    """Return a list of `count` new unique ids."""
+    if count > BLOCK:
+        return _encode(count)
+
+    with _LOCK:
+        # a forked child must not hand out the ids of its parent
+        if _OWNER[0] != os.getpid():
+            del _POOL[:]
+            _OWNER[0] = os.getpid()
+        if len(_POOL) < count:
+            _POOL[:0] = _encode(BLOCK)
+
+        start = len(_POOL) - count
+        ids = _POOL[start:]
+        del _POOL[start:]
+        return ids
+
+def _encode(count):
+    """
+    Return `count` ids of fresh random bytes encoded at once.
+
+    Every 16 bytes are followed by two zero bytes, so each id takes exactly 24 base64 chars,
+    the last two of which are replaced with the padding of a separately encoded id.
+    """
+    raw = os.urandom(UID_BYTES * count)
+    padded = bytearray((UID_BYTES + 2) * count)
+    for offset in range(UID_BYTES):
+        padded[offset::UID_BYTES + 2] = raw[offset::UID_BYTES]
+
+    encoded = bytearray(base64.urlsafe_b64encode(bytes(padded)))
+    encoded[22::24] = b'=' * count
+    encoded[23::24] = b'=' * count
+    text = encoded.decode('ascii')
+    return [text[start:start + 24] for start in range(0, 24 * count, 24)]
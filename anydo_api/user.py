@@ -6,21 +6,78 @@
 `User` class.
 """
 
+import logging
+import threading
+import time
+
 from anydo_api import request
 from anydo_api import errors
+from anydo_api import parallel
+from anydo_api import tracing
 from anydo_api.category import Category
-from anydo_api.constants import CONSTANTS
+from anydo_api.constants import CONSTANTS, TASK_STATUSES
+from anydo_api.forest import TaskForest
+from anydo_api.members import MembersIndex
 from anydo_api.resource import Resource
+from anydo_api.search import SearchIndex
 from anydo_api.task import Task
+from anydo_api.views import Views
 
 __all__ = ('User')
 
+_LOGGER = logging.getLogger(__name__)
+
+_SINGLE_EVENTS = {'resources_saved': 'resource_saved', 'resources_removed': 'resource_removed'}
+
+# a collection response of this many records takes about as long as one more round trip
+RECORDS_PER_ROUND_TRIP = 500
+
+# seconds an empty list of pending tasks is served from the cache
+EMPTY_PENDING_TTL = 60
+
+def _restore_user(data_dict):
+    """Return the registered user with the same id or a new one without a session."""
+    return Resource.owners.get(data_dict.get('id')) or User(data_dict=data_dict, session=None)
+
+def _task_flags(include_deleted, include_done):
+    """Return a set of server side include flags."""
+    return frozenset(
+        name for name, included in (('deleted', include_deleted), ('done', include_done))
+        if included
+    )
+
+def _task_params(flags):
+    """Return query parameters of the tasks collection with the include flags."""
+    return {
+        'includeDeleted': str('deleted' in flags).lower(),
+        'includeDone': str('done' in flags).lower(),
+    }
+
+def collection_is_cheaper(count, collection_size, max_workers):
+    """
+    Return True if one collection request is faster than individual ones.
+
+    There are `count` individual requests made `max_workers` at once
+    against a collection of `collection_size` records.
+    """
+    if count < 2:
+        return False
+
+    individual_round_trips = (count + max_workers - 1) // max_workers
+    return 1 + collection_size / float(RECORDS_PER_ROUND_TRIP) <= individual_round_trips
+
+@tracing.trace_methods
 class User(Resource):
     """
     `User` is the class representing User object.
 
     It wraps user-related JSON into class instances and
     responsible for user management.
+
+    A user could be shared between threads. Cached lists are never changed in place,
+    they are replaced with updated copies, so readers need no locks and never see
+    a half updated list. A lock per collection makes concurrent cold reads wait for
+    a single request instead of making their own.
     """
 
     _endpoint = CONSTANTS.get('ME_URL')
@@ -33,7 +90,35 @@ class User(Resource):
         self.session_obj = session
         self.categories_list = None
         self.tasks_list = None
+        self._tasks_coverage = None
         self._pending_tasks = None
+        self._pending_loaded = 0
+        self.store = None
+        self.refresher = None
+        self.write_behind = None
+        self.reminders = None
+        self.revalidation = None
+        self._listeners = []
+        self._views = None
+        self._search_index = None
+        self._members_index = None
+        self._forest = None
+        self._default_category = None
+        self._cache_lock = threading.Lock()
+        self._loading = dict(
+            (name, threading.Lock()) for name in ('tasks', 'categories', 'pending')
+        )
+        if session is not None:
+            self.register()
+
+    def __reduce__(self):
+        """
+        Pickle only the user data without the password.
+
+        Unpickled user is the registered one with the same id, or a copy without a session.
+        """
+        data = dict((key, value) for key, value in self.data_dict.items() if key != 'password')
+        return (_restore_user, (data,))
 
     def save(self, alternate_endpoint=None):
         """
@@ -43,10 +128,21 @@ class User(Resource):
         """
         super(User, self).save(alternate_endpoint=self.get_endpoint())
 
+    @tracing.untraced
     def session(self):
         """Shortcut to retrive object session for requests."""
         return self.session_obj
 
+    @tracing.untraced
+    def register(self):
+        """
+        Make the user an owner of tasks and categories unpickled in this process.
+
+        Every user with a session registers itself on creation.
+        """
+        if self.data_dict.get('id') is not None:
+            Resource.owners[self.data_dict['id']] = self
+
     def destroy(self, alternate_endpoint=None):
         """
         Hit the API to destroy the user.
@@ -65,6 +161,98 @@ class User(Resource):
         """
         super(User, self).refresh(alternate_endpoint=self.get_endpoint())
 
+    def add_listener(self, listener):
+        """
+        Subscribe an object to changes of the user data.
+
+        Listener could implement any of `resource_saved(user, resource)`,
+        `resource_removed(user, resource)`, `tasks_loaded(user, tasks)` and
+        `categories_loaded(user, categories)` methods. Bulk operations call
+        `resources_saved(user, resources)` and `resources_removed(user, resources)`
+        once, or the single resource methods for every resource if they are missing.
+        """
+        with self._cache_lock:
+            if listener not in self._listeners:
+                self._listeners = self._listeners + [listener]
+
+    def remove_listener(self, listener):
+        """Unsubscribe the listener."""
+        with self._cache_lock:
+            self._listeners = [known for known in self._listeners if known is not listener]
+
+    @tracing.untraced
+    def notify(self, event, payload):
+        """Call `event` handler of every listener implementing it."""
+        for listener in self._listeners:
+            handler = getattr(listener, event, None)
+            if handler is not None:
+                handler(self, payload)
+
+    @tracing.untraced
+    def notify_many(self, event, resources):
+        """Call bulk `event` handler of every listener, or the single resource one per resource."""
+        if not resources:
+            return
+
+        single_event = _SINGLE_EVENTS[event]
+        for listener in self._listeners:
+            handler = getattr(listener, event, None)
+            if handler is not None:
+                handler(self, resources)
+                continue
+
+            handler = getattr(listener, single_event, None)
+            if handler is not None:
+                for resource in resources:
+                    handler(self, resource)
+
+    def use_store(self, store):
+        """
+        Persist tasks and categories in the `store` (see `anydo_api.store`).
+
+        Saved, created and destroyed resources are written through,
+        cold reads are served from the store and revalidated in the background.
+        """
+        if self.store is not None:
+            self.remove_listener(self.store)
+
+        self.store = store
+        self.add_listener(store)
+
+    def use_refresher(self, refresher):
+        """
+        Keep cached data fresh with the `refresher` (see `anydo_api.refresher`).
+
+        Reads of tasks, categories and pending tasks never wait for the network
+        once they are cached, they are reloaded in the background.
+        """
+        if self.refresher is not None:
+            self.refresher.remove(self)
+
+        self.refresher = refresher
+        refresher.add(self)
+
+    def use_reminders(self, reminders):
+        """
+        Track due dates and alerts of the cached tasks in `reminders` (see `anydo_api.reminders`).
+
+        One `Reminders` object could serve many users.
+        """
+        if self.reminders is not None:
+            self.reminders.remove(self)
+
+        self.reminders = reminders
+        reminders.add(self)
+
+    def use_write_behind(self, write_behind):
+        """
+        Queue saves of tasks and categories in `write_behind` (see `anydo_api.write_behind`).
+
+        `save()` returns at once, the queue pushes changes in the background.
+        Pass None to save synchronously again.
+        """
+        self.write_behind = write_behind
+
     # pylint: disable=too-many-arguments
     def tasks(self,
               refresh=False,
@@ -72,20 +260,31 @@ class User(Resource):
               include_done=False,
               include_checked=True,
               include_unchecked=True):
-        """Return a remote or chached task list for user."""
-        if not self.tasks_list or refresh:
-            params = {
-                'includeDeleted': str(include_deleted).lower(),
-                'includeDone': str(include_done).lower(),
-            }
-
-            tasks_data = request.get(
-                url=CONSTANTS.get('TASKS_URL'),
-                session=self.session(),
-                params=params
-            )
+        """
+        Return a remote or chached task list for user.
 
-            self.tasks_list = [Task(data_dict=task, user=self) for task in tasks_data]
+        The cache remembers which of deleted and done tasks it holds. A request for more
+        of them fetches once with the wider flags, narrower requests are filtered locally.
+        """
+        flags = _task_flags(include_deleted, include_done)
+        self.__touch(refresh)
+        if refresh or not self.__tasks_cover(flags):
+            with self._loading['tasks']:
+                if self.tasks_list is None and not refresh and self.store is not None:
+                    stored = self.store.load_tasks(self['id'])
+                    if stored:
+                        self.tasks_list = [Task(data_dict=task, user=self) for task in stored]
+                        # the store does not know which flags its rows were loaded with
+                        self._tasks_coverage = frozenset()
+                        if not flags:
+                            self.__revalidate(self.tasks)
+
+                if refresh or not self.__tasks_cover(flags):
+                    flags = flags | (self._tasks_coverage or frozenset())
+                    params = _task_params(flags)
+                    self.__load('tasks_list', Task, CONSTANTS.get('TASKS_URL'), params)
+                    self._tasks_coverage = flags
+                    self.notify('tasks_loaded', self.tasks_list)
 
         return Task.filter_tasks(self.tasks_list,
                                  include_deleted=include_deleted,
@@ -95,20 +294,25 @@ class User(Resource):
 
     def categories(self, refresh=False, include_deleted=False):
         """Return a remote or cached categories list for user."""
+        self.__touch(refresh)
         if not self.categories_list or refresh:
-            params = {
-                'includeDeleted': str(include_deleted).lower(),
-            }
-
-            categories_data = request.get(
-                url=CONSTANTS.get('CATEGORIES_URL'),
-                session=self.session(),
-                params=params
-            )
-
-            self.categories_list = [
-                Category(data_dict=category, user=self) for category in categories_data
-            ]
+            with self._loading['categories']:
+                if self.categories_list is None and not refresh and self.store is not None:
+                    stored = self.store.load_categories(self['id'])
+                    if stored:
+                        self.categories_list = [
+                            Category(data_dict=category, user=self) for category in stored
+                        ]
+                        self.__revalidate(self.categories, include_deleted=include_deleted)
+
+                if not self.categories_list or refresh:
+                    params = {
+                        'includeDeleted': str(include_deleted).lower(),
+                    }
+                    self.__load(
+                        'categories_list', Category, CONSTANTS.get('CATEGORIES_URL'), params
+                    )
+                    self.notify('categories_loaded', self.categories_list)
 
         result = self.categories_list
         if not include_deleted:
@@ -116,37 +320,276 @@ class User(Resource):
 
         return result
 
+    def refresh_many(self, resources, max_workers=8):
+        """
+        Reload many tasks and categories at once.
+
+        Their data is updated in place, unsaved changes are dropped.
+        For every kind of resources it is decided what is faster: a single request
+        of the whole collection or individual requests, `max_workers` of them at once.
+        The size of a collection is estimated by the cached list, tasks are requested
+        with the include flags of the cache. Without a cached list requests are individual.
+        Return the list of resources. The first failure is raised after all requests are done.
+        """
+        coverage = self._tasks_coverage
+        groups = [
+            (Task, CONSTANTS.get('TASKS_URL'), self.tasks_list if coverage is not None else None,
+             _task_params(coverage or frozenset())),
+            (Category, CONSTANTS.get('CATEGORIES_URL'), self.categories_list,
+             {'includeDeleted': 'true'}),
+        ]
+        resources = list(resources)
+        individual = [
+            resource for resource in resources
+            if not isinstance(resource, tuple(group[0] for group in groups))
+        ]
+
+        for resource_class, url, cached, params in groups:
+            group = [resource for resource in resources if isinstance(resource, resource_class)]
+            # the size of a collection which is not cached is unknown, it could be huge
+            cheaper = cached is not None and collection_is_cheaper(
+                len(group), len(cached), max_workers
+            )
+            if not group or not cheaper:
+                individual.extend(group)
+                continue
+
+            fresh = dict((data['id'], data) for data in request.get(
+                url=url, session=self.session(), params=params
+            ))
+            for resource in group:
+                if resource['id'] in fresh:
+                    resource.reset_data(fresh[resource['id']])
+                    resource._changed() # pylint: disable=protected-access
+                else:
+                    individual.append(resource)
+
+        refreshed = parallel.run_all(lambda resource: resource.refresh(), individual, max_workers)
+        for future in refreshed:
+            future.result()
+
+        return resources
+
+    def set_status(self, tasks, status, batch_size=100, max_workers=4):
+        """
+        Set the status of many tasks at once.
+
+        Tasks are pushed in list requests of `batch_size` tasks, `max_workers` requests at once.
+        Return a list of `(task, error)` pairs in the order of tasks, error is None on success.
+        Tasks of failed requests keep the new status as unsaved changes.
+        """
+        if status not in TASK_STATUSES:
+            raise errors.ModelAttributeError(
+                'Unknown task status {}, expected one of {}'.format(status, TASK_STATUSES)
+            )
+
+        tasks = list(tasks)
+        for task in tasks:
+            task['status'] = status
+
+        return self.save_many(tasks, batch_size, max_workers)
+
+    def save_many(self, tasks, batch_size=100, max_workers=4):
+        """
+        Push changes of many tasks at once.
+
+        Tasks are sent in list requests of `batch_size` tasks, `max_workers` requests at once.
+        Return a list of `(task, error)` pairs in the order of tasks, error is None on success.
+        Tasks of failed requests keep their unsaved changes.
+        """
+        tasks = list(tasks)
+
+        def push(batch):
+            """Save a batch of tasks with a single request."""
+            sent = [dict(task.data_dict) for task in batch]
+            request.post(
+                url=CONSTANTS.get('TASKS_URL'),
+                session=self.session(),
+                json=[task._process_data_before_save(dict(data)) # pylint: disable=protected-access
+                      for task, data in zip(batch, sent)],
+                params={'includeDeleted': 'false', 'includeDone': 'false'}
+            )
+            for task, data in zip(batch, sent):
+                task.mark_saved(data)
+
+        batches = [tasks[start:start + batch_size] for start in range(0, len(tasks), batch_size)]
+        results = []
+        for batch, future in zip(batches, parallel.run_all(push, batches, max_workers)):
+            results.extend((task, future.exception()) for task in batch)
+
+        self.notify_many('resources_saved', [task for task, error in results if error is None])
+        return results
+
+    def destroy_many(self, tasks, max_workers=8):
+        """
+        Delete many tasks, `max_workers` requests at once as there is no bulk endpoint.
+
+        Deleted tasks are dropped from the cache.
+        Return a list of `(task, error)` pairs in the order of tasks, error is None on success.
+        """
+        tasks = list(tasks)
+
+        def destroy(task):
+            """Delete a single task."""
+            request.delete(
+                url=task.get_endpoint() + '/' + task['id'],
+                json=task.data_dict,
+                session=self.session()
+            )
+
+        results = [
+            (task, future.exception())
+            for task, future in zip(tasks, parallel.run_all(destroy, tasks, max_workers))
+        ]
+        removed = [task for task, error in results if error is None]
+        self.forget(removed)
+        self.notify_many('resources_removed', removed)
+        return results
+
+    def forget(self, resources):
+        """Drop resources from cached lists without any requests."""
+        dropped = set(id(resource) for resource in resources)
+        with self._cache_lock:
+            if self.tasks_list is not None:
+                self.tasks_list = [task for task in self.tasks_list if id(task) not in dropped]
+            if self.categories_list is not None:
+                self.categories_list = [
+                    category for category in self.categories_list if id(category) not in dropped
+                ]
+            if id(self._default_category) in dropped:
+                self._default_category = None
+
+    def tasks_view(self):
+        """
+        Return an immutable view of cached tasks (see `anydo_api.views`).
+
+        Taking it is O(1) and it never changes, every sync publishes a new version.
+        """
+        if self.tasks_list is None:
+            self.tasks()
+        return self.__views().tasks
+
+    def categories_view(self):
+        """Return an immutable view of cached categories."""
+        if self.categories_list is None:
+            self.categories()
+        return self.__views().categories
+
+    def search(self, query, limit=None, include_deleted=False, include_done=False):
+        """
+        Return cached tasks matching the words of the query, best matches first.
+
+        Titles, notes and subtask titles are searched, the last word could be a prefix.
+        DELETED and DONE tasks are left out like in `tasks`, unless included by the flags.
+        The index (see `anydo_api.search`) is built on the first call and kept up to date.
+        """
+        flags = _task_flags(include_deleted, include_done)
+        if self.tasks_list is None or (flags and not self.__tasks_cover(flags)):
+            self.tasks(include_deleted=include_deleted, include_done=include_done)
+        skipped = [status for status, included in (('DELETED', include_deleted),
+                                                    ('DONE', include_done)) if not included]
+        return self.__index('_search_index', SearchIndex).search(query, limit, skipped)
+
+    def tasks_shared_with(self, email):
+        """
+        Return cached tasks having the email among their members, including pending invitees.
+
+        Members are indexed (see `anydo_api.members`) on the first call and kept up to date.
+        """
+        if self.tasks_list is None:
+            self.tasks()
+        return self.__index('_members_index', MembersIndex).tasks(email)
+
+    def forest(self):
+        """
+        Return the tree of cached tasks (see `anydo_api.forest`).
+
+        It is built on the first call and kept up to date.
+        """
+        if self.tasks_list is None:
+            self.tasks()
+        return self.__index('_forest', TaskForest)
+
+    def share_many(self, tasks, members, message=None, max_workers=8):
+        """
+        Share many tasks with many members.
+
+        Every task is shared with all the members in a single request, `max_workers` requests
+        run at once. Return a list of `(task, error)` pairs in the order of tasks,
+        error is None on success.
+        """
+        tasks = list(tasks)
+        json_data = {
+            'invitees': [{'email': member['email']} for member in members],
+            'message': message
+        }
+
+        def share(task):
+            """Share a single task, its data is replaced with the response."""
+            task.reset_data(request.post(
+                url=task.get_endpoint() + '/' + task['id'] + '/share',
+                json=json_data,
+                session=self.session()
+            ))
+
+        results = [
+            (task, future.exception())
+            for task, future in zip(tasks, parallel.run_all(share, tasks, max_workers))
+        ]
+        self.notify_many('resources_saved', [task for task, error in results if error is None])
+        return results
+
     def add_task(self, task):
         """Add new task into internal storage."""
-        if self.tasks_list:
-            self.tasks_list.append(task)
-        else:
-            self.tasks_list = [task]
+        with self._cache_lock:
+            self.tasks_list = (self.tasks_list or []) + [task]
+        self.notify('resource_saved', task)
+
+    def add_tasks(self, tasks):
+        """Add many new tasks into internal storage at once."""
+        if not tasks:
+            return
+
+        with self._cache_lock:
+            self.tasks_list = (self.tasks_list or []) + list(tasks)
+        self.notify_many('resources_saved', tasks)
 
     def add_category(self, category):
         """Add new category into internal storage."""
-        if self.categories_list:
-            self.categories_list.append(category)
-        else:
-            self.categories_list = [category]
+        with self._cache_lock:
+            self.categories_list = (self.categories_list or []) + [category]
+        self.notify('resource_saved', category)
 
     def default_category(self):
-        """Return default category for user if exist."""
-        return next((cat for cat in self.categories() if cat.isDefault), None)
+        """
+        Return default category for user if exist.
+
+        The category is remembered, categories are scanned again only after they are reloaded
+        or the remembered one stops being default.
+        """
+        default = self._default_category
+        if default is None or not default.isDefault:
+            default = next((cat for cat in self.categories() if cat.isDefault), None)
+            self._default_category = default
+        return default
 
     def pending_tasks(self, refresh=False):
         """
         Return a list of dicts representing a pending task that was shared with current user.
 
-        Empty list otherwise.
+        Empty list otherwise. An empty list is cached for `EMPTY_PENDING_TTL` seconds.
         """
-        if not self._pending_tasks or refresh:
-            response_obj = request.get(
-                url=self.get_endpoint() + '/pending',
-                session=self.session()
-            )
-
-            self._pending_tasks = response_obj['pendingTasks']
+        self.__touch(refresh)
+        if refresh or self.__pending_expired():
+            with self._loading['pending']:
+                if refresh or self.__pending_expired():
+                    response_obj = request.get(
+                        url=self.get_endpoint() + '/pending',
+                        session=self.session()
+                    )
+
+                    self._pending_tasks = response_obj['pendingTasks']
+                    self._pending_loaded = time.time()
 
         return self._pending_tasks or []
 
@@ -163,6 +606,7 @@ class User(Resource):
         Approve pending task via API call.
 
         Accept pending_task_id or pending_task dict (in format of pending_tasks.
+        The accepted task is added to the cached tasks.
         """
         task_id = pending_task_id or pending_task['id']
         if not task_id:
@@ -174,9 +618,160 @@ class User(Resource):
             url=self.get_endpoint() + '/pending/' + task_id + '/accept',
             session=self.session()
         )
+        self.__accepted([(task_id, response_obj)])
 
         return response_obj
 
+    def approve_all_pending(self, filter=None, max_workers=8): # pylint: disable=redefined-builtin
+        """
+        Approve all pending tasks, or the ones `filter(pending_task)` is true for.
+
+        Tasks are accepted in parallel, `max_workers` requests at once, and added to the cached
+        tasks. Return a list of `(pending_task, error)` pairs, error is None on success.
+        """
+        pending = [task for task in self.pending_tasks() if filter is None or filter(task)]
+
+        def accept(pending_task):
+            """Accept a single pending task, return the task data."""
+            return request.post(
+                url=self.get_endpoint() + '/pending/' + pending_task['id'] + '/accept',
+                session=self.session()
+            )
+
+        results = [
+            (pending_task, future)
+            for pending_task, future in zip(pending, parallel.run_all(accept, pending, max_workers))
+        ]
+        self.__accepted([
+            (pending_task['id'], future.result())
+            for pending_task, future in results if future.exception() is None
+        ])
+        return [(pending_task, future.exception()) for pending_task, future in results]
+
+    def __load(self, attribute, resource_class, url, params):
+        """
+        Fetch a collection and swap the merged list into the `attribute` at once.
+
+        Resources added while the request was running are kept.
+        """
+        before = getattr(self, attribute)
+        data_list = request.get(url=url, session=self.session(), params=params)
+
+        with self._cache_lock:
+            current = getattr(self, attribute)
+            merged = self.__merge(current, data_list, resource_class)
+            fresh_ids = set(data['id'] for data in data_list)
+            known = set(id(resource) for resource in before or [])
+            merged.extend(
+                resource for resource in current or []
+                if id(resource) not in known and resource['id'] not in fresh_ids
+            )
+            setattr(self, attribute, merged)
+            if attribute == 'categories_list':
+                self._default_category = None
+
+    def __tasks_cover(self, flags):
+        """
+        Return True if cached tasks include the `flags` statuses.
+
+        A list not loaded by `tasks()`, like one of tasks created on a cold user, covers nothing.
+        """
+        if self.tasks_list is None or self._tasks_coverage is None:
+            return False
+        return flags <= self._tasks_coverage
+
+    def __pending_expired(self):
+        """Return True if pending tasks are not loaded or an empty list is older than the TTL."""
+        if self._pending_tasks is None:
+            return True
+        return not self._pending_tasks and time.time() - self._pending_loaded >= EMPTY_PENDING_TTL
+
+    def __accepted(self, accepted):
+        """Drop accepted tasks from pending ones, add their `(pending id, data)` to the cache."""
+        if not accepted:
+            return
+
+        pending_ids = set(pending_id for pending_id, _ in accepted)
+        tasks = []
+        with self._cache_lock:
+            if self._pending_tasks:
+                self._pending_tasks = [
+                    task for task in self._pending_tasks if task['id'] not in pending_ids
+                ]
+            if self.tasks_list is not None:
+                known = dict((task['id'], task) for task in self.tasks_list)
+                for _, data in accepted:
+                    if not data or 'id' not in data:
+                        continue
+                    task = known.get(data['id'])
+                    if task is None:
+                        task = known[data['id']] = Task(data_dict=data, user=self)
+                        self.tasks_list = self.tasks_list + [task]
+                    else:
+                        task.merge_data(data)
+                    tasks.append(task)
+
+        self.notify_many('resources_saved', tasks)
+
+    def __merge(self, resources, data_list, resource_class):
+        """
+        Return a list of resources for fresh `data_list`.
+
+        Already known objects are reused and updated in place, unless they have unsaved changes.
+        """
+        known = dict((resource['id'], resource) for resource in resources or [])
+        result = []
+        for data in data_list:
+            resource = known.get(data['id'])
+            if resource is None:
+                resource = resource_class(data_dict=data, user=self)
+            else:
+                resource.merge_data(data)
+            result.append(resource)
+
+        return result
+
+    def __views(self):
+        """Return the views publisher, starting it on the first call."""
+        with self._cache_lock:
+            if self._views is None:
+                views = Views()
+                views.publish('tasks', self.tasks_list)
+                views.publish('categories', self.categories_list)
+                self._listeners = self._listeners + [views]
+                self._views = views
+
+        return self._views
+
+    def __index(self, attribute, index_class):
+        """Return the task index kept in the `attribute`, building it on the first call."""
+        with self._cache_lock:
+            if getattr(self, attribute) is None:
+                index = index_class()
+                index.rebuild(self.tasks_list or [])
+                self._listeners = self._listeners + [index]
+                setattr(self, attribute, index)
+
+        return getattr(self, attribute)
+
+    def __touch(self, refresh):
+        """Let the refresher know cached data is read."""
+        if self.refresher is not None and not refresh:
+            self.refresher.touch(self)
+
+    def __revalidate(self, method, **options):
+        """Refresh the data with `method(refresh=True, **options)` in a background thread."""
+        def revalidate():
+            """Thread target, failures are logged as there is no one to handle them."""
+            try:
+                method(refresh=True, **options)
+            except Exception: # pylint: disable=broad-except
+                _LOGGER.exception('Background revalidation of %s failed', method.__name__)
+
+        self.revalidation = threading.Thread(target=revalidate, name='anydo-revalidate')
+        self.revalidation.daemon = True
+        self.revalidation.start()
+
     @staticmethod
     def required_attributes():
         """
@@ -0,0 +1,240 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+`anydo_api.views`.
+
+Immutable versioned views of user tasks and categories.
+
+A reader takes the current `View` in O(1) and iterates it without locks or copies,
+it never changes. Writers publish new versions, records are kept in chunks of
+`CHUNK` and unchanged records and chunks are shared between versions.
+"""
+
+import threading
+
+from anydo_api.category import Category
+from anydo_api.task import Task
+
+__all__ = ('CHUNK', 'Record', 'View', 'Views')
+
+CHUNK = 32
+
+class Record(dict):
+    """Read-only copy of resource data, nested values are not frozen."""
+
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        """Reject any change."""
+        raise TypeError('view records are read-only')
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        """Pickle as a plain dict copy."""
+        return (Record, (dict(self),))
+
+class View(object):
+    """
+    `View` is an immutable sequence of records of one collection version.
+
+    Records are looked up by position or by id.
+    """
+
+    __slots__ = ('version', '_chunks', '_length', '_index')
+
+    def __init__(self, version=0, chunks=(), index=None):
+        """Constructor for View."""
+        self.version = version
+        self._chunks = chunks
+        self._length = sum(len(chunk) for chunk in chunks)
+        self._index = index
+
+    def __len__(self):
+        """Return a number of records."""
+        return self._length
+
+    def __iter__(self):
+        """Iterate records, no copies are made."""
+        for chunk in self._chunks:
+            for record in chunk:
+                yield record
+
+    def __getitem__(self, position):
+        """Return a record by position."""
+        if position < 0:
+            position += self._length
+        if not 0 <= position < self._length:
+            raise IndexError('view index out of range')
+        return self._chunks[position // CHUNK][position % CHUNK]
+
+    def get(self, record_id, default=None):
+        """Return a record by id."""
+        position = self.position(record_id)
+        return default if position is None else self[position]
+
+    def position(self, record_id):
+        """Return a position of the record with `record_id` or None."""
+        if self._index is None:
+            self._index = dict((record['id'], position) for position, record in enumerate(self))
+
+        # the index could be shared with newer versions which appended records
+        position = self._index.get(record_id)
+        if position is None or position >= self._length or self[position]['id'] != record_id:
+            return None
+        return position
+
+    def replace(self, position, record):
+        """Return a new version with the record at `position` replaced."""
+        number, offset = divmod(position, CHUNK)
+        chunk = self._chunks[number]
+        chunks = self._chunks[:number] + (chunk[:offset] + (record,) + chunk[offset + 1:],) + \
+            self._chunks[number + 1:]
+        return View(self.version + 1, chunks, self._index)
+
+    def append(self, record):
+        """Return a new version with the record added at the end."""
+        if self._chunks and len(self._chunks[-1]) < CHUNK:
+            chunks = self._chunks[:-1] + (self._chunks[-1] + (record,),)
+        else:
+            chunks = self._chunks + ((record,),)
+
+        index = self._index
+        if index is not None:
+            index[record['id']] = self._length
+        return View(self.version + 1, chunks, index)
+
+    def rebuild(self, records):
+        """
+        Return a new version holding `records`.
+
+        Records equal to the ones of this version are reused, so are chunks made of
+        the same records. If nothing has changed this version is returned.
+        """
+        reused = []
+        for data in records:
+            previous = self.get(data['id'])
+            reused.append(previous if previous == data else Record(data))
+
+        chunks = []
+        for number, start in enumerate(range(0, len(reused), CHUNK)):
+            chunk = tuple(reused[start:start + CHUNK])
+            if number < len(self._chunks) and _same(self._chunks[number], chunk):
+                chunk = self._chunks[number]
+            chunks.append(chunk)
+
+        if len(chunks) == len(self._chunks) and all(a is b for a, b in zip(chunks, self._chunks)):
+            return self
+        return View(self.version + 1, tuple(chunks))
+
+def _saved(view, resource):
+    """Return a version with the resource appended or replaced, or the same one if unchanged."""
+    position = view.position(resource['id'])
+    if position is None:
+        return view.append(Record(resource.data_dict))
+    if view[position] != resource.data_dict:
+        return view.replace(position, Record(resource.data_dict))
+    return view
+
+def _same(first, second):
+    """Return True if both chunks hold the very same records."""
+    return len(first) == len(second) and all(a is b for a, b in zip(first, second))
+
+class Views(object):
+    """
+    `Views` publishes versions of the user tasks and categories.
+
+    It is a `User` listener, created by `user.tasks_view()` or `user.categories_view()`.
+    """
+
+    def __init__(self):
+        """Constructor for Views."""
+        self.tasks = View()
+        self.categories = View()
+        self._lock = threading.Lock()
+
+    def publish(self, name, resources):
+        """Publish a new version of the collection from a list of resources."""
+        with self._lock:
+            view = getattr(self, name)
+            setattr(self, name, view.rebuild([resource.data_dict for resource in resources or []]))
+
+    # `User` listener interface
+
+    def resource_saved(self, user, resource): # pylint: disable=unused-argument
+        """Publish a version with the saved or created resource."""
+        name = self._collection(resource)
+        if name is None:
+            return
+
+        with self._lock:
+            setattr(self, name, _saved(getattr(self, name), resource))
+
+    def resources_saved(self, user, resources): # pylint: disable=unused-argument
+        """
+        Publish a single version with all the saved resources.
+
+        Up to `CHUNK` resources are appended or replaced one by one, more of them rebuild the view.
+        """
+        for name, group in self._groups(resources):
+            with self._lock:
+                view = getattr(self, name)
+                if len(group) <= CHUNK:
+                    for resource in group:
+                        view = _saved(view, resource)
+                else:
+                    changed = dict((resource['id'], resource.data_dict) for resource in group)
+                    records = [changed.pop(record['id'], record) for record in view]
+                    records.extend(changed.values())
+                    view = view.rebuild(records)
+                setattr(self, name, view)
+
+    def resources_removed(self, user, resources): # pylint: disable=unused-argument
+        """Publish a single version without all the deleted resources."""
+        for name, group in self._groups(resources):
+            removed = set(resource['id'] for resource in group)
+            with self._lock:
+                view = getattr(self, name)
+                setattr(self, name, view.rebuild(
+                    [record for record in view if record['id'] not in removed]
+                ))
+
+    def resource_removed(self, user, resource): # pylint: disable=unused-argument
+        """Publish a version without the deleted resource."""
+        name = self._collection(resource)
+        if name is None:
+            return
+
+        with self._lock:
+            view = getattr(self, name)
+            if view.position(resource['id']) is not None:
+                setattr(self, name, view.rebuild(
+                    [record for record in view if record['id'] != resource['id']]
+                ))
+
+    def tasks_loaded(self, user, tasks): # pylint: disable=unused-argument
+        """Publish freshly loaded tasks."""
+        self.publish('tasks', tasks)
+
+    def categories_loaded(self, user, categories): # pylint: disable=unused-argument
+        """Publish freshly loaded categories."""
+        self.publish('categories', categories)
+
+    @classmethod
+    def _groups(cls, resources):
+        """Return `(collection name, resources)` pairs."""
+        groups = {}
+        for resource in resources:
+            name = cls._collection(resource)
+            if name is not None:
+                groups.setdefault(name, []).append(resource)
+        return groups.items()
+
+    @staticmethod
+    def _collection(resource):
+        """Return a name of the collection of the resource."""
+        if isinstance(resource, Task):
+            return 'tasks'
+        if isinstance(resource, Category):
+            return 'categories'
+        return None
@@ -0,0 +1,316 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+`anydo_api.write_behind`.
+
+`WriteBehind` class.
+
+Saves of tasks and categories are queued and pushed by a background flusher,
+so callers do not wait for a PUT request.
+"""
+
+import collections
+import json
+import logging
+import os
+import threading
+import time
+
+from concurrent import futures
+
+from anydo_api import errors
+from anydo_api import request
+
+__all__ = ('WriteBehind')
+
+_LOGGER = logging.getLogger(__name__)
+
+# the spill journal is compacted when it has more lines than this and twice the unfinished writes
+COMPACT_LINES = 1000
+
+class _Write(object): # pylint: disable=too-few-public-methods
+    """A pending PUT of a resource or of raw data."""
+
+    def __init__(self, url, session, resource=None, data=None):
+        """Constructor for _Write."""
+        self.url = url
+        self.session = session
+        self.resource = resource
+        self.data = data
+        self.future = futures.Future()
+        self.queued = time.time()
+        self.spilled = None
+        self.error = None
+
+    def payload(self):
+        """Return `(copy of resource data, data to send)`, a resource is read at the moment."""
+        if self.resource is None:
+            return None, self.data
+
+        current = dict(self.resource.data_dict)
+        # pylint: disable=protected-access
+        return current, self.resource._process_data_before_save(dict(current))
+
+class WriteBehind(object):
+    """
+    `WriteBehind` is a queue of pending saves with a background flusher.
+
+    Saves of the same resource are merged until its write starts, the latest data is sent.
+    Writes wait `delay` seconds to collect more changes, at most `max_workers` of them
+    run at once, failed ones are retried up to `retries` times with exponential backoff
+    starting at `backoff` seconds. Errors of the request itself (bad request, conflict)
+    are not retried. A write failed for good is logged and its future gets the error.
+    With `spill_path` pending and failed writes are journaled into that file
+    by the flusher, so they could be pushed with `recover` after a crash.
+    Attach it with `user.use_write_behind(queue)`.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, delay=0.05, max_workers=4, retries=3, backoff=0.5, spill_path=None):
+        """Constructor for WriteBehind."""
+        self.delay = delay
+        self.retries = retries
+        self.backoff = backoff
+        self.spill_path = spill_path and os.path.abspath(os.path.expanduser(spill_path))
+
+        self._executor = futures.ThreadPoolExecutor(max_workers=max_workers)
+        self._condition = threading.Condition()
+        self._pending = collections.OrderedDict()
+        self._running = {}
+        self._unspilled = collections.OrderedDict()
+        self._finished = []
+        self._failed = collections.OrderedDict()
+        self._journal_lines = None
+        self._spill_seq = 0
+        self._flush_now = False
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='anydo-write-behind')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def __enter__(self):
+        """Use the queue as a context manager."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Push pending writes and stop."""
+        self.close()
+        return False
+
+    def __len__(self):
+        """Return a number of pending and running writes."""
+        with self._condition:
+            return len(self._pending) + len(self._running)
+
+    def save(self, resource, alternate_endpoint=None):
+        """
+        Queue a save of the resource, return a `concurrent.futures.Future` of its write.
+
+        Saves merged into one write share the future.
+        """
+        url = alternate_endpoint or (resource.get_endpoint() + '/' + resource['id'])
+        return self._enqueue(url, lambda: _Write(url, resource.session(), resource=resource))
+
+    def put(self, url, data, session):
+        """Queue a PUT of raw `data`, return a future of its write."""
+        return self._enqueue(url, lambda: _Write(url, session, data=data), replace=True)
+
+    def future(self, resource):
+        """Return a future of the unfinished write of the resource, None if there is no one."""
+        url = resource.get_endpoint() + '/' + resource['id']
+        with self._condition:
+            write = self._pending.get(url) or self._running.get(url)
+            return write.future if write is not None else None
+
+    def flush(self, timeout=None):
+        """Push all queued writes now and wait for them. Return True if all are finished."""
+        with self._condition:
+            self._flush_now = True
+            self._condition.notify_all()
+            writes = list(self._pending.values()) + list(self._running.values())
+            waiting = [write.future for write in writes]
+
+        done, _ = futures.wait(waiting, timeout=timeout)
+        return len(done) == len(waiting)
+
+    def close(self):
+        """Push all queued writes and stop the flusher."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+        self._thread.join()
+        self._executor.shutdown(wait=True)
+        with self._condition:
+            self._spill()
+
+    def recover(self, session):
+        """
+        Queue writes left in `spill_path` by a previous process, using `session` for them.
+
+        Return a list of their futures.
+        """
+        return [self.put(url, data, session) for url, data in _load_spill(self.spill_path)]
+
+    def _enqueue(self, url, new_write, replace=False):
+        """Add a write unless one for the same url is already pending."""
+        with self._condition:
+            if self._closed:
+                raise RuntimeError('Can not queue writes on a closed write-behind queue')
+
+            write = self._pending.get(url)
+            if write is None or replace:
+                future = write.future if write is not None else None
+                if write is not None:
+                    self._unspilled.pop(id(write), None)
+                write = self._pending[url] = new_write()
+                if future is not None:
+                    write.future = future
+
+            if self.spill_path:
+                self._unspilled[id(write)] = write
+            self._condition.notify_all()
+            return write.future
+
+    def _spill(self):
+        """
+        Journal writes queued and finished since the last call. Must be called under the lock.
+
+        Queued data is appended as `{"seq", "url", "json"}` lines, a successful write appends
+        `{"url", "done": seq}` line. A failed write stays in the journal until a later write
+        of its url succeeds. The file is rewritten with the unfinished and failed writes only
+        on the first call, when the queue is idle and when finished lines take over.
+        """
+        if not self.spill_path or not (self._unspilled or self._finished):
+            return
+
+        done = []
+        for write in self._finished:
+            self._unspilled.pop(id(write), None)
+            if write.error is not None:
+                self._failed[write.url] = write
+                if write.spilled is None:
+                    self._unspilled[id(write)] = write
+            elif write.spilled is not None:
+                failed = self._failed.get(write.url)
+                if failed is not None and failed.spilled < write.spilled:
+                    del self._failed[write.url]
+                done.append({'url': write.url, 'done': write.spilled})
+
+        unfinished = list(self._running.values()) + list(self._pending.values())
+        unfinished.extend(write for url, write in self._failed.items()
+                          if url not in self._running and url not in self._pending)
+        compact = max(COMPACT_LINES, 2 * len(unfinished))
+        if self._journal_lines is None or not unfinished or self._journal_lines > compact:
+            lines = [self._spill_line(write) for write in unfinished]
+            temporary_path = '{}.{}.tmp'.format(self.spill_path, os.getpid())
+            descriptor = os.open(temporary_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(descriptor, 'w') as stream:
+                stream.writelines(json.dumps(line) + '\n' for line in lines)
+            os.rename(temporary_path, self.spill_path)
+            self._journal_lines = len(lines)
+        else:
+            lines = [self._spill_line(write) for write in self._unspilled.values()] + done
+            with open(self.spill_path, 'a') as stream:
+                stream.writelines(json.dumps(line) + '\n' for line in lines)
+            self._journal_lines += len(lines)
+
+        self._unspilled.clear()
+        self._finished = []
+
+    def _spill_line(self, write):
+        """Return a journal line with the current data of the write."""
+        self._spill_seq += 1
+        write.spilled = self._spill_seq
+        return {'seq': write.spilled, 'url': write.url, 'json': write.payload()[1]}
+
+    def _run(self):
+        """Flusher thread loop."""
+        with self._condition:
+            while True:
+                self._spill()
+                # a resource is never written by two workers at once, its next write waits
+                ready = [write for url, write in self._pending.items() if url not in self._running]
+                if not ready:
+                    if not self._pending:
+                        if self._closed:
+                            return
+                        self._flush_now = False
+                    self._condition.wait()
+                    continue
+
+                delay = min(write.queued for write in ready) + self.delay - time.time()
+                if delay > 0 and not (self._flush_now or self._closed):
+                    self._condition.wait(delay)
+                    continue
+
+                for write in ready:
+                    self._running[write.url] = self._pending.pop(write.url)
+                    self._executor.submit(self._write, write)
+
+    def _write(self, write):
+        """Worker job: push a write with retries, resolve its future once it is off the queue."""
+        error = None
+        if write.future.set_running_or_notify_cancel():
+            sent, data = write.payload()
+            try:
+                self._put(write.url, data, write.session)
+            except Exception as put_error: # pylint: disable=broad-except
+                _LOGGER.exception('Write-behind PUT of %s failed', write.url)
+                error = put_error
+            else:
+                if write.resource is not None:
+                    write.resource.mark_saved(sent)
+                    write.resource._changed() # pylint: disable=protected-access
+
+        with self._condition:
+            del self._running[write.url]
+            write.error = error
+            if self.spill_path:
+                self._finished.append(write)
+            self._condition.notify_all()
+
+        if not write.future.done():
+            if error is not None:
+                write.future.set_exception(error)
+            else:
+                write.future.set_result(write.resource)
+
+    def _put(self, url, data, session):
+        """Send the request, retrying server and network failures."""
+        attempt = 0
+        while True:
+            try:
+                return request.put(url=url, json=data, session=session)
+            except errors.Error as error:
+                if not isinstance(error, errors.InternalServerError) or attempt >= self.retries:
+                    raise
+            except Exception: # pylint: disable=broad-except
+                if attempt >= self.retries:
+                    raise
+
+            time.sleep(self.backoff * 2 ** attempt)
+            attempt += 1
+
+def _load_spill(path):
+    """Return `(url, data)` of unfinished writes in the spill journal, skip torn lines."""
+    latest = collections.OrderedDict()
+    done = {}
+    try:
+        with open(path) as stream:
+            for text in stream:
+                try:
+                    line = json.loads(text)
+                except ValueError:
+                    continue
+                if 'done' in line:
+                    done[line['url']] = max(done.get(line['url'], 0), line['done'])
+                else:
+                    latest.pop(line['url'], None)
+                    latest[line['url']] = line
+    except (IOError, OSError):
+        return []
+
+    return [
+        (url, line['json']) for url, line in latest.items() if line['seq'] > done.get(url, 0)
+    ]
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Template instantiation benchmark for `Task.clone`.
+
+Stamp out a checklist template of `--nodes` tasks over a fake API answering
+after `--latency` seconds, once with `create_subtask` calls and once with one `clone()`:
+
+    $ python benchmarks/clone_tree.py --nodes 1000 --latency 0.01
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from anydo_api.task import Task # pylint: disable=wrong-import-position
+from anydo_api.user import User # pylint: disable=wrong-import-position
+
+class SlowSession(object): # pylint: disable=too-few-public-methods
+    """Fake session answering after `latency` seconds, created tasks are echoed."""
+
+    shared_adapter = 'none' # keeps the library from mounting adapters and closing the session
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.posts = 0
+
+    def __getattr__(self, method):
+        if method != 'post':
+            raise AttributeError(method)
+
+        def call(url, **kwargs):
+            """Sleep like a network call and echo the payload."""
+            time.sleep(self.latency)
+            self.posts += 1
+            return FakeResponse(kwargs['json'])
+        return call
+
+class FakeResponse(object): # pylint: disable=too-few-public-methods
+    """Successful response with json data."""
+
+    status_code = 200
+
+    def __init__(self, data):
+        self.data = data
+
+    def json(self):
+        """Return the data."""
+        return self.data
+
+    def raise_for_status(self):
+        """Never fails."""
+        pass
+
+def template(user, nodes, fanout):
+    """Return the root of a template tree, every task has up to `fanout` subtasks."""
+    tasks = [
+        Task(data_dict={
+            'id': 'template-{}'.format(index),
+            'title': 'Step {}'.format(index),
+            'status': 'UNCHECKED',
+            'categoryId': 'templates',
+            'parentGlobalTaskId': 'template-{}'.format((index - 1) // fanout) if index else None,
+        }, user=user) for index in range(nodes)
+    ]
+    user.tasks_list = tasks
+    return tasks[0]
+
+def create_one_by_one(root, parent):
+    """Copy the tree with a `create_subtask` call per node, like a loop over the template."""
+    for child in root.subtasks():
+        copy = parent.create_subtask(title=child.title, status='UNCHECKED')
+        create_one_by_one(child, copy)
+
+def main():
+    """Entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--nodes', type=int, default=1000)
+    parser.add_argument('--fanout', type=int, default=10)
+    parser.add_argument('--latency', type=float, default=0.01)
+    args = parser.parse_args()
+
+    session = SlowSession(args.latency)
+    user = User(data_dict={'id': 'me'}, session=session)
+    root = template(user, args.nodes, args.fanout)
+    started = time.time()
+    create_one_by_one(root, Task.create(user=user, title=root.title, status='UNCHECKED'))
+    looped, loop_posts = time.time() - started, session.posts
+
+    session = SlowSession(args.latency)
+    user = User(data_dict={'id': 'me'}, session=session)
+    root = template(user, args.nodes, args.fanout)
+    started = time.time()
+    root.clone()
+    cloned = time.time() - started
+
+    print('{} nodes, fanout {}, {:.0f} ms API latency'.format(
+        args.nodes, args.fanout, args.latency * 1000))
+    print('create_subtask loop: {:.2f} s, {} requests'.format(looped, loop_posts))
+    print('clone: {:.2f} s, {} requests'.format(cloned, session.posts))
+
+if __name__ == '__main__':
+    main()
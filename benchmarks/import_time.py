@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Startup benchmark for `import anydo_api`.
+
+Run `python -X importtime -c "import anydo_api"` several times and report
+the best total import time caused by the statement (interpreter startup
+excluded) and the heavy modules pulled in.
+Exit with non-zero status if a budget is exceeded, so it can be used in CI:
+
+    $ python benchmarks/import_time.py --budget-ms 15
+"""
+
+import argparse
+import subprocess
+import sys
+
+HEAVY_MODULES = ('requests', 'urllib3', 'chardet', 'charset_normalizer', 'idna', 'six')
+
+def measure(statement):
+    """Return a dict {top-level module: cumulative microseconds} for a single interpreter run."""
+    output = subprocess.check_output(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        stderr=subprocess.STDOUT,
+        universal_newlines=True
+    )
+
+    timings = {}
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, module = line.split('|')
+        nested = module[:2] == '  '
+        timings[module.strip()] = 0 if nested else int(cumulative)
+
+    return timings
+
+def main():
+    """Entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--statement', default='import anydo_api')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget-ms', type=float, default=None)
+    args = parser.parse_args()
+
+    startup = set(measure('pass'))
+    runs = [measure(args.statement) for _ in range(args.runs)]
+    best = min(
+        sum(took for module, took in run.items() if module not in startup) for run in runs
+    ) / 1000.0
+    heavy = sorted(module for module in runs[0] if module.split('.')[0] in HEAVY_MODULES)
+
+    print('{!r}: {:.2f} ms (best of {})'.format(args.statement, best, args.runs))
+    print('heavy modules imported: {}'.format(', '.join(heavy) or 'none'))
+
+    if args.budget_ms is not None and best > args.budget_ms:
+        print('FAIL: import time budget of {} ms exceeded'.format(args.budget_ms))
+        return 1
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
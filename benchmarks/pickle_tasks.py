@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Pickling benchmark for `Task` objects.
+
+Measure pickled size and dump/load time of tasks compared to their bare data
+dicts, then ship them to a process pool and back:
+
+    $ python benchmarks/pickle_tasks.py --tasks 10000
+"""
+
+import argparse
+import os
+import pickle
+import sys
+import time
+
+from concurrent import futures
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from anydo_api.task import Task # pylint: disable=wrong-import-position
+from anydo_api.user import User # pylint: disable=wrong-import-position
+from store_startup import NoNetwork, fake_tasks # pylint: disable=wrong-import-position
+
+def timed(func):
+    """Return a result of the call and seconds it took."""
+    started = time.time()
+    result = func()
+    return result, time.time() - started
+
+def upper_titles(tasks):
+    """Job run by pool workers."""
+    for task in tasks:
+        task['title'] = task.title.upper()
+    return tasks
+
+def main():
+    """Entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--tasks', type=int, default=10000)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    user = User(data_dict={'id': 'me', 'email': 'me@xxx.xxx', 'password': 'secret'}, session=NoNetwork())
+    tasks = [Task(data_dict=task, user=user) for task in fake_tasks(args.tasks)]
+    data = [task.data_dict for task in tasks]
+
+    for name, objects in (('data dicts', data), ('tasks', tasks)):
+        payload, dumped = timed(lambda: pickle.dumps(objects, protocol=pickle.HIGHEST_PROTOCOL))
+        _, loaded = timed(lambda: pickle.loads(payload))
+        print('{}: {:.2f} MB, dumps {:.3f} s, loads {:.3f} s'.format(
+            name, len(payload) / 1024.0 / 1024, dumped, loaded))
+
+    chunk = max(1, len(tasks) // args.workers)
+    with futures.ProcessPoolExecutor(max_workers=args.workers) as executor:
+        results, elapsed = timed(lambda: [
+            task for part in executor.map(upper_titles, [tasks[i:i + chunk] for i in range(0, len(tasks), chunk)])
+            for task in part
+        ])
+
+    assert all(task.user is user for task in results)
+    print('process pool round trip: {:.3f} s, results bound to the local user'.format(elapsed))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Query latency benchmark for `SearchIndex`.
+
+Index a synthetic account and compare ranked index queries with a scan
+substring-matching titles and notes of every task, then measure single task updates
+and a reload of the account:
+
+    $ python benchmarks/search_index.py --tasks 100000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from anydo_api.search import SearchIndex # pylint: disable=wrong-import-position
+from anydo_api.task import Task # pylint: disable=wrong-import-position
+from anydo_api.user import User # pylint: disable=wrong-import-position
+
+from store_startup import fake_tasks # pylint: disable=wrong-import-position
+
+WORDS = ('call buy book plan review send fix pay clean write read check order meet draft '
+         'report invoice budget trip hotel dentist garden kitchen laundry grocery birthday '
+         'meeting project release server backup contract insurance passport').split()
+
+def scan(tasks, query):
+    """Return tasks containing every query word in the title or notes, like a loop would."""
+    words = query.lower().split()
+    return [
+        task for task in tasks
+        if all(word in task.title.lower() or
+               any(word in note.lower() for note in task.notes()) for word in words)
+    ]
+
+def timed(func, repeat):
+    """Return the median and the worst time of calls in milliseconds."""
+    times = []
+    for _ in range(repeat):
+        started = time.time()
+        func()
+        times.append((time.time() - started) * 1000)
+    times.sort()
+    return times[len(times) // 2], times[-1]
+
+def main():
+    """Entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--tasks', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    user = User(data_dict={'id': 'me'}, session=None)
+    tasks = []
+    for data in fake_tasks(args.tasks):
+        data['title'] = ' '.join(rng.sample(WORDS, 3)) + ' ' + data['id']
+        data['note'] = '\n'.join(' '.join(rng.sample(WORDS, 4)) for _ in range(2))
+        tasks.append(Task(data_dict=data, user=user))
+
+    index = SearchIndex()
+    started = time.time()
+    index.rebuild(tasks)
+    print('{} tasks indexed in {:.2f} s'.format(len(tasks), time.time() - started))
+
+    for query in ('passport', 'hotel trip', 'invoice bud', 'garden kitchen laundry'):
+        found = len(index.search(query))
+        indexed = timed(lambda: index.search(query, limit=20), args.repeat)
+        scanned = timed(lambda: scan(tasks, query), max(1, args.repeat // 10))
+        print('{!r:26} {:6} hits  index {:7.2f} ms (max {:7.2f})  scan {:8.2f} ms'.format(
+            query, found, indexed[0], indexed[1], scanned[0]))
+
+    def update():
+        task = tasks[rng.randrange(len(tasks))]
+        task.data_dict['title'] = ' '.join(rng.sample(WORDS, 3))
+        index.index(task)
+    median, worst = timed(update, args.repeat * 10)
+    print('single task update: {:.3f} ms (max {:.3f})'.format(median, worst))
+
+    reloaded = [Task(data_dict=dict(task.data_dict), user=user) for task in tasks]
+    for task in reloaded[::100]:
+        task.data_dict['title'] = ' '.join(rng.sample(WORDS, 3))
+    started = time.time()
+    index.tasks_loaded(user, reloaded)
+    print('reload with 1% changed: {:.2f} s'.format(time.time() - started))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Snapshot benchmark for `anydo_api.snapshot`.
+
+Export a synthetic account and compare a snapshot with the same data as JSON:
+file size, time to open, to read a single record and to decode everything:
+
+    $ python benchmarks/snapshot_load.py --tasks 50000
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from anydo_api.snapshot import export_snapshot, load_snapshot # pylint: disable=wrong-import-position
+from anydo_api.task import Task # pylint: disable=wrong-import-position
+from anydo_api.user import User # pylint: disable=wrong-import-position
+from store_startup import NoNetwork, fake_tasks # pylint: disable=wrong-import-position
+
+def timed(func):
+    """Return a result of the call and seconds it took."""
+    started = time.time()
+    result = func()
+    return result, time.time() - started
+
+def main():
+    """Entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--tasks', type=int, default=50000)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, 'user.snapshot')
+        user = User(data_dict={'id': 'me', 'email': 'me@xxx.xxx'}, session=NoNetwork())
+        user.tasks_list = [Task(data_dict=task, user=user) for task in fake_tasks(args.tasks)]
+        payload = json.dumps([task.data_dict for task in user.tasks_list])
+
+        _, exported = timed(lambda: export_snapshot(user, path))
+        snapshot, opened = timed(lambda: load_snapshot(path))
+        _, single = timed(lambda: snapshot.tasks[args.tasks // 2])
+        records, decoded = timed(lambda: list(snapshot.tasks))
+        _, json_decoded = timed(lambda: json.loads(payload))
+        assert records == [task.data_dict for task in user.tasks_list]
+
+        print('{} tasks'.format(args.tasks))
+        print('size: snapshot {:.1f} MB, JSON {:.1f} MB'.format(
+            os.path.getsize(path) / 1024.0 / 1024, len(payload) / 1024.0 / 1024))
+        print('export: {:.3f} s'.format(exported))
+        print('open snapshot: {:.5f} s'.format(opened))
+        print('read one record: {:.5f} s'.format(single))
+        print('decode all records: snapshot {:.3f} s, JSON {:.3f} s'.format(decoded, json_decoded))
+        snapshot.close()
+    finally:
+        shutil.rmtree(directory)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Warm start benchmark for `SQLiteStore`.
+
+Fill a store with a synthetic account and measure how long it takes a new
+process to get `user.tasks()` from it, compared to decoding the same payload
+as it comes from the API (network time excluded):
+
+    $ python benchmarks/store_startup.py --tasks 50000
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from anydo_api.store import SQLiteStore # pylint: disable=wrong-import-position
+from anydo_api.task import Task # pylint: disable=wrong-import-position
+from anydo_api.user import User # pylint: disable=wrong-import-position
+
+def fake_tasks(count):
+    """Return a list of task dicts looking like the API ones."""
+    return [{
+        'id': 'task-{}'.format(index),
+        'globalTaskId': 'task-{}'.format(index),
+        'title': 'Task number {}'.format(index),
+        'note': 'some note\nanother line',
+        'status': 'UNCHECKED',
+        'priority': 'Normal',
+        'categoryId': 'category-{}'.format(index % 20),
+        'parentGlobalTaskId': 'task-{}'.format(index - 1) if index % 5 else None,
+        'dueDate': 1445256000000 + index,
+        'creationDate': 1445255241000,
+        'lastUpdateDate': 1445265686000,
+        'assignedTo': 'me@xxx.xxx',
+        'repeatingMethod': 'TASK_REPEAT_OFF',
+        'sharedMembers': None,
+        'subTasks': [],
+        'participants': [],
+        'alert': {'type': 'NONE', 'offset': 0},
+    } for index in range(count)]
+
+class NoNetwork(object): # pylint: disable=too-few-public-methods
+    """Session placeholder, revalidation requests fail fast."""
+
+    def __getattr__(self, name):
+        raise RuntimeError('no network in benchmark')
+
+def main():
+    """Entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--tasks', type=int, default=50000)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, 'anydo.db')
+        payload = json.dumps(fake_tasks(args.tasks))
+        SQLiteStore(path).save_tasks('me', json.loads(payload), replace=True)
+
+        started = time.time()
+        user = User(data_dict={'id': 'me'}, session=NoNetwork())
+        tasks = [Task(data_dict=task, user=user) for task in json.loads(payload)]
+        decoded = time.time() - started
+
+        started = time.time()
+        user = User(data_dict={'id': 'me'}, session=NoNetwork())
+        user.use_store(SQLiteStore(path))
+        tasks = user.tasks()
+        warm = time.time() - started
+
+        print('{} tasks, {:.1f} MB of JSON'.format(len(tasks), len(payload) / 1024.0 / 1024))
+        print('decode API payload: {:.3f} s (plus network transfer)'.format(decoded))
+        print('warm start from store: {:.3f} s'.format(warm))
+    finally:
+        shutil.rmtree(directory)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Multi-threaded stress benchmark for a shared `User`.
+
+Reader threads keep listing tasks and reading their fields while one thread
+saves changes and another one refreshes the cache over a slow fake API.
+Reads per second are compared with the same workload behind one global lock:
+
+    $ python benchmarks/thread_stress.py --readers 8 --seconds 3
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from anydo_api.user import User # pylint: disable=wrong-import-position
+from store_startup import fake_tasks # pylint: disable=wrong-import-position
+
+class SlowSession(object): # pylint: disable=too-few-public-methods
+    """Fake session answering after `latency` seconds."""
+
+    shared_adapter = 'none' # keeps the library from mounting adapters and closing the session
+
+    def __init__(self, tasks, latency):
+        self.tasks = tasks
+        self.latency = latency
+
+    def __getattr__(self, method):
+        if method not in ('get', 'put'):
+            raise AttributeError(method)
+
+        def call(url, **kwargs):
+            """Sleep like a network call, answer with tasks or echo the payload."""
+            time.sleep(self.latency)
+            return FakeResponse(kwargs['json'] if method == 'put' else [dict(t) for t in self.tasks])
+        return call
+
+class FakeResponse(object): # pylint: disable=too-few-public-methods
+    """Successful response with json data."""
+
+    status_code = 200
+
+    def __init__(self, data):
+        self.data = data
+
+    def json(self):
+        """Return the data."""
+        return self.data
+
+    def raise_for_status(self):
+        """Never fails."""
+        pass
+
+def run(readers, seconds, tasks, latency, guard):
+    """Run the workload, every operation is wrapped into `guard()`, return reads per second."""
+    user = User(data_dict={'id': 'me'}, session=SlowSession(tasks, latency))
+    user.tasks()
+    stop = threading.Event()
+    reads = [0] * readers
+
+    def read(index):
+        """Reader thread."""
+        while not stop.is_set():
+            with guard():
+                for task in user.tasks()[:50]:
+                    task.title # pylint: disable=pointless-statement
+            reads[index] += 1
+
+    def write():
+        """Writer thread, saves a task over the slow API."""
+        counter = 0
+        while not stop.is_set():
+            with guard():
+                task = user.tasks()[counter % len(tasks)]
+                task.title = 'Changed {}'.format(counter)
+                task.save()
+            counter += 1
+
+    def refresh():
+        """Refresher thread."""
+        while not stop.is_set():
+            with guard():
+                user.tasks(refresh=True)
+
+    threads = [threading.Thread(target=read, args=(index,)) for index in range(readers)]
+    threads += [threading.Thread(target=write), threading.Thread(target=refresh)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    return sum(reads) / float(seconds)
+
+def main():
+    """Entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=3)
+    parser.add_argument('--tasks', type=int, default=500)
+    parser.add_argument('--latency', type=float, default=0.005)
+    args = parser.parse_args()
+
+    tasks = fake_tasks(args.tasks)
+    global_lock = threading.Lock()
+    fine = run(args.readers, args.seconds, tasks, args.latency, _null)
+    coarse = run(args.readers, args.seconds, tasks, args.latency, lambda: global_lock)
+
+    print('{} readers, {} tasks, {:.0f} ms API latency'.format(
+        args.readers, args.tasks, args.latency * 1000))
+    print('fine-grained locks: {:.0f} reads/s'.format(fine))
+    print('one global lock: {:.0f} reads/s'.format(coarse))
+    print('speedup: {:.1f}x'.format(fine / coarse))
+
+@contextlib.contextmanager
+def _null():
+    """No extra locking, the library takes care of it."""
+    yield
+
+if __name__ == '__main__':
+    main()
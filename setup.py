@@ -15,8 +15,7 @@ with open('HISTORY.rst') as history_file:
     history = history_file.read().replace('.. :changelog:', '')
 
 requirements = [
-    'requests>=2.8.0',
-    'six>=1.10.0'
+    'requests>=2.8.0'
 ]
 
 test_requirements = [
@@ -24,7 +23,7 @@ test_requirements = [
 ]
 
 extras_require = {
-    ':python_version in "2.7"': ['contextlib2', 'mock'],
+    ':python_version in "2.7"': ['contextlib2', 'mock', 'futures'],
 }
 
 setup(
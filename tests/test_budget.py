@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_budget
+----------------------------------
+
+Tests for `budget` module.
+"""
+
+import unittest
+import warnings
+
+from tests.test_helper import FakeResponse, FakeSession
+
+import anydo_api
+from anydo_api import budget
+from anydo_api import errors
+from anydo_api import parallel
+from anydo_api.constants import CONSTANTS
+from anydo_api.task import Task
+from anydo_api.user import User
+
+def responder(method, url, **kwargs):
+    if url == CONSTANTS.get('CATEGORIES_URL'):
+        return FakeResponse(json_data=[
+            {'id': 'default', 'name': 'Personal', 'isDefault': True, 'isDeleted': False}
+        ])
+    return FakeResponse(json_data=[{'id': 'task', 'title': 'A', 'status': 'UNCHECKED',
+                                    'categoryId': 'default', 'parentGlobalTaskId': None}])
+
+class TestRequestBudget(unittest.TestCase):
+    def setUp(self):
+        self.session = FakeSession(responder)
+        self.user = User(data_dict={'id': 'me'}, session=self.session)
+
+    def tearDown(self):
+        budget.set_strict(False)
+        del self.session
+        del self.user
+
+    def test_budget_is_reachable_from_the_package(self):
+        self.assertTrue(anydo_api.request_budget is budget.request_budget)
+
+    def test_calls_within_budget_are_silent(self):
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            with budget.request_budget(max_calls=2) as guard:
+                self.user.tasks()
+                self.user.categories()
+
+        self.assertEqual(2, len(guard.calls))
+        self.assertEqual([], caught)
+
+    def test_exceeded_budget_warns_with_call_site_report(self):
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            with budget.request_budget(max_calls=1):
+                for task in self.user.tasks():
+                    task.category()
+
+        self.assertEqual(1, len(caught))
+        self.assertTrue(issubclass(caught[0].category, errors.RequestBudgetWarning))
+        report = str(caught[0].message)
+        self.assertTrue('2 made' in report)
+        self.assertTrue(CONSTANTS.get('CATEGORIES_URL') in report)
+        self.assertTrue('test_budget.py' in report)
+        self.assertTrue('categories <- category' in report)
+
+    def test_calls_of_worker_threads_are_reported_from_the_caller(self):
+        self.session.responder = lambda method, url, **kwargs: FakeResponse(json_data={})
+        tasks = [Task(data_dict={'id': 'task-{}'.format(index)}, user=self.user)
+                 for index in range(3)]
+        with budget.request_budget(max_calls=10) as guard:
+            self.user.refresh_many(tasks)
+
+        self.assertEqual(3, len(guard.calls))
+        for _, _, site, chain in guard.calls:
+            self.assertTrue('test_budget.py' in site)
+            self.assertEqual('get <- refresh <- run_all <- refresh_many', chain)
+
+    def test_callbacks_of_worker_threads_are_call_sites(self):
+        def refresh(task):
+            return task.refresh()
+
+        self.session.responder = lambda method, url, **kwargs: FakeResponse(json_data={})
+        task = Task(data_dict={'id': 'task'}, user=self.user)
+        with budget.request_budget(max_calls=10) as guard:
+            parallel.run_all(refresh, [task])
+
+        self.assertTrue(' in refresh' in guard.calls[0][2])
+        self.assertEqual('get <- refresh', guard.calls[0][3])
+
+    def test_strict_budget_raises_before_the_extra_call(self):
+        with self.assertRaises(errors.RequestBudgetExceededError):
+            with budget.request_budget(max_calls=0, strict=True):
+                self.user.tasks()
+
+        self.assertEqual([], self.session.calls)
+
+    def test_global_strict_mode(self):
+        budget.set_strict()
+        with self.assertRaises(errors.RequestBudgetExceededError):
+            with budget.request_budget(max_calls=0):
+                self.user.tasks()
+
+    def test_nested_budgets_count_independently(self):
+        with budget.request_budget(max_calls=5) as outer:
+            self.user.tasks()
+            with budget.request_budget(max_calls=1) as inner:
+                self.user.categories()
+
+        self.assertEqual(2, len(outer.calls))
+        self.assertEqual(1, len(inner.calls))
+
+    def test_calls_outside_of_budget_are_not_counted(self):
+        guard = budget.request_budget(max_calls=0, strict=True)
+        with guard:
+            pass
+        self.user.tasks()
+        self.assertEqual([], guard.calls)
+
+if __name__ == '__main__':
+    import sys
+    sys.exit(unittest.main())
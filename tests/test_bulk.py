@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_bulk
+----------------------------------
+
+Tests for bulk task operations of `User`.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from tests.test_helper import FakeServer, FakeSession
+
+from anydo_api import errors
+from anydo_api.constants import CONSTANTS
+from anydo_api.store import SQLiteStore
+from anydo_api.task import Task
+from anydo_api.user import User
+
+class TestBulk(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.server = FakeServer()
+        self.user = User(data_dict={'id': 'me'}, session=FakeSession(self.server.respond))
+        self.user.tasks_list = [
+            Task(data_dict={'id': 'task-{}'.format(index), 'title': 'Task', 'status': 'UNCHECKED'},
+                 user=self.user)
+            for index in range(250)
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_status_is_set_with_batched_requests(self):
+        results = self.user.set_status(self.user.tasks_list, 'DONE', batch_size=100)
+
+        batches = self.server.payloads('post')
+        self.assertEqual([100, 100, 50], sorted([len(batch) for batch in batches], reverse=True))
+        self.assertEqual(set([CONSTANTS.get('TASKS_URL')]), set(self.server.urls('post')))
+        self.assertEqual([None] * 250, [error for _, error in results])
+        self.assertTrue(all(task.status == 'DONE' and not task.is_dirty for task in self.user.tasks_list))
+
+    def test_failed_batches_are_reported_per_task(self):
+        self.server.failing.add('task-150')
+        results = self.user.set_status(self.user.tasks_list, 'CHECKED', batch_size=100)
+
+        failed = [task['id'] for task, error in results if error is not None]
+        self.assertEqual(['task-{}'.format(index) for index in range(100, 200)], failed)
+        self.assertTrue(isinstance(results[150][1], errors.InternalServerError))
+        self.assertTrue(self.user.tasks_list[150].is_dirty)
+        self.assertFalse(self.user.tasks_list[0].is_dirty)
+
+    def test_unknown_status_is_rejected_without_requests(self):
+        with self.assertRaises(errors.ModelAttributeError):
+            self.user.set_status(self.user.tasks_list, 'FINISHED')
+        self.assertEqual([], self.server.requests)
+
+    def test_destroy_many_deletes_in_parallel_and_updates_cache_once(self):
+        self.server.failing.add('task-3')
+        tasks = self.user.tasks_list[:10]
+        results = self.user.destroy_many(tasks)
+
+        self.assertEqual(10, len(self.server.urls('delete')))
+        self.assertEqual(['task-3'], [task['id'] for task, error in results if error is not None])
+        self.assertEqual(241, len(self.user.tasks_list))
+        self.assertTrue(tasks[3] in self.user.tasks_list)
+
+    def test_listeners_get_a_single_bulk_notification(self):
+        store = SQLiteStore(os.path.join(self.directory, 'anydo.db'))
+        self.user.use_store(store)
+        view = self.user.tasks_view()
+
+        self.user.set_status(self.user.tasks_list[:100], 'DONE')
+        self.user.destroy_many(self.user.tasks_list[200:])
+
+        fresh = self.user.tasks_view()
+        self.assertEqual(view.version + 2, fresh.version)
+        self.assertEqual(200, len(fresh))
+        self.assertEqual('DONE', fresh[0]['status'])
+        self.assertEqual(['DONE'] * 100, [task['status'] for task in store.load_tasks('me')])
+
+if __name__ == '__main__':
+    import sys
+    sys.exit(unittest.main())
@@ -216,6 +216,8 @@ class TestCategory(TestCase):
 
     def test_category_could_be_added_to_category(self):
         category = self.__get_category()
+        with vcr.use_cassette('fixtures/vcr_cassettes/tasks.json'):
+            category.user.tasks()
 
         with vcr.use_cassette('fixtures/vcr_cassettes/task_create_valid.json'):
             task = Task.create(user=category.user,
@@ -234,6 +236,8 @@ class TestCategory(TestCase):
         with vcr.use_cassette('fixtures/vcr_cassettes/categories.json'):
             categories = self.get_me().categories()
         category = categories[0] if not categories[0].isDefault else categories[1]
+        with vcr.use_cassette('fixtures/vcr_cassettes/tasks.json'):
+            category.user.tasks()
 
         with vcr.use_cassette('fixtures/vcr_cassettes/task_create_valid.json'):
             task = Task.create(user=category.user,
@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_category_bulk
+----------------------------------
+
+Tests for bulk task moves and cascading deletion of `Category`.
+"""
+
+import unittest
+
+from tests.test_helper import FakeResponse, FakeServer, FakeSession
+
+from anydo_api import errors
+from anydo_api.category import Category
+from anydo_api.constants import CONSTANTS
+from anydo_api.task import Task
+from anydo_api.user import User
+from anydo_api.write_behind import WriteBehind
+
+class TestCategoryBulk(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeServer()
+        self.user = User(data_dict={'id': 'me'}, session=FakeSession(self.server.respond))
+        self.personal, self.work = self.user.categories_list = [
+            Category(data_dict={'id': 'personal', 'name': 'Personal', 'isDefault': True,
+                                'isDeleted': False}, user=self.user),
+            Category(data_dict={'id': 'work', 'name': 'Work', 'isDefault': False,
+                                'isDeleted': False}, user=self.user),
+        ]
+        self.user.tasks_list = [
+            Task(data_dict={'id': 'task-{}'.format(index), 'title': 'Task', 'status': 'UNCHECKED',
+                            'categoryId': 'work' if index % 3 else 'personal'}, user=self.user)
+            for index in range(150)
+        ]
+        self.user._tasks_coverage = frozenset(['deleted', 'done'])
+
+    def test_all_tasks_are_moved_with_batched_requests(self):
+        results = self.work.move_all_tasks(to=self.personal, batch_size=50)
+
+        self.assertEqual(['post', 'post'], self.server.methods())
+        self.assertEqual(100, len(results))
+        self.assertEqual([], self.work.tasks())
+        self.assertEqual(150, len(self.personal.tasks()))
+        self.assertFalse(any(task.is_dirty for task in self.user.tasks_list))
+
+    def test_cascade_moves_tasks_to_default_category_before_deletion(self):
+        self.work.destroy(cascade='move_to_default')
+
+        self.assertEqual('delete', self.server.methods()[-1])
+        self.assertEqual(CONSTANTS.get('CATEGORIES_URL') + '/work', self.server.requests[-1][1])
+        self.assertEqual([self.personal], self.user.categories())
+        self.assertEqual(150, len(self.personal.tasks()))
+
+    def test_done_and_deleted_tasks_follow_the_category(self):
+        done, deleted = [
+            Task(data_dict={'id': status, 'title': 'Task', 'status': status, 'categoryId': 'work'},
+                 user=self.user)
+            for status in ('DONE', 'DELETED')
+        ]
+        self.user.tasks_list = self.user.tasks_list + [done, deleted]
+
+        self.work.destroy(cascade='move_to_default')
+        self.assertEqual(['personal', 'personal'], [done.categoryId, deleted.categoryId])
+
+        self.server.requests = []
+        self.personal.isDefault = False
+        self.personal.destroy(cascade='delete')
+        deleted_urls = self.server.urls('delete')
+        self.assertTrue(CONSTANTS.get('TASKS_URL') + '/DONE' in deleted_urls)
+        self.assertTrue(CONSTANTS.get('TASKS_URL') + '/DELETED' not in deleted_urls)
+
+    def test_cascade_deletes_tasks(self):
+        self.work.destroy(cascade='delete')
+
+        self.assertEqual(101, self.server.methods().count('delete'))
+        self.assertEqual(50, len(self.user.tasks_list))
+        self.assertEqual([self.personal], self.user.categories())
+
+    def test_category_is_kept_when_tasks_fail(self):
+        self.server.failing.add('task-1')
+
+        with self.assertRaises(errors.ModelError):
+            self.work.destroy(cascade='delete')
+
+        self.assertEqual(100, self.server.methods().count('delete'))
+        self.assertEqual([self.personal, self.work], self.user.categories())
+        self.assertEqual(['task-1'], [task['id'] for task in self.work.tasks()])
+
+    def test_default_category_can_not_be_emptied_into_itself(self):
+        with self.assertRaises(errors.ModelError):
+            self.personal.destroy(cascade='move_to_default')
+        with self.assertRaises(errors.ModelAttributeError):
+            self.work.destroy(cascade='archive')
+        self.assertEqual([], self.server.requests)
+
+    def test_task_is_removed_into_default_category(self):
+        task = self.work.tasks()[0]
+        self.work.remove_task(task)
+
+        self.assertEqual('personal', task.categoryId)
+        with self.assertRaises(errors.ModelError):
+            self.personal.remove_task(task)
+
+    def test_default_category_is_switched_with_concurrent_requests(self):
+        self.assertTrue(self.user.default_category() is self.personal)
+        self.work.mark_default()
+
+        self.assertEqual(2, len(self.server.payloads('put')))
+        self.assertTrue(self.user.default_category() is self.work)
+        self.assertFalse(self.personal.isDefault or self.personal.is_dirty)
+
+    def test_default_category_switch_is_rolled_back_on_failure(self):
+        self.server.failing.add('work')
+
+        with self.assertRaises(errors.InternalServerError):
+            self.work.mark_default()
+
+        self.assertTrue(self.user.default_category() is self.personal)
+        self.assertTrue(self.personal.isDefault)
+        self.assertFalse(self.work.isDefault or self.work.is_dirty)
+        personal_puts = [data for data in self.server.payloads('put') if data['id'] == 'personal']
+        self.assertEqual([False, True], [data['isDefault'] for data in personal_puts])
+
+    def test_default_category_switch_bypasses_write_behind(self):
+        self.server.failing.add('work')
+        with WriteBehind(delay=60) as queue:
+            self.user.use_write_behind(queue)
+            with self.assertRaises(errors.InternalServerError):
+                self.work.mark_default()
+            self.assertEqual(0, len(queue))
+
+        self.assertTrue(self.user.default_category() is self.personal)
+        personal_puts = [data for data in self.server.payloads('put') if data['id'] == 'personal']
+        self.assertEqual([False, True], [data['isDefault'] for data in personal_puts])
+
+    def test_failed_rollback_keeps_the_original_error(self):
+        self.server.failing.add('work')
+        original = self.server.respond
+
+        def respond(method, url, **kwargs):
+            data = kwargs.get('json') or {}
+            if method == 'put' and data.get('id') == 'personal' and data.get('isDefault'):
+                return FakeResponse(status_code=400)
+            return original(method, url, **kwargs)
+
+        self.user.session_obj.responder = respond
+        with self.assertRaises(errors.InternalServerError):
+            self.work.mark_default()
+
+        self.assertTrue(self.personal.isDefault and self.personal.is_dirty)
+
+    def test_default_category_is_not_scanned_again(self):
+        self.user.default_category()
+        self.user.categories_list = [self.work]
+
+        self.assertTrue(self.user.default_category() is self.personal)
+        self.personal.isDefault = False
+        self.assertEqual(None, self.user.default_category())
+
+if __name__ == '__main__':
+    import sys
+    sys.exit(unittest.main())
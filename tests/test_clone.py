@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_clone
+----------------------------------
+
+Tests for cloning task subtrees.
+"""
+
+import unittest
+
+from tests.test_helper import FakeResponse, FakeServer, FakeSession, task_data
+
+from anydo_api import errors
+from anydo_api.category import Category
+from anydo_api.task import Task
+from anydo_api.user import User
+
+def stored_task(task_id, parent_id=None, status='UNCHECKED'):
+    return task_data(task_id, 'Title ' + task_id, status, parent_id, globalTaskId=task_id,
+                     categoryId='personal', creationDate=1445255241000, sharedMembers=None)
+
+class CloneServer(FakeServer):
+    """Creates tasks, rejects a child posted before its parent."""
+
+    def __init__(self):
+        FakeServer.__init__(self)
+        self.known = set(['root', 'a', 'a1', 'b'])
+        self.fail_depth = None
+
+    def answer(self, method, url, **kwargs):
+        batch = kwargs['json']
+        with self.lock:
+            if self.fail_depth is not None and len(self.payloads('post')) > self.fail_depth:
+                return FakeResponse(status_code=500)
+            for task in batch:
+                parent_id = task.get('parentGlobalTaskId')
+                if parent_id is not None and parent_id not in self.known:
+                    return FakeResponse(status_code=400)
+            self.known.update(task['id'] for task in batch)
+        return FakeResponse(json_data=batch)
+
+class TestClone(unittest.TestCase):
+    def setUp(self):
+        self.server = CloneServer()
+        self.user = User(data_dict={'id': 'me'}, session=FakeSession(self.server.respond))
+        self.user.tasks_list = [
+            Task(data_dict=data, user=self.user)
+            for data in (stored_task('root'), stored_task('a', 'root'), stored_task('a1', 'a'),
+                         stored_task('b', 'root'))
+        ]
+        self.root = self.user.tasks_list[0]
+
+    def test_subtree_is_created_level_by_level(self):
+        clone = self.root.clone()
+
+        self.assertEqual([1, 2, 1], [len(batch) for batch in self.server.payloads('post')])
+        self.assertEqual(['Title root', 'Title a', 'Title a1', 'Title b'],
+                         [task.title for task in [clone] + clone.descendants()])
+        self.assertFalse(clone['id'] in ('root', 'a', 'a1', 'b'))
+        self.assertEqual(clone['id'], clone['globalTaskId'])
+        self.assertFalse('creationDate' in clone.data_dict)
+        self.assertEqual(8, len(self.user.tasks_list))
+        self.assertEqual(3, len(self.root.descendants()))
+
+    def test_clone_could_be_shallow_and_go_into_another_category(self):
+        work = Category(data_dict={'id': 'work', 'name': 'Work'}, user=self.user)
+        clone = self.root.clone(deep=False, into_category=work)
+
+        self.assertEqual([1], [len(batch) for batch in self.server.payloads('post')])
+        self.assertEqual('work', clone.categoryId)
+        self.assertEqual([], clone.descendants())
+
+    def test_wide_levels_are_split_into_batches(self):
+        for index in range(5):
+            self.user.add_task(Task(data_dict=stored_task('c{}'.format(index), 'root'), user=self.user))
+        self.root.clone(batch_size=3)
+
+        self.assertEqual([1, 1, 1, 3, 3], sorted(len(batch) for batch in self.server.payloads('post')))
+
+    def test_deleted_and_done_subtasks_are_not_copied(self):
+        for data in (stored_task('gone', 'a', 'DELETED'), stored_task('gone1', 'gone'),
+                     stored_task('done', 'root', 'DONE')):
+            self.user.add_task(Task(data_dict=data, user=self.user))
+
+        clone = self.root.clone()
+        self.assertEqual(['Title a', 'Title a1', 'Title b'],
+                         [task.title for task in clone.descendants(include_deleted=True)])
+
+        clone = self.root.clone(include_done=True)
+        self.assertEqual(['Title a', 'Title a1', 'Title b', 'Title done'],
+                         [task.title for task in clone.descendants(include_deleted=True)])
+
+    def test_created_tasks_are_kept_on_failure(self):
+        self.server.fail_depth = 1
+
+        with self.assertRaises(errors.InternalServerError):
+            self.root.clone()
+
+        self.assertEqual(5, len(self.user.tasks_list))
+
+if __name__ == '__main__':
+    import sys
+    sys.exit(unittest.main())
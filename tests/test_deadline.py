@@ -0,0 +1,221 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_deadline
+----------------------------------
+
+Tests for `deadlines` module.
+"""
+
+import threading
+import time
+import unittest
+
+try:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+except ImportError:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+
+import requests
+
+from tests.test_helper import FakeResponse, FakeSession
+
+import anydo_api
+from anydo_api import deadlines
+from anydo_api import errors
+from anydo_api import parallel
+from anydo_api import request
+from anydo_api.constants import CONSTANTS, DEFAULT_TIMEOUT, TIMEOUTS
+
+TASK_URL = CONSTANTS.get('TASKS_URL') + '/task'
+
+class SlowServer(ThreadingMixIn, HTTPServer):
+    """Local server sleeping on `/slow`, failing with 500 on `/error`."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        HTTPServer.__init__(self, ('127.0.0.1', 0), SlowHandler)
+        self.hits = []
+        self.url = 'http://127.0.0.1:{}'.format(self.server_address[1])
+
+class SlowHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.hits.append(self.path)
+        if self.path == '/slow':
+            time.sleep(1)
+        status = 500 if self.path == '/error' else 200
+        try:
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', '2')
+            self.end_headers()
+            self.wfile.write(b'{}')
+        except (IOError, OSError):
+            pass
+
+    def log_message(self, *args):
+        pass
+
+class TestDeadlineRetries(unittest.TestCase):
+    def setUp(self):
+        self.server = SlowServer()
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def assert_deadline_is_kept(self, session):
+        started = time.time()
+        with anydo_api.deadline(0.3):
+            with self.assertRaises(errors.DeadlineExceededError):
+                request.get(url=self.server.url + '/slow', session=session)
+
+        self.assertTrue(time.time() - started < 0.8)
+        self.assertEqual(['/slow'], self.server.hits)
+
+    def test_timed_out_request_is_not_retried_past_the_deadline(self):
+        self.assert_deadline_is_kept(None)
+
+    def test_shared_adapter_does_not_retry_past_the_deadline(self):
+        self.assert_deadline_is_kept(request.new_session(adapter=request.new_adapter()))
+
+    def test_server_errors_are_retried_while_the_deadline_covers_another_attempt(self):
+        with self.assertRaises(requests.exceptions.RetryError):
+            request.get(url=self.server.url + '/error')
+        self.assertEqual(3, len(self.server.hits))
+
+        with anydo_api.deadline(60):
+            with self.assertRaises(requests.exceptions.RetryError):
+                request.get(url=self.server.url + '/error', timeout=1)
+        self.assertEqual(6, len(self.server.hits))
+
+        with anydo_api.deadline(1.5):
+            with self.assertRaises(errors.InternalServerError):
+                request.get(url=self.server.url + '/error', timeout=1)
+        self.assertEqual(7, len(self.server.hits))
+
+class TestDeadline(unittest.TestCase):
+    def setUp(self):
+        self.session = FakeSession()
+
+    def tearDown(self):
+        del self.session
+
+    def timeouts(self):
+        return [kwargs['timeout'] for _, _, kwargs in self.session.calls]
+
+    def test_deadline_is_reachable_from_the_package(self):
+        self.assertTrue(anydo_api.deadline is deadlines.deadline)
+
+    def test_requests_use_per_endpoint_defaults(self):
+        request.get(url=TASK_URL, session=self.session)
+        request.get(url=CONSTANTS.get('TASKS_URL'), session=self.session)
+
+        self.assertEqual(
+            [DEFAULT_TIMEOUT, TIMEOUTS[('get', CONSTANTS.get('TASKS_URL'))]],
+            self.timeouts()
+        )
+
+    def test_explicit_timeout_is_kept(self):
+        request.get(url=TASK_URL, session=self.session, timeout=7)
+
+        self.assertEqual([7], self.timeouts())
+
+    def test_timeouts_are_cut_to_the_time_left(self):
+        with anydo_api.deadline(1):
+            request.get(url=TASK_URL, session=self.session)
+
+        connect, read = self.timeouts()[0]
+        self.assertTrue(0 < connect <= 1)
+        self.assertTrue(0 < read <= 1)
+
+    def test_nested_deadline_only_shortens_the_outer_one(self):
+        with anydo_api.deadline(0.5):
+            with anydo_api.deadline(60):
+                self.assertTrue(deadlines.remaining() <= 0.5)
+                request.get(url=TASK_URL, session=self.session)
+            with anydo_api.deadline(0.2):
+                request.get(url=TASK_URL, session=self.session)
+
+        outer, inner = self.timeouts()
+        self.assertTrue(max(outer) <= 0.5)
+        self.assertTrue(max(inner) <= 0.2)
+        self.assertEqual(None, deadlines.remaining())
+
+    def test_request_after_the_deadline_is_not_sent(self):
+        with anydo_api.deadline(0.01):
+            time.sleep(0.02)
+            with self.assertRaises(errors.DeadlineExceededError):
+                request.get(url=TASK_URL, session=self.session)
+
+        self.assertEqual([], self.session.calls)
+
+    def test_cancelled_deadline_stops_following_requests(self):
+        with anydo_api.deadline() as limit:
+            request.get(url=TASK_URL, session=self.session)
+            self.assertEqual(DEFAULT_TIMEOUT, self.timeouts()[0])
+            limit.cancel()
+            self.assertTrue(limit.expired())
+            with self.assertRaises(errors.DeadlineExceededError):
+                request.get(url=TASK_URL, session=self.session)
+
+        self.assertEqual(1, len(self.session.calls))
+
+    def test_timeout_cut_by_deadline_is_reported_as_deadline(self):
+        def responder(method, url, **kwargs):
+            timeout = kwargs['timeout']
+            time.sleep(timeout[1] if isinstance(timeout, tuple) else timeout)
+            raise requests.exceptions.ReadTimeout()
+
+        self.session = FakeSession(responder)
+        with anydo_api.deadline(0.05):
+            with self.assertRaises(errors.DeadlineExceededError):
+                request.get(url=TASK_URL, session=self.session)
+
+        with self.assertRaises(requests.exceptions.ReadTimeout):
+            request.get(url=TASK_URL, session=self.session, timeout=0.01)
+
+    def test_retry_after_reauthentication_checks_the_deadline(self):
+        self.session = FakeSession(lambda method, url, **kwargs: FakeResponse(status_code=401))
+        limit = anydo_api.deadline()
+
+        def reauthenticate():
+            limit.cancel()
+            return True
+
+        self.session.reauthenticate = reauthenticate
+        with limit:
+            with self.assertRaises(errors.DeadlineExceededError):
+                request.get(url=TASK_URL, session=self.session)
+
+        self.assertEqual(1, len(self.session.calls))
+
+    def test_deadline_propagates_to_worker_threads(self):
+        started = threading.Event()
+
+        def call(index):
+            if index:
+                started.wait(5)
+            else:
+                limit.cancel()
+                started.set()
+            return request.get(url=TASK_URL, session=self.session)
+
+        with anydo_api.deadline(60) as limit:
+            finished = parallel.run_all(call, range(4), max_workers=4)
+
+        self.assertTrue(all(
+            isinstance(future.exception(), errors.DeadlineExceededError) for future in finished
+        ))
+        self.assertEqual([], self.session.calls)
+
+if __name__ == '__main__':
+    import sys
+    sys.exit(unittest.main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_forest
+----------------------------------
+
+Tests for the `TaskForest` tree of tasks and subtree operations.
+"""
+
+import unittest
+
+from tests.test_helper import FakeServer, FakeSession, task_data
+
+from anydo_api.category import Category
+from anydo_api.task import Task
+from anydo_api.user import User
+
+def tree_task(task_id, parent_id=None, status='UNCHECKED'):
+    return task_data(task_id, status=status, parent_id=parent_id, categoryId='personal')
+
+class TestForest(unittest.TestCase):
+    def setUp(self):
+        # root -> a -> a1 -> a11, root -> b (done), other
+        self.server = FakeServer([tree_task('a1', 'a'), tree_task('root'), tree_task('a', 'root'),
+                                  tree_task('b', 'root', status='DONE'), tree_task('a11', 'a1'),
+                                  tree_task('other')])
+        self.user = User(data_dict={'id': 'me'}, session=FakeSession(self.server.respond))
+        self.tasks = dict((task['id'], task) for task in self.user.tasks(include_done=True))
+
+    def writes(self):
+        return [(method, json) for method, _, json in self.server.requests if method != 'get']
+
+    def ids(self, tasks):
+        return [task['id'] for task in tasks]
+
+    def test_tree_is_walked_without_scanning(self):
+        root = self.tasks['root']
+
+        self.assertEqual(['a', 'a1', 'a11', 'b'], self.ids(root.descendants()))
+        self.assertEqual(['a1', 'a', 'root'], self.ids(self.tasks['a11'].ancestors()))
+        self.assertEqual([0, 3], [root.depth(), self.tasks['a11'].depth()])
+        self.assertEqual(5, root.subtree_size())
+        self.assertEqual(['other', 'root'], sorted(self.ids(self.user.forest().roots())))
+
+    def test_subtasks_and_parent_keep_default_filtering(self):
+        self.assertEqual(['a'], self.ids(self.tasks['root'].subtasks()))
+        self.assertTrue(self.tasks['a'].parent() is self.tasks['root'])
+        self.assertEqual(None, self.tasks['root'].parent())
+
+    def test_forest_follows_saves_creates_and_deletions(self):
+        self.tasks['root'].descendants()
+        self.tasks['a1']['parentGlobalTaskId'] = 'other'
+        self.tasks['a1'].save()
+        created = Task.create(user=self.user, title='new', status='UNCHECKED',
+                              parentGlobalTaskId='root')
+        self.tasks['a'].destroy()
+
+        self.assertEqual(['b', created['id']], self.ids(self.tasks['root'].descendants()))
+        self.assertEqual(['a1', 'a11'], self.ids(self.tasks['other'].descendants()))
+
+    def test_subtree_operations_are_batched(self):
+        results = self.tasks['a'].complete_subtree()
+        self.assertEqual([None] * 3, [error for _, error in results])
+        self.assertEqual(1, len(self.writes()))
+        self.assertEqual(['DONE'] * 3, [task['status'] for task in self.writes()[0][1]])
+
+        work = Category(data_dict={'id': 'work', 'name': 'Work'}, user=self.user)
+        self.tasks['root'].move_subtree(work)
+        self.assertEqual(2, len(self.writes()))
+        self.assertEqual(['work'] * 5, [task['categoryId'] for task in self.writes()[1][1]])
+
+        self.tasks['root'].destroy_subtree()
+        self.assertEqual(5, len([write for write in self.writes() if write[0] == 'delete']))
+        self.assertEqual(['other'], self.ids(self.user.forest().roots()))
+
+    def test_deleted_subtasks_are_left_out_of_subtree_operations(self):
+        self.server.tasks.extend([tree_task('gone', 'a', status='DELETED'),
+                                  tree_task('gone1', 'gone')])
+        self.user.tasks(include_deleted=True, include_done=True)
+        root = self.user.forest().task('root')
+
+        self.assertEqual(['a', 'a1', 'a11', 'b'], self.ids(root.descendants()))
+        self.assertEqual(['a', 'a1', 'a11', 'gone', 'gone1', 'b'],
+                         self.ids(root.descendants(include_deleted=True)))
+        self.assertEqual(5, root.subtree_size())
+
+        root.complete_subtree()
+        self.assertEqual([('root', 'DONE'), ('a', 'DONE'), ('a1', 'DONE'), ('a11', 'DONE')],
+                         [(task['id'], task['status']) for task in self.writes()[-1][1]])
+
+        root.destroy_subtree()
+        self.assertEqual(5, len([write for write in self.writes() if write[0] == 'delete']))
+
+if __name__ == '__main__':
+    import sys
+    sys.exit(unittest.main())
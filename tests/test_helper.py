@@ -4,6 +4,12 @@
 import vcr
 import json
 import os
+import threading
+import time
+
+import requests
+
+from anydo_api.constants import CONSTANTS
 
 vcr = vcr.VCR(
     serializer='json',
@@ -44,3 +50,143 @@ def scrub_string(string, replacement='******'):
         return response
     return before_record_response
 
+
+class FakeResponse(object):
+    """
+    Minimal stand-in for `requests.Response` used by offline tests.
+    """
+    def __init__(self, status_code=200, json_data=None):
+        self.status_code = status_code
+        self.json_data = json_data
+        self.content = json.dumps(json_data).encode('utf-8')
+
+    def json(self):
+        return self.json_data
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(str(self.status_code))
+
+class FakeSession(object):
+    """
+    Offline session: answers every call through `responder(method, url, **kwargs)`
+    and keeps a log of all calls made.
+    """
+    def __init__(self, responder=None):
+        self.responder = responder or (lambda method, url, **kwargs: FakeResponse(json_data={}))
+        self.calls = []
+        self.cookies = requests.cookies.RequestsCookieJar()
+
+    def mount(self, prefix, adapter):
+        pass
+
+    def close(self):
+        pass
+
+    def __getattr__(self, method):
+        if method not in ('get', 'post', 'put', 'delete'):
+            raise AttributeError(method)
+
+        def call(url, **kwargs):
+            self.calls.append((method, url, kwargs))
+            return self.responder(method, url, **kwargs)
+        return call
+
+def task_data(task_id, title=None, status='UNCHECKED', parent_id=None, **fields):
+    """Return the API data of a task, `fields` are added as they are."""
+    data = {'id': task_id, 'title': task_id if title is None else title, 'status': status,
+            'parentGlobalTaskId': parent_id}
+    data.update(fields)
+    return data
+
+class FakeServer(object):
+    """
+    Offline API for `FakeSession(server.respond)` keeping tasks, categories and pending tasks.
+
+    GET requests are answered from the kept lists, the tasks collection according to
+    include flags; writes echo their json. Every request is logged in `requests` as
+    `(method, url, json)` and waits at the `gate`. Requests naming an id from `failing`
+    in the url or the json fail with 500, statuses queued in `failures` are answered
+    first. Subclasses change the answers in `answer`.
+    """
+
+    def __init__(self, tasks=None, categories=None, pending=None, delay=0):
+        self.tasks = list(tasks or [])
+        self.categories = list(categories or [])
+        self.pending = list(pending or [])
+        self.delay = delay
+        self.requests = []
+        self.failing = set()
+        self.failures = []
+        self.gate = threading.Event()
+        self.gate.set()
+        self.entered = threading.Event()
+        self.running = 0
+        self.max_running = 0
+        self.lock = threading.Lock()
+
+    def respond(self, method, url, **kwargs):
+        with self.lock:
+            self.requests.append((method, url, kwargs.get('json')))
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        self.entered.set()
+        try:
+            self.gate.wait()
+            if self.delay:
+                time.sleep(self.delay)
+            with self.lock:
+                failure = self.failures.pop(0) if self.failures else None
+            if failure is not None:
+                return FakeResponse(status_code=failure)
+            if self.failing.intersection(url.split('/') + ids_of(kwargs.get('json'))):
+                return FakeResponse(status_code=500)
+            return self.answer(method, url, **kwargs)
+        finally:
+            with self.lock:
+                self.running -= 1
+
+    def answer(self, method, url, **kwargs):
+        if method != 'get':
+            return FakeResponse(json_data=kwargs.get('json'))
+        if url == CONSTANTS.get('TASKS_URL'):
+            params = kwargs.get('params') or {}
+            hidden = [status for status, flag in (('DELETED', 'includeDeleted'),
+                                                  ('DONE', 'includeDone'))
+                      if params.get(flag) == 'false']
+            return FakeResponse(json_data=[dict(task) for task in self.tasks
+                                           if task.get('status') not in hidden])
+        if url == CONSTANTS.get('CATEGORIES_URL'):
+            return FakeResponse(json_data=[dict(category) for category in self.categories])
+        if url.endswith('/pending'):
+            return FakeResponse(json_data={'pendingTasks': [dict(task) for task in self.pending]})
+        record_id = url.rsplit('/', 1)[1]
+        for records in (self.tasks, self.categories):
+            for record in records:
+                if record['id'] == record_id:
+                    return FakeResponse(json_data=dict(record))
+        return FakeResponse(status_code=404)
+
+    def task(self, task_id):
+        return next(task for task in self.tasks if task['id'] == task_id)
+
+    def methods(self):
+        return [method for method, _, _ in self.requests]
+
+    def urls(self, method=None):
+        return [url for request_method, url, _ in self.requests
+                if method in (None, request_method)]
+
+    def payloads(self, method):
+        return [json for request_method, _, json in self.requests if request_method == method]
+
+    def count(self, suffix):
+        return len([url for url in self.urls() if url.endswith(suffix)])
+
+def ids_of(payload):
+    """Return ids of the records in a request json."""
+    if isinstance(payload, list):
+        return [record['id'] for record in payload if isinstance(record, dict) and 'id' in record]
+    if isinstance(payload, dict) and 'id' in payload:
+        return [payload['id']]
+    return []
@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_lazy_imports
+----------------------------------
+
+Checks that `import anydo_api` does not pull heavy dependencies in.
+"""
+
+import subprocess
+import sys
+import unittest
+
+import anydo_api
+
+def imported_modules(statement):
+    """Return a set of top-level modules loaded after running `statement` in a clean interpreter."""
+    output = subprocess.check_output([
+        sys.executable, '-c',
+        statement + '\nimport sys\nprint(" ".join(sys.modules))'
+    ], universal_newlines=True)
+    return set(name.split('.')[0] for name in output.split())
+
+class TestLazyImports(unittest.TestCase):
+
+    @unittest.skipIf(sys.version_info < (3, 7), 'requires module level __getattr__')
+    def test_models_do_not_import_requests(self):
+        modules = imported_modules(
+            'import anydo_api\n'
+            'anydo_api.Client, anydo_api.User, anydo_api.Task, anydo_api.Category'
+        )
+        self.assertFalse('requests' in modules)
+        self.assertFalse('urllib3' in modules)
+        self.assertFalse('six' in modules)
+
+    def test_public_classes_are_reachable_from_the_package(self):
+        from anydo_api.client import Client
+        from anydo_api.user import User
+        from anydo_api.task import Task
+        from anydo_api.category import Category
+
+        self.assertTrue(anydo_api.Client is Client)
+        self.assertTrue(anydo_api.User is User)
+        self.assertTrue(anydo_api.Task is Task)
+        self.assertTrue(anydo_api.Category is Category)
+
+    def test_unknown_attributes_raise(self):
+        with self.assertRaises(AttributeError):
+            anydo_api.NotExistent
+
+if __name__ == '__main__':
+    import sys
+    sys.exit(unittest.main())
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_members
+----------------------------------
+
+Tests for the shared members index and bulk sharing.
+"""
+
+import unittest
+
+from tests.test_helper import FakeResponse, FakeServer, FakeSession, task_data
+
+from anydo_api.task import Task
+from anydo_api.user import User
+
+def member(email, status='ACCEPTED'):
+    return {'target': email, 'name': email.split('@')[0], 'status': status}
+
+class MembersServer(FakeServer):
+    """Keeps task members, adds invitees as pending ones on share."""
+
+    def answer(self, method, url, **kwargs):
+        if method != 'post':
+            return FakeServer.answer(self, method, url, **kwargs)
+
+        with self.lock:
+            task = self.task(url.split('/')[-2])
+            task['sharedMembers'] = (task['sharedMembers'] or []) + [
+                member(invitee['email'], 'PENDING') for invitee in kwargs['json']['invitees']
+            ]
+            return FakeResponse(json_data=dict(task))
+
+class TestMembers(unittest.TestCase):
+    def setUp(self):
+        self.server = MembersServer([
+            task_data('a', 'A', sharedMembers=[member('me@xxx.xxx', 'CREATOR'),
+                                               member('Alice@xxx.xxx')]),
+            task_data('b', 'B', sharedMembers=None),
+            task_data('c', 'C', sharedMembers=[member('bob@xxx.xxx')]),
+        ])
+        self.server.failing.add('broken')
+        self.user = User(data_dict={'id': 'me', 'email': 'me@xxx.xxx'},
+                         session=FakeSession(self.server.respond))
+
+    def ids(self, email):
+        return [task['id'] for task in self.user.tasks_shared_with(email)]
+
+    def test_tasks_are_found_by_member_email(self):
+        self.assertEqual(['a'], self.ids('alice@xxx.xxx'))
+        self.assertEqual(['c'], self.ids('BOB@xxx.xxx'))
+        self.assertEqual([], self.ids('nobody@xxx.xxx'))
+
+    def test_tasks_are_shared_with_all_members_in_one_request_per_task(self):
+        tasks = [task for task in self.user.tasks() if task['id'] in ('b', 'c')]
+        results = self.user.share_many(tasks, [{'email': 'alice@xxx.xxx'}, {'email': 'dan@xxx.xxx'}],
+                                       message='Have a look')
+
+        self.assertEqual([None, None], [error for _, error in results])
+        self.assertEqual(2, len(self.server.payloads('post')))
+        self.assertEqual([['alice@xxx.xxx', 'dan@xxx.xxx']] * 2,
+                         [[invitee['email'] for invitee in json['invitees']]
+                          for json in self.server.payloads('post')])
+        self.assertEqual(['a', 'b', 'c'], self.ids('alice@xxx.xxx'))
+        self.assertEqual(['b', 'c'], self.ids('dan@xxx.xxx'))
+
+    def test_failed_shares_are_reported_per_task(self):
+        broken = Task(data_dict={'id': 'broken', 'title': 'Broken', 'sharedMembers': None},
+                      user=self.user)
+        results = self.user.share_many([broken, self.user.tasks()[1]], [{'email': 'eve@xxx.xxx'}])
+
+        self.assertTrue(results[0][1] is not None)
+        self.assertEqual(None, results[1][1])
+        self.assertEqual(['b'], self.ids('eve@xxx.xxx'))
+
+    def test_index_follows_refresh_and_removal(self):
+        self.ids('bob@xxx.xxx')
+        self.server.task('c')['sharedMembers'] = []
+        self.user.tasks(refresh=True)
+        self.assertEqual([], self.ids('bob@xxx.xxx'))
+
+        task = self.user.tasks_shared_with('alice@xxx.xxx')[0]
+        task.destroy()
+        self.assertEqual([], self.ids('alice@xxx.xxx'))
+
+if __name__ == '__main__':
+    import sys
+    sys.exit(unittest.main())
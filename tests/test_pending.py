@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_pending
+----------------------------------
+
+Tests for pending shared tasks caching and bulk approval.
+"""
+
+import unittest
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from tests.test_helper import FakeResponse, FakeServer, FakeSession, task_data
+
+from anydo_api import errors
+from anydo_api.constants import CONSTANTS
+from anydo_api.user import User
+
+class PendingServer(FakeServer):
+    """Turns accepted pending tasks into tasks."""
+
+    def answer(self, method, url, **kwargs):
+        if not url.endswith('/accept'):
+            return FakeServer.answer(self, method, url, **kwargs)
+
+        pending_id = url.split('/')[-2]
+        with self.lock:
+            self.pending = [task for task in self.pending if task['id'] != pending_id]
+        return FakeResponse(json_data=task_data('task-' + pending_id, 'Accepted'))
+
+class TestPending(unittest.TestCase):
+    def setUp(self):
+        self.server = PendingServer([task_data('own', 'Own')], pending=[
+            {'id': 'p{}'.format(index), 'title': 'Shared {}'.format(index),
+             'invitedBy': {'email': 'alice@xxx.xxx' if index % 2 else 'bob@xxx.xxx'}}
+            for index in range(6)
+        ])
+        self.server.failing.add('p5')
+        self.user = User(data_dict={'id': 'me'}, session=FakeSession(self.server.respond))
+
+    def test_all_pending_tasks_are_approved_into_task_cache(self):
+        self.user.tasks()
+        results = self.user.approve_all_pending(max_workers=3)
+
+        self.assertEqual(6, self.server.count('/accept'))
+        self.assertEqual(['p5'], [task['id'] for task, error in results if error is not None])
+        self.assertTrue(isinstance(results[-1][1], errors.InternalServerError))
+        self.assertEqual(['own', 'task-p0', 'task-p1', 'task-p2', 'task-p3', 'task-p4'],
+                         sorted(task['id'] for task in self.user.tasks()))
+        self.assertEqual(['p5'], self.user.pending_tasks_ids())
+        self.assertEqual(1, self.server.count(CONSTANTS.get('TASKS_URL')))
+
+    def test_pending_tasks_could_be_filtered(self):
+        self.user.approve_all_pending(
+            filter=lambda task: task['invitedBy']['email'] == 'alice@xxx.xxx'
+        )
+
+        self.assertEqual(['p0', 'p2', 'p4', 'p5'], self.user.pending_tasks_ids())
+
+    def test_single_approval_updates_caches(self):
+        self.user.tasks()
+        self.user.pending_tasks()
+        self.user.approve_pending_task(pending_task_id='p0')
+
+        self.assertEqual('Accepted', self.user.tasks()[-1].title)
+        self.assertFalse('p0' in self.user.pending_tasks_ids())
+
+    def test_empty_pending_list_is_cached_until_ttl(self):
+        self.server.pending = []
+        with mock.patch('anydo_api.user.time.time', return_value=1000.0):
+            self.user.pending_tasks()
+            self.user.pending_tasks()
+        self.assertEqual(1, self.server.count('/pending'))
+
+        with mock.patch('anydo_api.user.time.time', return_value=1061.0):
+            self.user.pending_tasks()
+        self.assertEqual(2, self.server.count('/pending'))
+
+if __name__ == '__main__':
+    import sys
+    sys.exit(unittest.main())
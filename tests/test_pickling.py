@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_pickling
+----------------------------------
+
+Tests for copying and pickling of resources.
+"""
+
+import copy
+import pickle
+import unittest
+
+from tests.test_helper import FakeSession
+
+from anydo_api.category import Category
+from anydo_api.task import Task
+from anydo_api.user import User
+
+class Unpicklable(FakeSession):
+    """Session refusing to be pickled, like a real one holding sockets."""
+
+    def __reduce__(self):
+        raise TypeError('session must never be pickled')
+
+class TestPickling(unittest.TestCase):
+    def setUp(self):
+        self.user = User(data_dict={'id': 'me', 'email': 'me@xxx.xxx', 'password': 'secret'},
+                         session=Unpicklable())
+        self.task = Task(data_dict={'id': 't', 'title': 'Milk', 'status': 'UNCHECKED'}, user=self.user)
+
+    def test_copies_do_not_recurse_and_keep_the_user(self):
+        shallow = copy.copy(self.task)
+        deep = copy.deepcopy(self.task)
+
+        self.assertEqual('Milk', shallow.title)
+        self.assertTrue(deep.user is self.user)
+        deep.title = 'Bread'
+        self.assertEqual('Milk', self.task.title)
+
+    def test_half_built_resource_raises_attribute_error(self):
+        task = Task.__new__(Task)
+
+        with self.assertRaises(AttributeError):
+            task.title
+        self.assertFalse(hasattr(self.task, '__missing_protocol__'))
+
+    def test_pickled_task_carries_only_data_and_user_id(self):
+        self.task.title = 'Bread'
+        payload = pickle.dumps(self.task, protocol=2)
+
+        self.assertFalse(b'secret' in payload)
+        self.assertFalse(b'me@xxx.xxx' in payload)
+
+        restored = pickle.loads(payload)
+        self.assertEqual(self.task.data_dict, restored.data_dict)
+        self.assertTrue(restored.is_dirty)
+        self.assertTrue(restored.user is self.user)
+
+    def test_resource_is_bound_to_the_user_registered_on_receiving_side(self):
+        payload = pickle.dumps([self.task, Category(data_dict={'id': 'c', 'name': 'Home'}, user=self.user)])
+        receiver = User(data_dict={'id': 'me', 'email': 'me@xxx.xxx'}, session=FakeSession())
+
+        task, category = pickle.loads(payload)
+        self.assertTrue(task.user is receiver)
+        self.assertTrue(category.user is receiver)
+
+    def test_resource_of_unknown_user_is_unbound(self):
+        stranger = User(data_dict={'id': 'stranger'}, session=None)
+        task = Task(data_dict={'id': 't'}, user=stranger)
+
+        self.assertEqual(None, pickle.loads(pickle.dumps(task)).user)
+
+    def test_copies_of_resource_of_unknown_user_keep_the_user(self):
+        stranger = User(data_dict={'id': 'stranger'}, session=None)
+        task = Task(data_dict={'id': 't', 'tags': ['home']}, user=stranger)
+        deep = copy.deepcopy(task)
+
+        self.assertTrue(copy.copy(task).user is stranger)
+        self.assertTrue(deep.user is stranger)
+        deep.tags.append('work')
+        self.assertEqual(['home'], task.tags)
+
+    def test_pickled_user_has_no_password_and_resolves_to_registered_one(self):
+        payload = pickle.dumps(self.user)
+
+        self.assertFalse(b'secret' in payload)
+        self.assertTrue(pickle.loads(payload) is self.user)
+
+if __name__ == '__main__':
+    import sys
+    sys.exit(unittest.main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_pool
+----------------------------------
+
+Tests for `ClientPool` class.
+"""
+
+import threading
+import time
+import unittest
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from tests.test_helper import FakeResponse, FakeSession
+
+from anydo_api import errors
+from anydo_api.constants import CONSTANTS
+from anydo_api.pool import ClientPool
+
+class FakeServer(object):
+    """Answers log in and `/me` requests for any account."""
+
+    def __init__(self):
+        self.sessions = []
+        self.logins = 0
+        self.lock = threading.Lock()
+
+    def new_session(self, adapter=None):
+        session = FakeSession()
+        session.shared_adapter = adapter
+        session.responder = lambda method, url, **kwargs: self.respond(session, method, url, **kwargs)
+        self.sessions.append(session)
+        return session
+
+    def respond(self, session, method, url, **kwargs):
+        if url == CONSTANTS.get('LOGIN_URL'):
+            with self.lock:
+                self.logins += 1
+            session.email = kwargs['data']['j_username']
+            if kwargs['data']['j_password'] != 'password':
+                return FakeResponse(status_code=401)
+            return FakeResponse()
+
+        return FakeResponse(json_data={'id': session.email, 'email': session.email, 'name': 'Me'})
+
+class TestClientPool(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeServer()
+        self.patcher = mock.patch('anydo_api.request.new_session', side_effect=self.server.new_session)
+        self.patcher.start()
+
+    def tearDown(self):
+        self.patcher.stop()
+
+    def test_map_runs_operation_for_every_account(self):
+        accounts = [('user{}@xxx.xxx'.format(i), 'password') for i in range(10)]
+        with ClientPool(max_workers=4) as pool:
+            results = dict(pool.map(lambda user: user['email'].upper(), accounts))
+
+        self.assertEqual(dict((email, email.upper()) for email, _ in accounts), results)
+
+    def test_clients_share_one_adapter_and_log_in_once(self):
+        with ClientPool(max_workers=2) as pool:
+            list(pool.map(lambda user: None, [('a@xxx.xxx', 'password')] * 3))
+            list(pool.map(lambda user: None, [('b@xxx.xxx', 'password')]))
+
+        self.assertEqual(2, self.server.logins)
+        self.assertTrue(all(session.shared_adapter is pool.adapter for session in self.server.sessions))
+
+    def test_concurrency_is_capped_globally_and_per_account(self):
+        state = {'running': 0, 'max': 0, 'per_account': {}, 'max_per_account': 0}
+        lock = threading.Lock()
+
+        def operation(user):
+            with lock:
+                state['running'] += 1
+                state['per_account'][user['email']] = state['per_account'].get(user['email'], 0) + 1
+                state['max'] = max(state['max'], state['running'])
+                state['max_per_account'] = max(state['max_per_account'], state['per_account'][user['email']])
+            time.sleep(0.01)
+            with lock:
+                state['running'] -= 1
+                state['per_account'][user['email']] -= 1
+
+        accounts = [('user{}@xxx.xxx'.format(i % 4), 'password') for i in range(20)]
+        with ClientPool(max_workers=3, max_per_account=1) as pool:
+            list(pool.map(operation, accounts))
+
+        self.assertEqual(3, state['max'])
+        self.assertEqual(1, state['max_per_account'])
+
+    def test_accounts_are_served_in_round_robin_order(self):
+        order = []
+        with ClientPool(max_workers=1) as pool:
+            gate = threading.Event()
+            pool.submit(('blocker@xxx.xxx', 'password'), lambda user: gate.wait())
+            for _ in range(3):
+                pool.submit(('busy@xxx.xxx', 'password'), lambda user: order.append(user['email']))
+            pool.submit(('quiet@xxx.xxx', 'password'), lambda user: order.append(user['email']))
+            gate.set()
+
+        self.assertEqual(['busy@xxx.xxx', 'quiet@xxx.xxx', 'busy@xxx.xxx', 'busy@xxx.xxx'], order)
+
+    def test_errors_are_reraised_or_returned(self):
+        accounts = [('good@xxx.xxx', 'password'), ('bad@xxx.xxx', 'wrong')]
+        with ClientPool(max_workers=2) as pool:
+            results = dict(pool.map(lambda user: user['name'], accounts, return_exceptions=True))
+
+            with self.assertRaises(errors.UnauthorizedError):
+                list(pool.map(lambda user: user['name'], [('bad@xxx.xxx', 'wrong')]))
+
+        self.assertEqual('Me', results['good@xxx.xxx'])
+        self.assertIsInstance(results['bad@xxx.xxx'], errors.UnauthorizedError)
+
+    def test_closed_pool_rejects_new_work(self):
+        pool = ClientPool()
+        pool.close()
+        with self.assertRaises(RuntimeError):
+            pool.submit(('a@xxx.xxx', 'password'), lambda user: None)
+
+if __name__ == '__main__':
+    import sys
+    sys.exit(unittest.main())
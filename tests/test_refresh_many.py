@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_refresh_many
+----------------------------------
+
+Tests for `User.refresh_many` and parallel requests.
+"""
+
+import unittest
+
+from tests.test_helper import FakeResponse, FakeServer, FakeSession, task_data
+
+from anydo_api import request_budget
+from anydo_api import tracing
+from anydo_api.category import Category
+from anydo_api.constants import CONSTANTS
+from anydo_api.task import Task
+from anydo_api.user import User, collection_is_cheaper
+
+class TestRefreshMany(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeServer(
+            [task_data('task-{}'.format(index), 'Fresh') for index in range(1000)],
+            [{'id': 'c', 'name': 'Fresh'}], delay=0.01
+        )
+        self.user = User(data_dict={'id': 'me'}, session=FakeSession(self.server.respond))
+        self.user.tasks_list = [Task(data_dict={'id': task_id, 'title': 'Stale'}, user=self.user)
+                                for task_id in sorted(task['id'] for task in self.server.tasks)]
+        self.user._tasks_coverage = frozenset(['deleted', 'done'])
+
+    def test_few_resources_are_refreshed_by_parallel_requests(self):
+        tasks = self.user.tasks_list[:8]
+        data = tasks[0].data_dict
+        tasks[0].title = 'Local change'
+
+        self.user.refresh_many(tasks, max_workers=4)
+
+        self.assertEqual(8, len(self.server.urls()))
+        self.assertTrue(self.server.max_running > 1)
+        self.assertTrue(self.server.max_running <= 4)
+        self.assertEqual(['Fresh'] * 8, [task.title for task in tasks])
+        self.assertTrue(tasks[0].data_dict is data)
+        self.assertFalse(tasks[0].is_dirty)
+
+    def test_many_resources_are_refreshed_by_a_collection_request(self):
+        self.user.refresh_many(self.user.tasks_list[:300])
+
+        self.assertEqual([CONSTANTS.get('TASKS_URL')], self.server.urls())
+        self.assertEqual(['Fresh'] * 300, [task.title for task in self.user.tasks_list[:300]])
+        self.assertEqual('Stale', self.user.tasks_list[300].title)
+
+    def test_collection_is_requested_with_flags_of_the_cache(self):
+        self.user._tasks_coverage = frozenset()
+        self.user.refresh_many(self.user.tasks_list[:300])
+
+        _, url, kwargs = self.user.session_obj.calls[0]
+        self.assertEqual(CONSTANTS.get('TASKS_URL'), url)
+        self.assertEqual({'includeDeleted': 'false', 'includeDone': 'false'}, kwargs['params'])
+
+    def test_unknown_collection_size_means_individual_requests(self):
+        user = User(data_dict={'id': 'me'}, session=FakeSession(self.server.respond))
+        tasks = [Task(data_dict={'id': 'task-{}'.format(index)}, user=user)
+                 for index in range(100)]
+        user.refresh_many(tasks, max_workers=16)
+
+        self.assertEqual(100, len(self.server.urls()))
+        self.assertTrue(CONSTANTS.get('TASKS_URL') not in self.server.urls())
+        self.assertEqual(['Fresh'] * 100, [task.title for task in tasks])
+
+    def test_resources_missing_in_collection_are_requested_individually(self):
+        tasks = self.user.tasks_list[:300]
+        collection = [task for task in self.server.tasks if task['id'] != 'task-0']
+        original = self.server.respond
+
+        def respond(method, url, **kwargs):
+            if url == CONSTANTS.get('TASKS_URL'):
+                return FakeResponse(json_data=collection)
+            return original(method, url, **kwargs)
+
+        self.user.session_obj.responder = respond
+        self.user.refresh_many(tasks)
+
+        self.assertEqual('Fresh', tasks[0].title)
+        self.assertEqual([CONSTANTS.get('TASKS_URL') + '/task-0'], self.server.urls())
+
+    def test_categories_are_refreshed_too(self):
+        category = Category(data_dict={'id': 'c', 'name': 'Stale'}, user=self.user)
+        self.user.refresh_many([category])
+
+        self.assertEqual('Fresh', category.name)
+
+    def test_parallel_requests_keep_tracing_and_budget_context(self):
+        exporter = tracing.InMemoryExporter()
+        tracing.enable(exporter)
+        try:
+            with request_budget(100) as budget:
+                self.user.refresh_many(self.user.tasks_list[:5])
+        finally:
+            tracing.disable()
+
+        self.assertEqual(5, len(budget.calls))
+        self.assertEqual('User.refresh_many', exporter.spans[0].name)
+        self.assertEqual(5, exporter.spans[0].http_calls())
+
+    def test_collection_heuristic(self):
+        self.assertFalse(collection_is_cheaper(1, 10, 8))
+        self.assertFalse(collection_is_cheaper(8, 100, 8))
+        self.assertTrue(collection_is_cheaper(20, 100, 8))
+        self.assertFalse(collection_is_cheaper(20, 5000, 8))
+        self.assertTrue(collection_is_cheaper(300, 5000, 8))
+
+if __name__ == '__main__':
+    import sys
+    sys.exit(unittest.main())
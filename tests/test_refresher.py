@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_refresher
+----------------------------------
+
+Tests for `Refresher` class.
+"""
+
+import random
+import time
+import unittest
+
+from tests.test_helper import FakeServer, FakeSession, task_data
+
+from anydo_api.refresher import Refresher
+from anydo_api.user import User
+
+def wait_for(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition():
+        if time.time() > deadline:
+            raise AssertionError('condition was not met in time')
+        time.sleep(0.005)
+
+class TestRefresher(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeServer([task_data('a', 'First')],
+                                 [{'id': 'c', 'name': 'Personal', 'isDeleted': False}])
+        self.user = User(data_dict={'id': 'me'}, session=FakeSession(self.server.respond))
+        self.user.tasks()
+
+    def gets(self):
+        return len(self.server.requests)
+
+    def test_users_are_refreshed_periodically_in_background(self):
+        with Refresher(interval=0.02, jitter=0) as refresher:
+            self.user.use_refresher(refresher)
+            self.server.task('a')['title'] = 'Renamed'
+            wait_for(lambda: self.user.tasks()[0].title == 'Renamed')
+            wait_for(lambda: self.gets() >= 7)
+
+    def test_cached_data_is_served_while_refresh_is_running(self):
+        with Refresher(interval=0.01, jitter=0) as refresher:
+            self.server.gate.clear()
+            self.user.use_refresher(refresher)
+            time.sleep(0.05)
+
+            started = time.time()
+            self.assertEqual('First', self.user.tasks()[0].title)
+            self.assertTrue(time.time() - started < 0.05)
+            self.server.gate.set()
+
+    def test_refresh_swaps_the_list_at_once(self):
+        tasks = self.user.tasks()
+        Refresher.refresh(self.user)
+
+        self.assertFalse(tasks is self.user.tasks())
+        self.assertTrue(tasks[0] is self.user.tasks()[0])
+
+    def test_stale_data_read_schedules_immediate_refresh(self):
+        with Refresher(interval=3600, max_age=0.01) as refresher:
+            self.user.use_refresher(refresher)
+            time.sleep(0.02)
+            gets = self.gets()
+
+            self.user.tasks()
+            wait_for(lambda: self.gets() == gets + 3)
+
+    def test_failed_refresh_is_retried_on_next_interval(self):
+        self.server.failures = [500] * 3
+        with Refresher(interval=0.01, jitter=0) as refresher:
+            self.user.use_refresher(refresher)
+            wait_for(lambda: not self.server.failures)
+            self.server.task('a')['title'] = 'Renamed'
+            wait_for(lambda: self.user.tasks()[0].title == 'Renamed')
+
+    def test_intervals_are_jittered(self):
+        random.seed(1)
+        refresher = Refresher(interval=10, jitter=0.2)
+        intervals = [refresher.next_interval() for _ in range(100)]
+        refresher.close()
+
+        self.assertTrue(all(8 <= interval <= 12 for interval in intervals))
+        self.assertTrue(len(set(intervals)) > 90)
+
+    def test_removed_user_is_not_refreshed(self):
+        with Refresher(interval=0.01, jitter=0) as refresher:
+            self.user.use_refresher(refresher)
+            refresher.remove(self.user)
+            gets = self.gets()
+            time.sleep(0.05)
+            self.assertTrue(self.gets() <= gets + 3)
+
+if __name__ == '__main__':
+    import sys
+    sys.exit(unittest.main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_reminders
+----------------------------------
+
+Tests for `Reminders` due date and alert tracking.
+"""
+
+import threading
+import time
+import unittest
+
+from tests.test_helper import FakeServer, FakeSession, task_data
+
+from anydo_api.reminders import Reminders
+from anydo_api.task import Task
+from anydo_api.user import User
+
+def dated_task(task_id, due_in=None, alert=None, status='UNCHECKED'):
+    due = int((time.time() + due_in) * 1000) if due_in is not None else None
+    return task_data(task_id, status=status, dueDate=due,
+                     alert=alert or {'type': 'NONE', 'offset': 0, 'customTime': 0})
+
+class TestReminders(unittest.TestCase):
+    def setUp(self):
+        self.reminders = Reminders()
+        self.user = self.new_user('me', [
+            dated_task('soon', due_in=60),
+            dated_task('later', due_in=3600, alert={'type': 'OFFSET', 'offset': 3590 * 1000}),
+            dated_task('done', due_in=30, status='DONE'),
+            dated_task('undated'),
+        ])
+
+    def tearDown(self):
+        self.reminders.close()
+
+    def new_user(self, user_id, tasks):
+        user = User(data_dict={'id': user_id}, session=FakeSession(FakeServer().respond))
+        user.tasks_list = [Task(data_dict=data, user=user) for data in tasks]
+        user.use_reminders(self.reminders)
+        return user
+
+    def ids(self, tasks):
+        return [task['id'] for task in tasks]
+
+    def test_upcoming_window_queries(self):
+        self.assertEqual(['soon'], self.ids(self.reminders.upcoming(120)))
+        self.assertEqual(['soon', 'later'], self.ids(self.reminders.upcoming(7200)))
+        self.assertEqual(['later'], self.ids(self.reminders.upcoming(120, kind='alert')))
+        self.assertEqual(2, len(self.reminders))
+        self.assertAlmostEqual(time.time() + 60, self.reminders.next_time(), delta=1)
+
+    def test_times_are_reindexed_on_save_done_and_removal(self):
+        soon, later = self.user.tasks_list[:2]
+        later.dueDate = int((time.time() + 30) * 1000)
+        later.save()
+        self.assertEqual(['later', 'soon'], self.ids(self.reminders.upcoming(120)))
+
+        soon.done()
+        later.destroy()
+        Task.create(user=self.user, title='New', status='UNCHECKED',
+                    dueDate=int((time.time() + 90) * 1000))
+
+        self.assertEqual(['New'], [task.title for task in self.reminders.upcoming(120)])
+
+    def test_many_users_share_reminders(self):
+        other = self.new_user('other', [dated_task('soon', due_in=50)])
+        tasks = self.reminders.upcoming(120)
+
+        self.assertEqual([other, self.user], [task.user for task in tasks])
+        self.user.use_reminders(Reminders())
+        self.assertEqual([other], [task.user for task in self.reminders.upcoming(120)])
+
+    def test_callbacks_fire_on_time(self):
+        fired = []
+        done = threading.Event()
+
+        def callback(kind, task):
+            fired.append((kind, task['id'], time.time()))
+            if len(fired) == 2:
+                done.set()
+
+        self.reminders.add_callback(callback)
+        started = time.time()
+        Task.create(user=self.user, title='Ring', status='UNCHECKED',
+                    dueDate=int((started + 0.2) * 1000),
+                    alert={'type': 'OFFSET', 'offset': 100, 'customTime': 0})
+
+        self.assertTrue(done.wait(5))
+        self.assertEqual(['alert', 'due'], [kind for kind, _, _ in fired])
+        self.assertTrue(fired[1][2] - started >= 0.19)
+
+if __name__ == '__main__':
+    import sys
+    sys.exit(unittest.main())
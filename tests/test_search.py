@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_search
+----------------------------------
+
+Tests for the full-text `SearchIndex` of tasks.
+"""
+
+import unittest
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from tests.test_helper import FakeServer, FakeSession, task_data
+
+from anydo_api import search
+from anydo_api.search import SearchIndex, tokenize
+from anydo_api.task import Task
+from anydo_api.user import User
+
+class TestSearch(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeServer([
+            task_data('a', 'Buy milk', note='Organic, from the farmers market'),
+            task_data('b', 'Plan the trip', note='Book hotel'),
+            task_data('c', 'Call the bank', note=None),
+            task_data('d', 'Pack bags', parent_id='b', note=None),
+        ])
+        self.user = User(data_dict={'id': 'me'}, session=FakeSession(self.server.respond))
+
+    def ids(self, query):
+        return [task['id'] for task in self.user.search(query)]
+
+    def test_text_is_normalized(self):
+        self.assertEqual(['cafe', 'creme', 'brulee', '2'], tokenize(u'Café Crème-BRÛLÉE 2'))
+        self.assertEqual([], tokenize(None))
+
+    def test_titles_notes_and_subtask_titles_are_searched(self):
+        self.assertEqual(['a'], self.ids('milk'))
+        self.assertEqual(['a'], self.ids('farmers'))
+        self.assertEqual(['d', 'b'], self.ids('bags'))
+        self.assertEqual(['b'], self.ids('hotel'))
+        self.assertEqual([], self.ids('milk hotel'))
+
+    def test_last_word_matches_as_prefix_and_exact_title_match_ranks_first(self):
+        self.assertEqual(['a'], self.ids('orga'))
+        self.assertEqual(['c', 'd', 'b'], self.ids('ba'))
+        self.assertEqual(['b', 'c', 'a'], self.ids('the'))
+        self.assertEqual(['c'], self.ids('call ba'))
+        self.assertEqual(1, len(self.user.search('ba', limit=1)))
+
+    def test_index_follows_saves_creates_notes_and_deletions(self):
+        tasks = self.user.tasks()
+        self.assertEqual(['a'], self.ids('milk'))
+
+        tasks[0].title = 'Buy bread'
+        tasks[0].save()
+        tasks[2].add_note('ask about the mortgage')
+        Task.create(user=self.user, title='Milk the cow')
+        tasks[3].destroy()
+
+        self.assertEqual(['Milk the cow'], [task.title for task in self.user.search('milk')])
+        self.assertEqual(['c'], self.ids('mortgage'))
+        self.assertEqual([], self.ids('bags'))
+        self.assertEqual(['a'], self.ids('bread'))
+
+    def test_index_follows_refresh(self):
+        self.user.search('milk')
+        self.server.tasks[0]['title'] = 'Buy cheese'
+        self.user.tasks(refresh=True)
+
+        self.assertEqual([], self.ids('milk'))
+        self.assertEqual(['a'], self.ids('cheese'))
+
+    def test_refresh_reindexes_only_changed_and_dropped_tasks(self):
+        self.user.search('milk')
+        self.server.tasks[0]['title'] = 'Buy cheese'
+        del self.server.tasks[2]
+        with mock.patch.object(search, '_fields', wraps=search._fields) as fields:
+            self.user.tasks(refresh=True)
+
+        self.assertEqual(1, fields.call_count)
+        self.assertEqual(['a'], self.ids('cheese'))
+        self.assertEqual([], self.ids('bank'))
+        self.assertEqual(['d', 'b'], self.ids('bags'))
+
+    def test_done_and_deleted_tasks_are_found_only_when_included(self):
+        self.server.tasks.extend([task_data('e', 'Buy stamps', 'DONE', note=None),
+                                  task_data('f', 'Buy paint', 'DELETED', note=None)])
+        self.assertEqual(['a'], self.ids('buy'))
+
+        self.user.tasks(include_deleted=True, include_done=True)
+        self.assertEqual(['a'], self.ids('buy'))
+        self.assertEqual(['a', 'e'], [task['id'] for task in self.user.search('buy', include_done=True)])
+        self.assertEqual(['a', 'e', 'f'], [task['id'] for task in self.user.search(
+            'buy', include_done=True, include_deleted=True)])
+        self.assertEqual(1, len(self.user.search('buy', limit=1)))
+
+    def test_incremental_updates_match_full_rebuild(self):
+        user = User(data_dict={'id': 'me'}, session=None)
+        tasks = [Task(data_dict=task_data('t{}'.format(index), 'word{} common'.format(index % 7),
+                                          parent_id='t{}'.format(index - 1) if index % 3 else None),
+                      user=user) for index in range(40)]
+        incremental = SearchIndex()
+        for task in reversed(tasks):
+            incremental.index(task)
+        for task in tasks[::5]:
+            incremental.remove(task['id'])
+        rebuilt = SearchIndex()
+        rebuilt.rebuild([task for index, task in enumerate(tasks) if index % 5])
+
+        for query in ('common', 'word3', 'word', 'w'):
+            self.assertEqual(rebuilt.search(query), incremental.search(query))
+        self.assertEqual(32, len(incremental))
+
+if __name__ == '__main__':
+    import sys
+    sys.exit(unittest.main())
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_session_store
+----------------------------------
+
+Tests for persisted `Client` sessions.
+"""
+
+import os
+import shutil
+import stat
+import tempfile
+import unittest
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from tests.test_helper import FakeResponse, FakeSession
+
+from anydo_api import errors
+from anydo_api.client import Client
+from anydo_api.constants import CONSTANTS
+from anydo_api.session_store import SessionStore
+
+COOKIE = 'SPRING_SECURITY_REMEMBER_ME_COOKIE'
+
+class FakeServer(object):
+    """Issues a token on log in and rejects requests with outdated ones."""
+
+    def __init__(self):
+        self.token = 'token-1'
+        self.password = 'password'
+        self.logins = 0
+        self.me_requests = 0
+
+    def new_session(self, adapter=None):
+        session = FakeSession()
+        session.responder = lambda method, url, **kwargs: self.respond(session, method, url, **kwargs)
+        return session
+
+    def respond(self, session, method, url, **kwargs):
+        if url == CONSTANTS.get('LOGIN_URL'):
+            if kwargs['data']['j_password'] != self.password:
+                return FakeResponse(status_code=401)
+            self.logins += 1
+            session.cookies.set(COOKIE, self.token, domain='sm-prod2.any.do', path='/')
+            return FakeResponse()
+
+        if session.cookies.get(COOKIE) != self.token:
+            return FakeResponse(status_code=401)
+
+        if url == CONSTANTS.get('ME_URL'):
+            self.me_requests += 1
+            return FakeResponse(json_data={'id': 'me', 'email': 'me@xxx.xxx', 'name': 'Me'})
+
+        return FakeResponse(json_data=[])
+
+class TestSessionStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'session.json')
+        self.server = FakeServer()
+        self.patcher = mock.patch('anydo_api.request.new_session', side_effect=self.server.new_session)
+        self.patcher.start()
+
+    def tearDown(self):
+        self.patcher.stop()
+        shutil.rmtree(self.directory)
+
+    def client(self, email='me@xxx.xxx'):
+        return Client(email=email, password='password', session_file=self.path)
+
+    def test_session_is_persisted_with_private_permissions(self):
+        self.client().get_user()
+
+        self.assertEqual(1, self.server.logins)
+        self.assertEqual(0o600, stat.S_IMODE(os.stat(self.path).st_mode))
+        state = SessionStore(self.path).load('me@xxx.xxx')
+        self.assertEqual('token-1', state['cookies'][0]['value'])
+        self.assertEqual('Me', state['me']['name'])
+        self.assertFalse('password' in state['me'])
+
+    def test_next_client_skips_log_in_and_me_request(self):
+        self.client().get_user()
+        user = self.client().get_user()
+
+        self.assertEqual('Me', user['name'])
+        self.assertEqual(1, self.server.logins)
+        self.assertEqual(1, self.server.me_requests)
+
+    def test_user_data_could_be_refreshed(self):
+        self.client().get_user()
+        self.client().get_user(refresh=True)
+
+        self.assertEqual(2, self.server.me_requests)
+
+    def test_session_of_another_account_is_ignored(self):
+        self.client().get_user()
+        self.client(email='other@xxx.xxx')
+
+        self.assertEqual(2, self.server.logins)
+
+    def test_expired_session_is_renewed_transparently(self):
+        user = self.client().get_user()
+        self.server.token = 'token-2'
+
+        self.assertEqual([], user.tasks())
+        self.assertEqual(2, self.server.logins)
+        self.assertEqual('token-2', SessionStore(self.path).load('me@xxx.xxx')['cookies'][0]['value'])
+
+    def test_session_renewed_by_another_process_is_reused(self):
+        first = self.client().get_user()
+        second = self.client().get_user()
+        self.server.token = 'token-2'
+
+        first.tasks()
+        second.tasks()
+
+        self.assertEqual(2, self.server.logins)
+
+    def test_failed_renewal_raises_unauthorized(self):
+        user = self.client().get_user()
+        self.server.token = 'token-2'
+        self.server.password = 'changed'
+
+        with self.assertRaises(errors.UnauthorizedError):
+            user.tasks()
+
+    def test_sessions_are_not_persisted_by_default(self):
+        Client(email='me@xxx.xxx', password='password').get_user()
+        self.assertFalse(os.path.exists(self.path))
+
+if __name__ == '__main__':
+    import sys
+    sys.exit(unittest.main())
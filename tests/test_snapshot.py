@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_snapshot
+----------------------------------
+
+Tests for binary snapshots of the user state.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from tests.test_helper import FakeSession
+
+from anydo_api import errors
+from anydo_api.category import Category
+from anydo_api.snapshot import export_snapshot, load_snapshot
+from anydo_api.task import Task
+from anydo_api.user import User
+
+CATEGORY = {'id': 'c', 'name': 'Personal', 'isDefault': True, 'isDeleted': False}
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'user.snapshot')
+
+        self.user = User(data_dict={'id': 'me', 'email': 'me@xxx.xxx', 'password': 'secret'},
+                         session=FakeSession())
+        self.tasks = [{
+            'id': 'task-{}'.format(index),
+            'title': u'Задача {}'.format(index),
+            'status': 'UNCHECKED',
+            'dueDate': 1445256000000 + index,
+            'parentGlobalTaskId': None if index % 2 else 'task-0',
+            'subTasks': [],
+            'alert': {'type': 'NONE', 'offset': 0.5, 'repeat': False},
+            'huge': 2 ** 70,
+        } for index in range(10)]
+        self.user.tasks_list = [Task(data_dict=dict(task), user=self.user) for task in self.tasks]
+        self.user.categories_list = [Category(data_dict=dict(CATEGORY), user=self.user)]
+        self.user._pending_tasks = [{'id': 'p', 'title': 'Shared', 'sharedMembers': [{'email': 'a@xxx.xxx'}]}]
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_snapshot_round_trip_keeps_all_the_data(self):
+        export_snapshot(self.user, self.path)
+        snapshot = load_snapshot(self.path)
+
+        self.assertEqual(self.tasks, list(snapshot.tasks))
+        self.assertEqual([CATEGORY], list(snapshot.categories))
+        self.assertEqual(self.user._pending_tasks, list(snapshot.pending_tasks))
+        snapshot.close()
+
+    def test_snapshot_never_contains_password(self):
+        export_snapshot(self.user, self.path)
+
+        self.assertEqual({'id': 'me', 'email': 'me@xxx.xxx'}, load_snapshot(self.path).user_data())
+        with open(self.path, 'rb') as stream:
+            self.assertFalse(b'secret' in stream.read())
+
+    def test_records_are_accessed_by_index_without_decoding_others(self):
+        export_snapshot(self.user, self.path)
+        snapshot = load_snapshot(self.path)
+
+        self.assertEqual(10, len(snapshot.tasks))
+        self.assertEqual(self.tasks[7], snapshot.tasks[7])
+        self.assertEqual(self.tasks[-1], snapshot.tasks[-1])
+        self.assertFalse(self.tasks[3]['title'] in snapshot._atoms.values())
+        with self.assertRaises(IndexError):
+            snapshot.tasks[10]
+
+    def test_snapshot_restores_user_with_loaded_state(self):
+        export_snapshot(self.user, self.path)
+        session = FakeSession()
+        user = load_snapshot(self.path).to_user(session)
+
+        self.assertTrue(user.session() is session)
+        self.assertEqual(self.tasks, [task.data_dict for task in user.tasks()])
+        self.assertEqual('Personal', user.categories()[0]['name'])
+        self.assertEqual(1, len(user.pending_tasks()))
+        self.assertTrue(user.tasks()[0].user is user)
+        self.assertEqual([], session.calls)
+        self.assertEqual(frozenset(), user._tasks_coverage)
+
+    def test_not_a_snapshot_file_raises_model_error(self):
+        with open(self.path, 'wb') as stream:
+            stream.write(b'{"not": "a snapshot"}' * 10)
+
+        with self.assertRaises(errors.ModelError):
+            load_snapshot(self.path)
+
+    def test_unsupported_values_are_rejected(self):
+        self.user.tasks_list[0].data_dict['date'] = object()
+
+        with self.assertRaises(errors.ModelError):
+            export_snapshot(self.user, self.path)
+
+if __name__ == '__main__':
+    import sys
+    sys.exit(unittest.main())
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_store
+----------------------------------
+
+Tests for `SQLiteStore` class.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from tests.test_helper import FakeServer, FakeSession, task_data
+
+from anydo_api.category import Category
+from anydo_api.store import SQLiteStore
+from anydo_api.task import Task
+from anydo_api.user import User
+
+class TestSQLiteStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'anydo.db')
+        self.server = FakeServer(
+            [task_data('a', 'First', categoryId='personal'),
+             task_data('b', 'Second', parent_id='a', categoryId='work')],
+            [{'id': 'personal', 'name': 'Personal', 'isDefault': True, 'isDeleted': False}]
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def new_user(self):
+        user = User(data_dict={'id': 'me', 'email': 'me@xxx.xxx', 'name': 'Me'},
+                    session=FakeSession(self.server.respond))
+        user.use_store(SQLiteStore(self.path))
+        return user
+
+    def stored_titles(self):
+        return [task['title'] for task in SQLiteStore(self.path).load_tasks('me')]
+
+    def test_loaded_tasks_and_categories_are_stored(self):
+        user = self.new_user()
+        user.tasks()
+        user.categories()
+
+        self.assertEqual(['First', 'Second'], self.stored_titles())
+        self.assertEqual(['Personal'], [c['name'] for c in SQLiteStore(self.path).load_categories('me')])
+
+    def test_saved_created_and_destroyed_resources_are_written_through(self):
+        user = self.new_user()
+        first, second = user.tasks()
+        user.categories()
+
+        first.title = 'Changed'
+        first.save()
+        Task.create(user=user, title='Third')
+        second.destroy()
+        Category.create(user=user, name='Home')
+
+        self.assertEqual(['Changed', 'Third'], self.stored_titles())
+        self.assertEqual(2, len(SQLiteStore(self.path).load_categories('me')))
+
+    def test_warm_start_serves_stored_data_and_revalidates_in_background(self):
+        self.new_user().tasks()
+        self.server.tasks[0]['title'] = 'Renamed remotely'
+        self.server.gate.clear()
+
+        user = self.new_user()
+        tasks = user.tasks()
+        self.assertEqual(['First', 'Second'], [task.title for task in tasks])
+
+        self.server.gate.set()
+        user.revalidation.join()
+
+        self.assertEqual('Renamed remotely', tasks[0].title)
+        self.assertTrue(tasks[0] is user.tasks()[0])
+        self.assertEqual(['Renamed remotely', 'Second'], self.stored_titles())
+
+    def test_warm_start_fetches_views_wider_than_the_default_one(self):
+        self.new_user().tasks()
+        self.server.tasks.append(task_data('c', 'Done', status='DONE'))
+        self.server.requests[:] = []
+
+        user = self.new_user()
+        tasks = user.tasks(include_done=True)
+
+        self.assertEqual(['First', 'Second', 'Done'], [task.title for task in tasks])
+        self.assertEqual(['get'], self.server.methods())
+        self.assertEqual(None, user.revalidation)
+
+    def test_stored_tasks_are_indexed_by_category_and_parent(self):
+        self.new_user().tasks()
+        store = SQLiteStore(self.path)
+
+        self.assertEqual(['Second'], [task['title'] for task in store.tasks_by_category('me', 'work')])
+        self.assertEqual(['Second'], [task['title'] for task in store.subtasks('me', 'a')])
+        self.assertEqual('First', store.task('me', 'a')['title'])
+        self.assertEqual(None, store.task('me', 'missing'))
+
+    def test_users_do_not_see_each_other_data(self):
+        self.new_user().tasks()
+        self.assertEqual([], SQLiteStore(self.path).load_tasks('someone-else'))
+
+if __name__ == '__main__':
+    import sys
+    sys.exit(unittest.main())
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_task_cache
+----------------------------------
+
+Tests for include flags coverage of the `User` tasks cache.
+"""
+
+import unittest
+
+from tests.test_helper import FakeServer, FakeSession, task_data
+
+from anydo_api.task import Task
+from anydo_api.user import User
+
+class TestTaskCache(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeServer([task_data('open'), task_data('done', status='DONE'),
+                                  task_data('deleted', status='DELETED')])
+        self.session = FakeSession(self.server.respond)
+        self.user = User(data_dict={'id': 'me'}, session=self.session)
+
+    def params(self):
+        return [(kwargs['params']['includeDeleted'], kwargs['params']['includeDone'])
+                for _, _, kwargs in self.session.calls]
+
+    def ids(self, **flags):
+        return [task['id'] for task in self.user.tasks(**flags)]
+
+    def test_wider_flags_fetch_once_and_narrower_ones_are_served_locally(self):
+        self.assertEqual(['open'], self.ids())
+        self.assertEqual(['open', 'done'], self.ids(include_done=True))
+        self.assertEqual(['open'], self.ids())
+        self.assertEqual(['open', 'done', 'deleted'], self.ids(include_done=True, include_deleted=True))
+        self.assertEqual(['open', 'deleted'], self.ids(include_deleted=True))
+
+        self.assertEqual([('false', 'false'), ('false', 'true'), ('true', 'true')], self.params())
+
+    def test_known_objects_are_kept_when_coverage_widens(self):
+        task = self.user.tasks()[0]
+        self.user.tasks(include_done=True)
+
+        self.assertTrue(task is self.user.tasks()[0])
+
+    def test_refresh_keeps_coverage(self):
+        self.user.tasks(include_done=True)
+        self.user.tasks(refresh=True)
+
+        self.assertEqual(('false', 'true'), self.params()[-1])
+        self.assertEqual(['open', 'done'], self.ids(include_done=True))
+        self.assertEqual(2, len(self.params()))
+
+    def test_empty_account_is_not_refetched(self):
+        self.server.tasks = []
+        self.assertEqual([], self.ids())
+        self.assertEqual([], self.ids())
+
+        self.assertEqual(1, len(self.params()))
+
+    def test_list_set_from_outside_covers_nothing(self):
+        self.user.tasks_list = [Task(data_dict=task_data('open'), user=self.user)]
+
+        self.assertEqual(['open'], self.ids())
+        self.assertEqual([('false', 'false')], self.params())
+
+    def test_tasks_created_on_a_cold_user_do_not_fill_the_cache(self):
+        self.user.add_tasks([Task(data_dict=task_data('new'), user=self.user)])
+
+        self.assertEqual(['open'], self.ids())
+        self.assertEqual(1, len(self.params()))
+
+if __name__ == '__main__':
+    import sys
+    sys.exit(unittest.main())
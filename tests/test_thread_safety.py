@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_thread_safety
+----------------------------------
+
+Tests for sharing `User` and its resources between threads.
+"""
+
+import threading
+import unittest
+
+from tests.test_helper import FakeServer, FakeSession, task_data
+
+from anydo_api.task import Task
+from anydo_api.user import User
+
+def run_threads(target, count):
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+class TestThreadSafety(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeServer([task_data('a', 'First')])
+        self.user = User(data_dict={'id': 'me'}, session=FakeSession(self.server.respond))
+
+    def hold_requests(self):
+        self.server.gate.clear()
+        self.server.entered.clear()
+
+    def test_concurrent_additions_are_not_lost(self):
+        def add():
+            for index in range(200):
+                self.user.add_task(Task(data_dict={'id': str(index)}, user=self.user))
+
+        run_threads(add, 8)
+        self.assertEqual(1600, len(self.user.tasks_list))
+
+    def test_concurrent_cold_reads_make_a_single_request(self):
+        self.hold_requests()
+        readers = [threading.Thread(target=self.user.tasks) for _ in range(10)]
+        for reader in readers:
+            reader.start()
+
+        self.server.entered.wait(5)
+        self.server.gate.set()
+        for reader in readers:
+            reader.join()
+
+        self.assertEqual(1, len(self.server.requests))
+
+    def test_refresh_keeps_tasks_added_meanwhile_and_does_not_change_read_lists(self):
+        tasks = self.user.tasks()
+        self.hold_requests()
+        refresh = threading.Thread(target=self.user.tasks, kwargs={'refresh': True})
+        refresh.start()
+        self.server.entered.wait(5)
+
+        added = Task(data_dict={'id': 'b', 'title': 'Added', 'status': 'UNCHECKED'}, user=self.user)
+        self.user.add_task(added)
+        self.server.gate.set()
+        refresh.join()
+
+        self.assertEqual(['a'], [task['id'] for task in tasks])
+        self.assertEqual(['a', 'b'], [task['id'] for task in self.user.tasks_list])
+        self.assertTrue(self.user.tasks_list[1] is added)
+
+    def test_changes_made_during_save_keep_resource_dirty(self):
+        task = self.user.tasks()[0]
+        task.title = 'Saved'
+        self.hold_requests()
+        save = threading.Thread(target=task.save)
+        save.start()
+        self.server.entered.wait(5)
+
+        task.title = 'Changed while saving'
+        self.server.gate.set()
+        save.join()
+
+        self.assertTrue(task.is_dirty)
+        self.user.tasks(refresh=True)
+        self.assertEqual('Changed while saving', task.title)
+
+    def test_concurrent_updates_of_a_resource_mark_it_dirty(self):
+        task = self.user.tasks()[0]
+        counter = [0]
+
+        def update():
+            for _ in range(500):
+                with task.lock():
+                    counter[0] += 1
+                    task.title = 'Title {}'.format(counter[0])
+
+        run_threads(update, 4)
+        self.assertEqual('Title 2000', task.title)
+        self.assertTrue(task.is_dirty)
+
+    def test_listeners_could_be_changed_while_notifying(self):
+        user = self.user
+
+        class SelfRemoving(object):
+            calls = 0
+
+            def resource_saved(self, _user, _resource):
+                SelfRemoving.calls += 1
+                user.remove_listener(self)
+
+        for _ in range(3):
+            user.add_listener(SelfRemoving())
+        user.notify('resource_saved', None)
+        user.notify('resource_saved', None)
+
+        self.assertEqual(3, SelfRemoving.calls)
+
+if __name__ == '__main__':
+    import sys
+    sys.exit(unittest.main())
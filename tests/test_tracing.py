@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_tracing
+----------------------------------
+
+Tests for `tracing` module.
+"""
+
+import io
+import json
+import unittest
+
+from tests.test_helper import FakeResponse, FakeServer, FakeSession
+
+from anydo_api import tracing
+from anydo_api.category import Category
+from anydo_api.task import Task
+from anydo_api.user import User
+
+CATEGORIES = [
+    {'id': 'default', 'name': 'Personal', 'isDefault': True, 'default': True, 'isDeleted': False},
+    {'id': 'work', 'name': 'Work', 'isDefault': False, 'default': False, 'isDeleted': False},
+]
+
+class TestTracing(unittest.TestCase):
+    def setUp(self):
+        self.exporter = tracing.InMemoryExporter()
+        tracing.enable(self.exporter)
+        self.user = User(data_dict={'id': 'me', 'email': 'me@xxx.xxx', 'name': 'Me'},
+                         session=FakeSession(FakeServer(categories=CATEGORIES).respond))
+
+    def tearDown(self):
+        tracing.disable()
+        del self.exporter
+        del self.user
+
+    def test_operation_span_counts_nested_http_calls(self):
+        work = Category(data_dict=dict(CATEGORIES[1]), user=self.user)
+        work.mark_default()
+
+        root = self.exporter.spans[-1]
+        self.assertEqual('Category.mark_default', root.name)
+        self.assertEqual(3, root.http_calls())
+        self.assertEqual(['User.default_category', 'Category.save', 'Category.save'],
+                         [span.name for span in root.children])
+        self.assertEqual('HTTP GET', root.children[0].children[0].children[0].name)
+
+    def test_nested_operations_become_child_spans(self):
+        self.user.categories()
+        task = Task(data_dict={'id': 'task', 'categoryId': 'work', 'title': 'A'}, user=self.user)
+        self.exporter.clear()
+
+        task.category()
+
+        root = self.exporter.spans[-1]
+        self.assertEqual('Task.category', root.name)
+        self.assertEqual(['User.categories'], [span.name for span in root.children])
+        self.assertEqual(0, root.http_calls())
+
+    def test_inherited_methods_are_named_after_the_model(self):
+        task = Task(data_dict={'id': 'task', 'title': 'A'}, user=self.user)
+        task.title = 'B'
+        task.save()
+
+        root = self.exporter.spans[-1]
+        self.assertEqual('Task.save', root.name)
+        self.assertEqual(1, root.http_calls())
+        self.assertIsNotNone(root.duration)
+
+    def test_errors_are_recorded(self):
+        def failing(method, url, **kwargs):
+            return FakeResponse(status_code=400)
+        user = User(data_dict={'id': 'me'}, session=FakeSession(failing))
+
+        with self.assertRaises(Exception):
+            user.categories()
+
+        root = self.exporter.spans[-1]
+        self.assertTrue(root.error.startswith('BadRequestError'))
+        self.assertEqual(400, root.children[0].attributes['status_code'])
+
+    def test_json_exporter_writes_one_line_per_root_span(self):
+        stream = io.StringIO()
+        tracing.disable()
+        tracing.enable(tracing.JsonExporter(stream))
+
+        self.user.categories()
+        self.user.categories()
+
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(2, len(lines))
+        self.assertEqual('User.categories', json.loads(lines[0])['name'])
+        self.assertEqual(1, json.loads(lines[0])['http_calls'])
+        self.assertEqual(0, json.loads(lines[1])['http_calls'])
+
+    def test_nothing_is_recorded_when_disabled(self):
+        tracing.disable()
+        self.user.categories()
+        self.assertEqual([], self.exporter.spans)
+
+    def test_aliases_are_preserved(self):
+        self.assertTrue(Task.delete == Task.destroy)
+        self.assertTrue(User.delete == User.destroy)
+
+if __name__ == '__main__':
+    import sys
+    sys.exit(unittest.main())
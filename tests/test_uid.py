@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_uid
+----------------------------------
+
+Tests for `anydo_api.uid` id generation.
+"""
+
+import base64
+import os
+import threading
+import unittest
+
+from anydo_api import uid
+from anydo_api.task import Task
+
+class TestUid(unittest.TestCase):
+    def test_ids_have_api_format(self):
+        for value in uid.generate_uids(1000) + [Task.generate_uid()]:
+            self.assertEqual(24, len(value))
+            raw = base64.urlsafe_b64decode(value.encode('ascii'))
+            self.assertEqual(16, len(raw))
+            self.assertEqual(value, base64.urlsafe_b64encode(raw).decode('ascii'))
+
+    def test_batches_of_any_size(self):
+        self.assertEqual([], uid.generate_uids(0))
+        self.assertEqual(3, len(uid.generate_uids(3)))
+        self.assertEqual(uid.BLOCK * 2 + 1, len(set(uid.generate_uids(uid.BLOCK * 2 + 1))))
+
+    def test_no_collisions_among_a_million_ids(self):
+        ids = set()
+        for _ in range(1000):
+            ids.update(uid.generate_uids(1000))
+        self.assertEqual(10 ** 6, len(ids))
+
+    def test_threads_never_get_the_same_id(self):
+        results = [[] for _ in range(8)]
+
+        def generate(result):
+            for _ in range(2000):
+                result.extend(uid.generate_uids(7))
+                result.append(uid.generate_uid())
+
+        threads = [threading.Thread(target=generate, args=(result,)) for result in results]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        ids = [value for result in results for value in result]
+        self.assertEqual(8 * 2000 * 8, len(set(ids)))
+
+    @unittest.skipUnless(hasattr(os, 'fork'), 'needs fork')
+    def test_forked_process_does_not_reuse_pooled_ids(self):
+        uid.generate_uid()
+        read_end, write_end = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.write(write_end, uid.generate_uid().encode('ascii'))
+            os._exit(0)
+
+        os.close(write_end)
+        child_id = os.read(read_end, 24).decode('ascii')
+        os.waitpid(pid, 0)
+        os.close(read_end)
+        self.assertNotEqual(uid.generate_uid(), child_id)
+
+if __name__ == '__main__':
+    import sys
+    sys.exit(unittest.main())
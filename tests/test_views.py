@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_views
+----------------------------------
+
+Tests for immutable versioned views of user collections.
+"""
+
+import pickle
+import unittest
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from tests.test_helper import FakeServer, FakeSession, task_data
+
+from anydo_api.task import Task
+from anydo_api.user import User
+from anydo_api.views import CHUNK, View
+
+class TestViews(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeServer(
+            [task_data('task-{}'.format(index), 'Task') for index in range(100)],
+            [{'id': 'c', 'name': 'Personal', 'isDeleted': False}]
+        )
+        self.user = User(data_dict={'id': 'me'}, session=FakeSession(self.server.respond))
+
+    def test_view_never_changes_while_new_versions_are_published(self):
+        view = self.user.tasks_view()
+        self.server.tasks[5]['title'] = 'Renamed'
+        self.user.tasks(refresh=True)
+        fresh = self.user.tasks_view()
+
+        self.assertEqual('Task', view[5]['title'])
+        self.assertEqual('Renamed', fresh[5]['title'])
+        self.assertEqual(view.version + 1, fresh.version)
+        self.assertEqual(100, len(fresh))
+
+    def test_unchanged_records_and_chunks_are_shared(self):
+        view = self.user.tasks_view()
+        task = self.user.tasks()[40]
+        task.title = 'Changed'
+        task.save()
+        fresh = self.user.tasks_view()
+
+        self.assertEqual('Changed', fresh.get('task-40')['title'])
+        shared = [a is b for a, b in zip(view._chunks, fresh._chunks)]
+        self.assertEqual([True, False, True, True], shared)
+        self.assertEqual(99, sum(1 for a, b in zip(view, fresh) if a is b))
+
+    def test_refresh_without_changes_keeps_the_version(self):
+        view = self.user.tasks_view()
+        self.user.tasks(refresh=True)
+
+        self.assertTrue(view is self.user.tasks_view())
+
+    def test_created_and_deleted_tasks_are_published(self):
+        view = self.user.tasks_view()
+        Task.create(user=self.user, title='New', status='UNCHECKED')
+        self.user.tasks()[0].destroy()
+        fresh = self.user.tasks_view()
+
+        self.assertEqual(100, len(fresh))
+        self.assertEqual('New', fresh[-1]['title'])
+        self.assertEqual(None, fresh.get('task-0'))
+        self.assertEqual(None, view.get(fresh[-1]['id']))
+        self.assertEqual(CHUNK, len(fresh._chunks[0]))
+
+    def test_records_are_read_only(self):
+        record = self.user.tasks_view()[0]
+
+        with self.assertRaises(TypeError):
+            record['title'] = 'Changed'
+        with self.assertRaises(TypeError):
+            record.update(title='Changed')
+        self.assertEqual(dict(record), dict(pickle.loads(pickle.dumps(record))))
+
+    def test_categories_view(self):
+        self.assertEqual(['Personal'], [record['name'] for record in self.user.categories_view()])
+
+    def test_small_groups_of_saves_do_not_rebuild_the_view(self):
+        view = self.user.tasks_view()
+        tasks = self.user.tasks()
+        with mock.patch.object(View, 'rebuild', side_effect=AssertionError('rebuilt')):
+            Task.create(user=self.user, title='New', status='UNCHECKED')
+            self.user.set_status(tasks[:3], 'CHECKED')
+        fresh = self.user.tasks_view()
+
+        self.assertEqual(101, len(fresh))
+        self.assertEqual(['CHECKED'] * 3, [record['status'] for record in list(fresh)[:3]])
+        # the first chunk has the checked tasks, the last one the new task
+        self.assertEqual([False, True, True, False],
+                         [a is b for a, b in zip(view._chunks, fresh._chunks)])
+
+        self.user.set_status(tasks[:CHUNK + 1], 'DONE')
+        self.assertEqual(['DONE'] * (CHUNK + 1),
+                         [record['status'] for record in list(self.user.tasks_view())[:CHUNK + 1]])
+
+if __name__ == '__main__':
+    import sys
+    sys.exit(unittest.main())
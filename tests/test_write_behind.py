@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_write_behind
+----------------------------------
+
+Tests for `WriteBehind` class.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from tests.test_helper import FakeServer, FakeSession
+
+from anydo_api import errors
+from anydo_api.task import Task
+from anydo_api.user import User
+from anydo_api.write_behind import WriteBehind, _load_spill
+
+def wait_for(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition():
+        if time.time() > deadline:
+            raise AssertionError('condition was not met in time')
+        time.sleep(0.005)
+
+class TestWriteBehind(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.server = FakeServer()
+        self.session = FakeSession(self.server.respond)
+        self.user = User(data_dict={'id': 'me'}, session=self.session)
+        self.tasks = [Task(data_dict={'id': 'task-{}'.format(index), 'title': 'Task', 'status': 'UNCHECKED'},
+                           user=self.user) for index in range(10)]
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_saves_return_at_once_and_are_merged_per_resource(self):
+        task = self.tasks[0]
+        with WriteBehind(delay=0.01) as queue:
+            self.user.use_write_behind(queue)
+            self.server.gate.clear()
+
+            started = time.time()
+            task.title = 'Milk'
+            task.save()
+            task.check()
+            self.assertTrue(time.time() - started < 0.05)
+            self.assertTrue(task.is_dirty)
+
+            future = queue.future(task)
+            self.server.gate.set()
+            self.assertTrue(future.result(timeout=5) is task)
+
+        self.assertEqual(1, len(self.server.payloads('put')))
+        self.assertEqual({'title': 'Milk', 'status': 'CHECKED'},
+                         dict((key, self.server.payloads('put')[0][key]) for key in ('title', 'status')))
+        self.assertFalse(task.is_dirty)
+
+    def test_flush_waits_for_all_queued_writes(self):
+        queue = WriteBehind(delay=60, max_workers=2)
+        self.user.use_write_behind(queue)
+        for task in self.tasks:
+            task.check()
+
+        self.assertTrue(queue.flush(timeout=5))
+        self.assertEqual(10, len(self.server.payloads('put')))
+        self.assertEqual(0, len(queue))
+        self.assertTrue(self.server.max_running <= 2)
+        queue.close()
+
+    def test_server_failures_are_retried(self):
+        self.server.failures = [500, 500]
+        with WriteBehind(delay=0, retries=3, backoff=0.001) as queue:
+            self.user.use_write_behind(queue)
+            self.tasks[0].check()
+            queue.future(self.tasks[0]).result(timeout=5)
+
+        self.assertEqual(3, len(self.server.payloads('put')))
+
+    def test_bad_requests_fail_the_future_without_retries(self):
+        self.server.failures = [400, 400]
+        with WriteBehind(delay=0, backoff=0.001) as queue:
+            self.user.use_write_behind(queue)
+            self.tasks[0].check()
+            with self.assertRaises(errors.BadRequestError):
+                queue.future(self.tasks[0]).result(timeout=5)
+
+        self.assertEqual([400], self.server.failures)
+        self.assertTrue(self.tasks[0].is_dirty)
+
+    def test_pending_writes_are_spilled_to_disk_and_recovered(self):
+        path = os.path.join(self.directory, 'writes.json')
+        self.server.gate.clear()
+        queue = WriteBehind(delay=60, spill_path=path)
+        self.user.use_write_behind(queue)
+        self.tasks[0].check()
+
+        wait_for(lambda: _load_spill(path))
+        self.assertEqual('CHECKED', _load_spill(path)[0][1]['status'])
+
+        # a crashed process leaves the file, a new one pushes its writes
+        recovered = WriteBehind(delay=0, spill_path=path)
+        self.server.gate.set()
+        for future in recovered.recover(self.session):
+            future.result(timeout=5)
+        recovered.close()
+        queue.close()
+
+        self.assertEqual('CHECKED', self.server.payloads('put')[0]['status'])
+        self.assertEqual(0, os.path.getsize(path))
+
+    def test_spill_journal_is_appended_and_truncated_when_idle(self):
+        path = os.path.join(self.directory, 'writes.json')
+        self.server.gate.clear()
+        queue = WriteBehind(delay=60, spill_path=path)
+        self.user.use_write_behind(queue)
+        for task in self.tasks:
+            task.check()
+            self.tasks[0].title = 'Milk'
+            self.tasks[0].save()
+
+        wait_for(lambda: len(_load_spill(path)) == 10)
+        with open(path) as stream:
+            lines = [json.loads(line) for line in stream]
+        self.assertTrue(len(lines) <= 20)
+        self.assertEqual(10, len(set(line['url'] for line in lines)))
+        self.assertEqual('Milk', dict(_load_spill(path))[lines[0]['url']]['title'])
+
+        self.server.gate.set()
+        self.assertTrue(queue.flush(timeout=5))
+        wait_for(lambda: os.path.getsize(path) == 0)
+        queue.close()
+
+    def test_finished_writes_hide_only_their_own_journal_lines(self):
+        path = os.path.join(self.directory, 'writes.json')
+        with open(path, 'w') as stream:
+            stream.write(json.dumps({'seq': 1, 'url': 'a', 'json': {'title': 'Old'}}) + '\n')
+            stream.write(json.dumps({'seq': 2, 'url': 'b', 'json': {'title': 'B'}}) + '\n')
+            stream.write(json.dumps({'seq': 3, 'url': 'a', 'json': {'title': 'New'}}) + '\n')
+            stream.write(json.dumps({'url': 'a', 'done': 1}) + '\n')
+            stream.write(json.dumps({'url': 'b', 'done': 2}) + '\n')
+            stream.write('{"seq": 4, "url": "c", "js')
+
+        self.assertEqual([('a', {'title': 'New'})], _load_spill(path))
+
+    def test_failed_writes_are_logged_and_kept_in_the_journal(self):
+        path = os.path.join(self.directory, 'writes.json')
+        self.server.failures = [400]
+        with mock.patch('anydo_api.write_behind._LOGGER') as logger:
+            with WriteBehind(delay=0, spill_path=path) as queue:
+                self.user.use_write_behind(queue)
+                self.tasks[0].done()
+                self.assertTrue(queue.flush(timeout=5))
+
+        self.assertEqual(1, logger.exception.call_count)
+        self.assertTrue(self.tasks[0].is_dirty)
+        self.assertEqual([('DONE', 'task-0')],
+                         [(data['status'], url.rsplit('/', 1)[1]) for url, data in _load_spill(path)])
+
+        with WriteBehind(delay=0, spill_path=path) as queue:
+            self.user.use_write_behind(queue)
+            self.tasks[1].check()
+            for future in queue.recover(self.session):
+                future.result(timeout=5)
+
+        self.assertEqual([], _load_spill(path))
+        self.assertEqual(['CHECKED', 'DONE'],
+                         sorted(data['status'] for data in self.server.payloads('put')[1:]))
+
+    def test_closed_queue_rejects_saves(self):
+        queue = WriteBehind()
+        self.user.use_write_behind(queue)
+        queue.close()
+
+        with self.assertRaises(RuntimeError):
+            self.tasks[0].check()
+
+if __name__ == '__main__':
+    import sys
+    sys.exit(unittest.main())